@@ -1,42 +1,877 @@
-from flask import Flask, request, jsonify, send_from_directory
+from flask import Flask, request, jsonify, send_file, g, has_request_context, abort
+import click
 import mysql.connector
 import os
 from werkzeug.utils import secure_filename
-import bcrypt, jwt, datetime
+import jwt, datetime
 import json
+import time
+import base64, binascii
+import hashlib
+import io
+import re
+from functools import wraps
+from decimal import Decimal
+
+from config import Config
+from db_pool import ConnectionPool, PoolTimeout
+from token_cache import TokenCache, TokenRevoked
+from password_pool import PasswordHasher, PasswordPoolBusy
+from resume_storage import BLOB_PREFIX, DOC, DOCX, PDF, RESUME_TYPES, BlobStore, UnsupportedType, UploadTooLarge, sniff_type
+from skills import SkillResolver, normalize_skill
+from matching import MatchEngine
+from job_search import JobSearch
+from resume_text import RESUME_TEXT_TOUCH_SQL, ResumeExtractor, ResumeSearch
+from reports import REPORT_GROUPS, fetch_report, rebuild_application_summary, shift_application_summary
+from response_cache import LocalBackend, RedisBackend, ResponseCache
+from status_updates import apply_status_change
+from student_import import ImportFormatError, expire_credentials, import_students, read_rows, stream_csv
+from events import LocalHub, RedisHub, StreamSlots
+from task_queue import TaskQueue, run_workers
+import static_assets
+from static_assets import StaticAssets
+import json_stream
+from json_stream import JsonBody, fetch_rows
+import orjson
+import instrumentation
+import migrations
+from instrumentation import InstrumentedConnection, RouteMetrics, logger
 
 # ===========================
 # Database & App Config
 # ===========================
 DB_CONFIG = {
-    "host": os.getenv("DB_HOST", "localhost"),
-    "user": os.getenv("DB_USER", "root"),
-    "password": os.getenv("DB_PASSWORD", "Ecommerce@1"),
-    "database": os.getenv("DB_NAME", "student_placement_system")
+    "host": Config.DB_HOST,
+    "user": Config.DB_USER,
+    "password": Config.DB_PASSWORD,
+    "database": Config.DB_NAME,
+    "pool_size": Config.DB_POOL_SIZE,
+    "max_overflow": Config.DB_POOL_MAX_OVERFLOW,
+    "pool_timeout": Config.DB_POOL_TIMEOUT,
+    "pool_pre_ping": Config.DB_POOL_PRE_PING,
+    "pool_recycle": Config.DB_POOL_RECYCLE,
 }
-JWT_SECRET = os.getenv("JWT_SECRET", "change_this_secret")
+JWT_SECRET = Config.JWT_SECRET
 
-app = Flask(__name__, static_folder="frontend", static_url_path="/")
+# Frontend files are served from the asset build (see Serve Frontend Files), not Flask's static route
+app = Flask(__name__, static_folder=None)
+instrumentation.configure_logging(Config.LOG_LEVEL, Config.LOG_FORMAT)
 UPLOAD_FOLDER = os.path.join(os.getcwd(), "uploads")
 os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 app.config["UPLOAD_FOLDER"] = UPLOAD_FOLDER
+# Reject oversized bodies before they are read; leaves room for the other form fields
+# Uploads check their own limits (RESUME_MAX_BYTES, IMPORT_MAX_BYTES); this caps every request body
+app.config["MAX_CONTENT_LENGTH"] = max(Config.RESUME_MAX_BYTES, Config.IMPORT_MAX_BYTES) + 1024 * 1024
+resume_store = BlobStore(UPLOAD_FOLDER, max_bytes=Config.RESUME_MAX_BYTES, chunk_size=Config.RESUME_CHUNK_SIZE)
 
 # ===========================
 # Database Connection
 # ===========================
+db_pool = ConnectionPool(
+    {k: v for k, v in DB_CONFIG.items() if not k.startswith("pool_") and k != "max_overflow"},
+    size=DB_CONFIG["pool_size"],
+    max_overflow=DB_CONFIG["max_overflow"],
+    timeout=DB_CONFIG["pool_timeout"],
+    pre_ping=DB_CONFIG["pool_pre_ping"],
+    recycle=DB_CONFIG["pool_recycle"],
+)
+
 def get_db():
-    return mysql.connector.connect(**DB_CONFIG)
+    """Check out a pooled connection; db.close() hands it back to the pool."""
+    db = db_pool.acquire()
+    if Config.METRICS_ENABLED:
+        db = InstrumentedConnection(db, Config.SLOW_QUERY_MS)
+    if has_request_context():
+        # Tracked so teardown can return it even if the handler exits early
+        g.setdefault("_db_connections", []).append(db)
+    return db
+
+@app.teardown_request
+def release_db(exc):
+    for db in g.pop("_db_connections", []):
+        db.close()
+
+@app.errorhandler(PoolTimeout)
+def handle_pool_timeout(e):
+    logger.warning("Database pool exhausted: %s", e)
+    return jsonify({"error": "Service busy, please retry"}), 503, {"Retry-After": "1"}
+
+@app.route("/api/health/db-pool", methods=["GET"])
+def db_pool_metrics():
+    return jsonify(db_pool.metrics())
+
+# ===========================
+# Instrumentation
+# ===========================
+route_metrics = RouteMetrics()
+if Config.METRICS_ENABLED:
+    instrumentation.install(app, route_metrics)
+
+@app.route("/metrics", methods=["GET"])
+def prometheus_metrics():
+    """Per-route request metrics plus pool gauges in Prometheus text format"""
+    pool = db_pool.metrics()
+    hasher = password_hasher.stats()
+    gauges = {f"placement_db_pool_{name}": pool[name] for name in ("open", "idle", "in_use", "waiting", "timeouts")}
+    gauges["placement_bcrypt_pending"] = hasher["pending"]
+    gauges["placement_bcrypt_rejected"] = hasher["rejected"]
+    db = get_db()
+    cur = db.cursor()
+    for name, value in task_queue.depth(cur).items():
+        gauges[f"placement_tasks_{name}"] = value
+    cur.close(); db.close()
+    return route_metrics.render(gauges), 200, {"Content-Type": "text/plain; version=0.0.4"}
+
+# ===========================
+# Background Tasks
+# ===========================
+# Handlers are registered next to the code they belong to (@task_queue.task)
+task_queue = TaskQueue(
+    get_db,
+    mode=Config.TASK_QUEUE_MODE,
+    max_attempts=Config.TASK_MAX_ATTEMPTS,
+    backoff_base=Config.TASK_BACKOFF_BASE,
+    backoff_max=Config.TASK_BACKOFF_MAX,
+    lease_seconds=Config.TASK_LEASE_SECONDS,
+    poll_seconds=Config.TASK_POLL_SECONDS,
+)
+
+if task_queue.mode == "sync":
+    @app.after_request
+    def drain_task_queue(response):
+        """Sync mode: run what this request enqueued before answering (tests and local development)"""
+        task_queue.drain()
+        return response
+
+@app.route("/api/health/tasks", methods=["GET"])
+def task_queue_metrics():
+    db = get_db()
+    cur = db.cursor()
+    depth = task_queue.depth(cur)
+    cur.close(); db.close()
+    return jsonify(dict(task_queue.stats(), **depth))
+
+@app.cli.group("tasks")
+def tasks_cli():
+    """Background task queue: workers and the dead-letter list."""
+
+@tasks_cli.command("work")
+@click.option("--processes", default=1, show_default=True, help="worker processes to run")
+@click.option("--burst", is_flag=True, help="exit once no task is due instead of polling")
+def tasks_work_command(processes, burst):
+    """Run task workers (flask --app app tasks work --processes 4)."""
+    if Config.RESPONSE_CACHE_ENABLED and Config.RESPONSE_CACHE_BACKEND != "redis":
+        logger.warning("Response cache backend is %r: writes made by tasks (student imports) will not "
+                       "invalidate web processes' caches until their entries expire; use redis",
+                       Config.RESPONSE_CACHE_BACKEND)
+    run_workers(f"{__name__}:task_queue", processes=processes, burst=burst)
+
+@tasks_cli.command("stats")
+def tasks_stats_command():
+    """Queue depth per status and the age of the oldest queued task."""
+    db = get_db()
+    cur = db.cursor()
+    print(json.dumps(task_queue.depth(cur)))
+    cur.close(); db.close()
+
+@tasks_cli.command("dead")
+@click.option("--limit", default=50, show_default=True)
+def tasks_dead_command(limit):
+    """List tasks that ran out of attempts, newest first."""
+    db = get_db()
+    cur = db.cursor()
+    for task_id, kind, payload, key, attempts, error, created_at, finished_at in task_queue.dead_letters(cur, limit):
+        print(f"{task_id} {kind} {payload} key={key} attempts={attempts} failed_at={finished_at}: {error}")
+    cur.close(); db.close()
+
+@tasks_cli.command("retry")
+@click.argument("task_ids", nargs=-1, type=int)
+def tasks_retry_command(task_ids):
+    """Requeue dead tasks (the given ids, or all of them)."""
+    db = get_db()
+    cur = db.cursor()
+    count = task_queue.retry_dead(cur, list(task_ids))
+    db.commit()
+    cur.close(); db.close()
+    print(f"Requeued {count} dead task(s)")
+
+@tasks_cli.command("purge")
+@click.option("--older-than", default=Config.TASK_RETENTION_SECONDS, show_default=True, help="seconds since the task finished")
+@click.option("--credentials-older-than", default=Config.IMPORT_CREDENTIALS_TTL_SECONDS, show_default=True,
+              help="seconds since a student import finished")
+def tasks_purge_command(older_than, credentials_older_than):
+    """Delete finished tasks, which also frees their idempotency keys, and clear old import credentials."""
+    db = get_db()
+    cur = db.cursor()
+    count = task_queue.purge(cur, older_than)
+    cleared = expire_credentials(cur, credentials_older_than)
+    db.commit()
+    cur.close(); db.close()
+    print(f"Deleted {count} finished task(s); cleared generated passwords of {cleared} student import(s)")
+
+# ===========================
+# Authentication
+# ===========================
+token_cache = TokenCache(
+    lambda token: jwt.decode(token, JWT_SECRET, algorithms=["HS256"]),
+    maxsize=Config.AUTH_CACHE_SIZE,
+    ttl=Config.AUTH_CACHE_TTL,
+)
+
+def authenticate(authorization, role=None, query_token=None):
+    """Check an Authorization header value (or a query-string token).
+
+    Returns (token, payload, None) on success or (None, None, (error, status)).
+    Shared by require_auth and the native routes in asgi.py.
+    """
+    if not authorization and query_token:
+        authorization = "Bearer " + query_token
+    if not authorization or not authorization.startswith("Bearer "):
+        return None, None, ("Authorization required", 401)
+    token = authorization.split(" ")[1]
+    try:
+        payload = token_cache.verify(token)
+    except jwt.ExpiredSignatureError:
+        return None, None, ("Token expired", 401)
+    except TokenRevoked:
+        return None, None, ("Token revoked", 401)
+    except jwt.InvalidTokenError:
+        return None, None, ("Invalid token", 401)
+    if role and payload.get("role") != role:
+        return None, None, (f"{role.capitalize()} access required", 403)
+    return token, payload, None
+
+def require_auth(role=None, allow_query_token=False):
+    """Verify the Bearer token (through token_cache) and expose g.user_id / g.role / g.token.
+
+    allow_query_token also accepts ?access_token=, for clients such as EventSource
+    that cannot set headers.
+    """
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            token, payload, error = authenticate(
+                request.headers.get("Authorization"), role,
+                request.args.get("access_token") if allow_query_token else None,
+            )
+            if error:
+                return jsonify({"error": error[0]}), error[1]
+            g.user_id = payload["id"]
+            g.role = payload.get("role")
+            g.token = token
+            g.token_exp = payload.get("exp")
+            return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+@app.route("/api/logout", methods=["POST"])
+@require_auth()
+def logout():
+    """Revoke the caller's token so it is refused until it expires"""
+    token_cache.revoke(g.token, g.token_exp)
+    return jsonify({"message": "Logged out"})
+
+@app.route("/api/health/auth-cache", methods=["GET"])
+def auth_cache_metrics():
+    return jsonify(token_cache.stats())
+
+# ===========================
+# Response Cache
+# ===========================
+response_cache = ResponseCache(
+    RedisBackend(Config.RESPONSE_CACHE_URL) if Config.RESPONSE_CACHE_BACKEND == "redis" else LocalBackend(),
+    Config.RESPONSE_CACHE_ROUTES,
+)
+
+# Response headers worth replaying from a cached entry
+CACHED_HEADERS = ("Content-Type", "Content-Encoding", "Vary", "ETag", "Cache-Control", "X-Next-Cursor", "X-Total-Count")
+
+def cached_response(route, tags, per_user=True):
+    """Serve a GET from response_cache; apply below require_auth so g.user_id is set.
+
+    `tags` is a list of format strings over user_id (e.g. "student:{user_id}");
+    write paths call response_cache.invalidate() with the same tags. The key
+    covers the role, the user (unless per_user=False), the query string and
+    the negotiated body format and encoding.
+    """
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not Config.RESPONSE_CACHE_ENABLED:
+                return fn(*args, **kwargs)
+            scope = f"{g.role}:{g.user_id}" if per_user else g.role
+            query = sorted(request.args.items(multi=True))
+            variant = json_stream.negotiate(request.headers.get("Accept"), request.headers.get("Accept-Encoding"))
+            key = hashlib.sha1(json.dumps([scope, request.path, query, variant]).encode("utf-8")).hexdigest()
+            entry_tags = [tag.format(user_id=g.user_id) for tag in tags]
+            cached, versions = response_cache.lookup(route, key, entry_tags)
+            if cached is not None:
+                response = app.response_class(cached["body"], status=cached["status"], headers=cached["headers"])
+                etag, _ = response.get_etag()
+                if etag and request.if_none_match.contains_weak(etag):
+                    return "", 304, {"ETag": response.headers["ETag"], "Cache-Control": response.headers.get("Cache-Control", "private, no-cache")}
+                response.headers["X-Cache"] = "HIT"
+                return response
+            response = app.make_response(fn(*args, **kwargs))
+            if response.status_code == 200:
+                response_cache.store(route, key, {
+                    "body": response.get_data(),
+                    "status": response.status_code,
+                    "headers": [(h, response.headers[h]) for h in CACHED_HEADERS if h in response.headers],
+                }, entry_tags, versions)
+            response.headers["X-Cache"] = "MISS"
+            return response
+        return wrapper
+    return decorator
+
+@app.route("/api/health/response-cache", methods=["GET"])
+def response_cache_metrics():
+    return jsonify(response_cache.stats())
+
+# ===========================
+# Event Stream
+# ===========================
+event_hub = RedisHub(Config.EVENTS_URL, replay=Config.EVENTS_REPLAY) if Config.EVENTS_BACKEND == "redis" \
+    else LocalHub(replay=Config.EVENTS_REPLAY)
+# Each open stream holds a worker thread unless the server is cooperative (see events.py)
+event_slots = StreamSlots(Config.EVENTS_MAX_STREAMS, Config.EVENTS_THREADED_STREAMS)
+
+# Channel carrying officer broadcasts to every student stream (filtered per student)
+BROADCAST_CHANNEL = "broadcasts"
+
+def publish_events(events):
+    """Publish (channel, event, data) tuples after a commit; a hub failure never fails the write."""
+    for channel, event, data in events:
+        try:
+            event_hub.publish(channel, event, data)
+        except Exception:
+            logger.exception("Error publishing event")
+
+def sse_message(event, data, event_id=None):
+    lines = [f"id: {event_id}"] if event_id else []
+    lines += [f"event: {event}", "data: " + json.dumps(data, default=str)]
+    return "\n".join(lines) + "\n\n"
+
+def broadcast_reaches(data, branch, cgpa):
+    branches = data.get("target_branches")
+    min_cgpa = data.get("target_min_cgpa")
+    return (not branches or branch in branches.split(",")) and (min_cgpa is None or cgpa >= float(min_cgpa))
+
+def resume_positions(last_event_id, channels):
+    """Hub positions to resume `channels` from a Last-Event-ID (None entries = from now)."""
+    try:
+        saved = decode_cursor(last_event_id)
+    except ValueError:
+        saved = None
+    if not (isinstance(saved, list) and len(saved) == len(channels) and all(isinstance(p, str) for p in saved)):
+        # An unusable id still means the client missed something, so make the hub resync
+        saved = ["invalid" if last_event_id else None] * len(channels)
+    return dict(zip(channels, saved))
+
+def render_events(channels, events, positions, resync, student=None):
+    """SSE text for one hub read; a heartbeat comment if nothing reached this user."""
+    event_id = encode_cursor([positions[c] for c in channels])
+    chunks = [sse_message("resync", {}, event_id)] if resync else []
+    for channel, _, event, data in events:
+        if channel == BROADCAST_CHANNEL and not broadcast_reaches(data, *student):
+            continue
+        chunks.append(sse_message(event, data, event_id))
+    return "".join(chunks) or ": heartbeat\n\n"
+
+@app.route("/api/events/stream", methods=["GET"])
+@require_auth(allow_query_token=True)
+def event_stream():
+    """Server-sent events for the logged-in user.
+
+    Students receive `notification` and `status` events, officers `application`
+    events. Each event id encodes the stream position, which the browser sends
+    back as Last-Event-ID on reconnect; `resync` means events were missed and
+    the client should refetch. Comment lines are sent as a heartbeat. A worker
+    at its stream cap answers 503 with Retry-After.
+    """
+    channels = [f"{g.role}:{g.user_id}"]
+    student = None
+    if g.role == "student":
+        channels.append(BROADCAST_CHANNEL)
+        db = get_db()
+        cur = db.cursor()
+        cur.execute("SELECT branch, cgpa FROM students WHERE student_id = %s", (g.user_id,))
+        student = cur.fetchone()
+        cur.close()
+        # Hand the connection back now; the stream outlives the request context
+        db.close()
+        if not student:
+            return jsonify({"error": "Student not found"}), 404
+        student = (student[0], float(student[1]))
+
+    if not event_slots.acquire():
+        return jsonify({"error": "Too many open event streams, please retry"}), 503, \
+            {"Retry-After": str(Config.EVENTS_BUSY_RETRY_AFTER)}
+    positions = resume_positions(request.headers.get("Last-Event-ID") or request.args.get("last_event_id"), channels)
+    token, closes_at = g.token, min(g.token_exp or float("inf"), time.time() + Config.EVENTS_MAX_SECONDS)
+
+    def generate():
+        nonlocal positions
+        yield f"retry: {Config.EVENTS_RETRY_MS}\n\n"
+        while time.time() < closes_at:
+            try:
+                token_cache.verify(token)
+            except jwt.InvalidTokenError:
+                return
+            events, positions, resync = event_hub.read(positions, timeout=Config.EVENTS_HEARTBEAT)
+            yield render_events(channels, events, positions, resync, student)
+
+    response = app.response_class(generate(), mimetype="text/event-stream", headers={
+        "Cache-Control": "no-cache",
+        "X-Accel-Buffering": "no",
+    })
+    # Runs when the server closes the response, even if the generator never started
+    response.call_on_close(event_slots.release)
+    return response
+
+@app.route("/api/health/events", methods=["GET"])
+def events_metrics():
+    return jsonify(dict(event_hub.stats(), streams=event_slots.stats()))
+
+# ===========================
+# Keyset Pagination Helpers
+# ===========================
+def encode_cursor(values):
+    """Opaque cursor for the last row of a page (datetimes/Decimals become strings)."""
+    raw = json.dumps([str(v) if isinstance(v, (datetime.datetime, datetime.date, Decimal)) else v for v in values])
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+def decode_cursor(cursor):
+    if not cursor:
+        return None
+    try:
+        return json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+    except (binascii.Error, UnicodeError, json.JSONDecodeError) as e:
+        raise ValueError("malformed cursor") from e
+
+# Two sources share one (created_at, rank, id) ordering in the notification feed
+NOTIFICATION_RANK = 1
+BROADCAST_RANK = 0
+
+def notification_sort_key(row):
+    if row["kind"] == "broadcast":
+        return (row["created_at"], BROADCAST_RANK, row["sent_id"])
+    return (row["created_at"], NOTIFICATION_RANK, row["notification_id"])
+
+def keyset_before(at_col, id_col, rank, after):
+    """' AND ...' clause selecting rows of one source that sort after the cursor (DESC order)."""
+    if not after:
+        return "", []
+    at = datetime.datetime.fromisoformat(after[0])
+    after_rank, after_id = after[1], after[2]
+    if rank < after_rank:
+        return f"AND {at_col} <= %s", [at]
+    if rank > after_rank:
+        return f"AND {at_col} < %s", [at]
+    return f"AND ({at_col} < %s OR ({at_col} = %s AND {id_col} < %s))", [at, at, after_id]
+
+# ===========================
+# Streamed JSON Lists
+# ===========================
+def json_body(fmt=None):
+    """A JsonBody in the format and encoding this request negotiated (see json_stream.py)."""
+    fmt, encoding = json_stream.negotiate(request.headers.get("Accept"), request.headers.get("Accept-Encoding"),
+                                          fmt or request.args.get("format"))
+    return JsonBody(fmt, encoding, spool_bytes=Config.JSON_SPOOL_BYTES, level=Config.JSON_GZIP_LEVEL)
+
+# ===========================
+# Skills
+# ===========================
+skill_resolver = SkillResolver()
+
+# ===========================
+# Skill Matching
+# ===========================
+match_engine = MatchEngine(
+    skill_weight=Config.MATCH_SKILL_WEIGHT,
+    cgpa_weight=Config.MATCH_CGPA_WEIGHT,
+    reload_seconds=Config.MATCH_RELOAD_SECONDS,
+)
+
+def parse_top_k(default):
+    try:
+        return max(1, min(int(request.args.get("k", default)), 200))
+    except ValueError:
+        return default
+
+@app.route("/api/officer/jobs/<int:job_id>/ranked-applicants", methods=["GET"])
+@require_auth(role="officer")
+def get_ranked_applicants(job_id):
+    """Top-k applicants to one of the officer's postings by skill fit and CGPA margin"""
+    k = parse_top_k(20)
+    try:
+        db = get_db()
+        cur = db.cursor(dictionary=True)
+        cur.execute("SELECT officer_id FROM JobPosting WHERE job_id = %s", (job_id,))
+        job = cur.fetchone()
+        if not job or job["officer_id"] != g.user_id:
+            cur.close(); db.close()
+            return jsonify({"error": "Job not found"}), 404
+        cur.execute("""
+            SELECT a.application_id, a.student_id, s.name, s.university_roll, s.branch, s.cgpa, a.status
+            FROM Application a JOIN students s ON s.student_id = a.student_id
+            WHERE a.job_id = %s
+        """, (job_id,))
+        applicants = {row["student_id"]: row for row in cur.fetchall()}
+        cur.close()
+
+        match_engine.ensure_loaded(get_db)
+        cur = db.cursor()
+        match_engine.load_missing(cur, student_ids=list(applicants), job_ids=[job_id])
+        cur.close(); db.close()
+        ranked = match_engine.rank_students(job_id, list(applicants), k=k)
+        return jsonify([dict(applicants[r.pop("id")], **r) for r in ranked])
+    except Exception:
+        logger.exception("Error ranking applicants")
+        return jsonify({"error": "Failed to rank applicants"}), 500
+
+@app.route("/api/student/job-matches", methods=["GET"])
+@require_auth(role="student")
+def get_job_matches():
+    """Top-k open, eligible, not-yet-applied jobs for the logged-in student"""
+    student_id = g.user_id
+    k = parse_top_k(10)
+    try:
+        db = get_db()
+        cur = db.cursor(dictionary=True)
+        cur.execute("SELECT branch, cgpa FROM students WHERE student_id = %s", (student_id,))
+        student = cur.fetchone()
+        if not student:
+            cur.close(); db.close()
+            return jsonify({"error": "Student not found"}), 404
+        cur.execute(ELIGIBLE_JOBS_SQL, (student["branch"], ALL_BRANCHES, student["cgpa"], student_id))
+        jobs = {row["job_id"]: row for row in cur.fetchall()}
+        cur.close()
+
+        match_engine.ensure_loaded(get_db)
+        cur = db.cursor()
+        match_engine.load_missing(cur, student_ids=[student_id], job_ids=list(jobs))
+        cur.close(); db.close()
+        ranked = match_engine.rank_jobs(student_id, list(jobs), k=k)
+        return jsonify([dict(jobs[r.pop("id")], **r) for r in ranked])
+    except Exception:
+        logger.exception("Error ranking jobs")
+        return jsonify({"error": "Failed to rank jobs"}), 500
+
+@app.route("/api/health/matching", methods=["GET"])
+def matching_metrics():
+    return jsonify(match_engine.stats())
+
+# ===========================
+# Job Search
+# ===========================
+job_search = JobSearch(reload_seconds=Config.SEARCH_RELOAD_SECONDS, check_seconds=Config.SEARCH_CHECK_SECONDS)
+
+@app.route("/api/jobs/search", methods=["GET"])
+@require_auth()
+def search_jobs():
+    """Open postings matching `q` in title, skills or description, ranked by BM25.
+
+    Query params: q (required), package_min, package_max, deadline_from,
+    deadline_to (YYYY-MM-DD; deadline_from defaults to today), skill, limit,
+    cursor. Returns {"jobs", "total", "next_cursor"}; each job carries its score.
+    """
+    args = request.args
+    query = (args.get("q") or "").strip()
+    if not query:
+        return jsonify({"error": "q is required"}), 400
+    try:
+        limit = max(1, min(int(args.get("limit", 20)), 100))
+        after = decode_cursor(args.get("cursor"))
+        package_min = float(args["package_min"]) if args.get("package_min") else None
+        package_max = float(args["package_max"]) if args.get("package_max") else None
+        deadline_from = datetime.date.fromisoformat(args["deadline_from"]) if args.get("deadline_from") else None
+        deadline_to = datetime.date.fromisoformat(args["deadline_to"]) if args.get("deadline_to") else None
+    except (TypeError, ValueError):
+        return jsonify({"error": "Invalid query parameters"}), 400
+    deadline_from = deadline_from or datetime.date.today()
+
+    try:
+        job_search.ensure_loaded(get_db)
+        page, next_after, total = job_search.search(
+            query, package_min=package_min, package_max=package_max, deadline_from=deadline_from,
+            deadline_to=deadline_to, skill=args.get("skill"), limit=limit, after=after,
+        )
+        jobs = {}
+        if page:
+            db = get_db()
+            cur = db.cursor(dictionary=True)
+            # The index may lag a posting that was just closed elsewhere; re-check against the row
+            cur.execute(f"""
+                SELECT job_id, title, description, branch_eligibility, min_cgpa, package_stipend, deadline, created_at
+                FROM JobPosting
+                WHERE job_id IN ({','.join(['%s'] * len(page))}) AND status = 'Open' AND deadline >= %s
+            """, [job_id for job_id, _ in page] + [deadline_from])
+            jobs = {row["job_id"]: row for row in cur.fetchall()}
+            cur.close(); db.close()
+        return jsonify({
+            "jobs": [dict(jobs[job_id], score=round(score, 4)) for job_id, score in page if job_id in jobs],
+            "total": total,
+            "next_cursor": encode_cursor(next_after) if next_after else None,
+        })
+    except Exception:
+        logger.exception("Error searching jobs")
+        return jsonify({"error": "Failed to search jobs"}), 500
+
+@app.route("/api/health/job-search", methods=["GET"])
+def job_search_metrics():
+    return jsonify(job_search.stats())
+
+# ===========================
+# Resume Storage
+# ===========================
+RESUME_REFERENCE_SQL = """
+    INSERT INTO ResumeBlob (sha256, size_bytes, content_type, ref_count) VALUES (%s, %s, %s, 1)
+    ON DUPLICATE KEY UPDATE ref_count = ref_count + 1
+"""
+
+# Whether a resume reference belongs to a student (profile or any application)
+RESUME_OWNER_SQL = """
+    SELECT 1 FROM students WHERE student_id = %s AND resume_path = %s
+    UNION ALL
+    SELECT 1 FROM Application WHERE student_id = %s AND resume_path = %s
+    LIMIT 1
+"""
+RESUME_EXTENSIONS = {PDF: ".pdf", DOC: ".doc", DOCX: ".docx"}
+
+def store_resume(cur, upload):
+    """Stream an uploaded resume into the blob store and take a reference on it; returns (ref, content type).
+
+    The type is sniffed from the file itself; the uploader's Content-Type is ignored.
+    """
+    with instrumentation.timed("upload_ms"):
+        ref, digest, size, content_type = resume_store.save(upload.stream)
+    cur.execute(RESUME_REFERENCE_SQL, (digest, size, content_type))
+    return ref, content_type
+
+# Text extraction runs in task workers; each process's index follows ResumeText.updated_at
+resume_search = ResumeSearch(reload_seconds=Config.RESUME_INDEX_RELOAD_SECONDS,
+                             check_seconds=Config.RESUME_INDEX_CHECK_SECONDS)
+resume_extractor = ResumeExtractor(
+    resume_store,
+    workers=Config.RESUME_EXTRACT_WORKERS,
+    max_chars=Config.RESUME_TEXT_MAX_CHARS,
+    timeout=Config.RESUME_EXTRACT_TIMEOUT,
+)
+
+def resume_text_key(digest, student_id=None):
+    return f"resume-text:{digest}" + (f":{student_id}" if student_id is not None else "")
+
+def queue_resume_text(cur, ref, content_type, student_id):
+    """Have a worker extract a just-stored resume's text once the caller commits."""
+    digest = resume_store.digest_of(ref)
+    if digest:
+        # Text already stored for this blob is re-indexed for its new user right away
+        cur.execute(RESUME_TEXT_TOUCH_SQL, (digest,))
+        task_queue.enqueue(cur, "resumes.extract",
+                           {"digest": digest, "content_type": content_type, "student_id": student_id},
+                           key=resume_text_key(digest, student_id))
+
+@task_queue.task("resumes.extract")
+def extract_resume_task(db, digest, content_type, student_id=None):
+    resume_extractor.process(db, digest, content_type, student_id)
+
+def release_resume(cur, ref):
+    """Drop one reference; the file itself is removed later by gc-resumes."""
+    digest = resume_store.digest_of(ref)
+    if digest:
+        cur.execute("UPDATE ResumeBlob SET ref_count = GREATEST(ref_count - 1, 0) WHERE sha256 = %s", (digest,))
+
+@app.errorhandler(UploadTooLarge)
+@app.errorhandler(413)
+def handle_upload_too_large(e):
+    return jsonify({"error": f"Resume must be at most {Config.RESUME_MAX_BYTES // (1024 * 1024)} MB"}), 413
+
+@app.errorhandler(UnsupportedType)
+def handle_unsupported_type(e):
+    return jsonify({"error": "Resume must be a PDF, DOC or DOCX file"}), 415
+
+@app.route("/uploads/<name>")
+@require_auth(allow_query_token=True)
+def serve_resume(name):
+    """Download a resume by its sha256 (blob store) or legacy upload file name; officers, or the student who uploaded it"""
+    digest = name if resume_store.digest_of(BLOB_PREFIX + name) else None
+    if digest:
+        ref, path = BLOB_PREFIX + digest, resume_store.blob_path(digest)
+    else:
+        path = os.path.join(app.config["UPLOAD_FOLDER"], secure_filename(name))
+        ref = path
+    if not os.path.isfile(path):
+        return jsonify({"error": "Resume not found"}), 404
+
+    db = get_db()
+    cur = db.cursor()
+    try:
+        if g.role != "officer":
+            cur.execute(RESUME_OWNER_SQL, (g.user_id, ref, g.user_id, ref))
+            if not cur.fetchall():
+                # Same answer as a missing file, so ownership of a digest cannot be probed
+                return jsonify({"error": "Resume not found"}), 404
+        content_type = None
+        if digest:
+            cur.execute("SELECT content_type FROM ResumeBlob WHERE sha256 = %s", (digest,))
+            row = cur.fetchone()
+            content_type = row[0] if row else None
+    finally:
+        cur.close(); db.close()
+    # Only the resume types are ever served as themselves; blobs stored before uploads were sniffed,
+    # and legacy files, are checked again
+    if content_type not in RESUME_TYPES:
+        content_type = sniff_type(path) or "application/octet-stream"
+    response = send_file(path, mimetype=content_type, as_attachment=True,
+                         download_name=f"resume-{(digest or 'legacy')[:12]}{RESUME_EXTENSIONS.get(content_type, '')}",
+                         etag=digest or True, max_age=None)
+    response.headers["X-Content-Type-Options"] = "nosniff"
+    # Content-addressed, so the bytes never change, but only the requesting user may keep a copy
+    response.headers["Cache-Control"] = "private, max-age=31536000" if digest else "private, no-cache"
+    return response
+
+def referenced_resumes(cur):
+    """(blob digests, legacy paths) referenced from students and Application."""
+    cur.execute("SELECT resume_path FROM students WHERE resume_path IS NOT NULL UNION SELECT resume_path FROM Application WHERE resume_path IS NOT NULL")
+    digests, legacy = set(), set()
+    for (ref,) in cur.fetchall():
+        digest = resume_store.digest_of(ref)
+        if digest:
+            digests.add(digest)
+        else:
+            legacy.add(ref)
+    return digests, legacy
+
+@app.cli.command("gc-resumes")
+def gc_resumes_command():
+    """Delete resume blobs no longer referenced by students or Application (flask --app app gc-resumes)."""
+    db = get_db()
+    cur = db.cursor()
+    digests, _ = referenced_resumes(cur)
+    deleted, freed = resume_store.collect(digests, grace_seconds=Config.RESUME_GC_GRACE)
+    # Re-sync reference counts with the actual references
+    cur.execute("""
+        UPDATE ResumeBlob b
+        LEFT JOIN (
+            SELECT SUBSTRING(resume_path, %s) AS sha256, COUNT(*) AS refs
+            FROM (SELECT resume_path FROM students UNION ALL SELECT resume_path FROM Application) r
+            WHERE resume_path LIKE %s
+            GROUP BY sha256
+        ) r ON r.sha256 = b.sha256
+        SET b.ref_count = COALESCE(r.refs, 0)
+    """, (len(BLOB_PREFIX) + 1, BLOB_PREFIX + "%"))
+    cur.execute("DELETE FROM ResumeBlob WHERE ref_count = 0 AND created_at < NOW() - INTERVAL %s SECOND", (Config.RESUME_GC_GRACE,))
+    db.commit()
+    cur.close(); db.close()
+    print(f"Deleted {deleted} unreferenced blobs ({freed} bytes)")
+
+@app.cli.command("migrate-uploads")
+def migrate_uploads_command():
+    """Move legacy per-upload files into the blob store and rewrite resume_path (flask --app app migrate-uploads)."""
+    db = get_db()
+    cur = db.cursor()
+    _, legacy = referenced_resumes(cur)
+    migrated = 0
+    for path in sorted(legacy):
+        if not os.path.exists(path):
+            continue
+        try:
+            with open(path, "rb") as f:
+                ref, digest, size, content_type = resume_store.save(f)
+        except UnsupportedType:
+            # Stays a legacy upload; /uploads still serves it as an attachment of unknown type
+            print(f"Skipped {path}: not a PDF, DOC or DOCX file")
+            continue
+        cur.execute("UPDATE students SET resume_path = %s WHERE resume_path = %s", (ref, path))
+        refs = cur.rowcount
+        cur.execute("UPDATE Application SET resume_path = %s WHERE resume_path = %s", (ref, path))
+        refs += cur.rowcount
+        cur.execute("""
+            INSERT INTO ResumeBlob (sha256, size_bytes, content_type, ref_count) VALUES (%s, %s, %s, %s)
+            ON DUPLICATE KEY UPDATE ref_count = ref_count + VALUES(ref_count)
+        """, (digest, size, content_type, refs))
+        db.commit()
+        migrated += 1
+    cur.close(); db.close()
+    print(f"Migrated {migrated} legacy uploads; remove the originals once verified")
 
 # ===========================
 # Serve Frontend Files
 # ===========================
+FRONTEND_FOLDER = os.path.join(app.root_path, "frontend")
+ASSET_BUILD_DIR = os.path.join(app.root_path, Config.ASSET_BUILD_DIR)
+if Config.ASSET_BUILD_ON_START:
+    static_assets.build(FRONTEND_FOLDER, ASSET_BUILD_DIR, use_brotli=Config.ASSET_BROTLI)
+frontend_assets = StaticAssets(ASSET_BUILD_DIR).load()
+
+def serve_asset(path):
+    """Precompressed variant the client accepts; hashed files are immutable, pages revalidate by ETag"""
+    found = frontend_assets.resolve(path, request.headers.get("Accept-Encoding"))
+    if found is None:
+        abort(404)
+    file_path, mimetype, encoding, etag, cache_control = found
+    response = send_file(file_path, mimetype=mimetype, etag=etag, conditional=True)
+    response.headers["Cache-Control"] = cache_control
+    response.headers["Vary"] = "Accept-Encoding"
+    if encoding:
+        response.headers["Content-Encoding"] = encoding
+    return response
+
 @app.route("/")
 def index():
-    return send_from_directory(app.static_folder, "index.html")
+    return serve_asset("index.html")
 
 @app.route("/<path:path>")
 def static_proxy(path):
-    return send_from_directory(app.static_folder, path)
+    return serve_asset(path)
+
+@app.route("/api/health/static-assets", methods=["GET"])
+def static_assets_metrics():
+    return jsonify(frontend_assets.stats())
+
+@app.cli.command("build-assets")
+def build_assets_command():
+    """Fingerprint and precompress frontend/ into ASSET_BUILD_DIR (flask --app app build-assets)."""
+    manifest = static_assets.build(FRONTEND_FOLDER, ASSET_BUILD_DIR, use_brotli=Config.ASSET_BROTLI)
+    for source, hashed in sorted(manifest["assets"].items()):
+        print(f"{source} -> {hashed}")
+    print(f"Built {len(manifest['files'])} files into {ASSET_BUILD_DIR}")
+
+# ===========================
+# Password Hashing
+# ===========================
+password_hasher = PasswordHasher(
+    rounds=Config.BCRYPT_ROUNDS,
+    workers=Config.BCRYPT_WORKERS,
+    max_queue=Config.BCRYPT_MAX_QUEUE,
+    retry_after=Config.BCRYPT_RETRY_AFTER,
+    observer=(lambda kind, seconds: instrumentation.add("bcrypt_ms", seconds * 1000)) if Config.METRICS_ENABLED else None,
+    bulk_workers=Config.BCRYPT_BULK_WORKERS,
+)
+
+@app.errorhandler(PasswordPoolBusy)
+def handle_password_pool_busy(e):
+    return jsonify({"error": "Too many login attempts in progress, please retry"}), 503, {"Retry-After": str(e.retry_after)}
+
+def rehash_if_needed(table, id_column, row_id, password, stored):
+    """Upgrade a stored hash to the configured cost after a successful login."""
+    if not password_hasher.needs_rehash(stored):
+        return
+    try:
+        new_hash = password_hasher.hash(password)
+        db = get_db()
+        cur = db.cursor()
+        cur.execute(f"UPDATE {table} SET password_hash = %s WHERE {id_column} = %s", (new_hash, row_id))
+        db.commit()
+        cur.close(); db.close()
+    except Exception:
+        # The login itself succeeded; try again next time
+        logger.exception("Password rehash error")
+
+@app.route("/api/health/password-pool", methods=["GET"])
+def password_pool_metrics():
+    return jsonify(password_hasher.stats())
 
 # ===========================
 # Student Authentication
@@ -58,9 +893,9 @@ def student_login():
     if not row:
         return jsonify({"error": "Invalid credentials"}), 401
 
-    stored = row["password_hash"].encode("utf-8")
-    if not bcrypt.checkpw(password.encode("utf-8"), stored):
+    if not password_hasher.check(password, row["password_hash"]):
         return jsonify({"error": "Invalid credentials"}), 401
+    rehash_if_needed("students", "student_id", row["student_id"], password, row["password_hash"])
 
     token = jwt.encode({
         "id": row["student_id"],
@@ -88,7 +923,7 @@ def student_register():
     if not all([name, email, password, branch, cgpa, university_roll]):
         return jsonify({"error": "All fields required"}), 400
 
-    hashed_pw = bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt())
+    hashed_pw = password_hasher.hash(password)
 
     try:
         db = get_db()
@@ -99,11 +934,12 @@ def student_register():
         )
         db.commit()
         cur.close(); db.close()
+        response_cache.invalidate("students")
         return jsonify({"message": "Student registered successfully"}), 201
     except mysql.connector.IntegrityError:
         return jsonify({"error": "Email or university roll already exists"}), 409
-    except Exception as e:
-        print("Registration error:", e)
+    except Exception:
+        logger.exception("Registration error")
         return jsonify({"error": "Registration failed"}), 500
 
 # ===========================
@@ -119,7 +955,7 @@ def officer_register():
     if not all([name, email, password]):
         return jsonify({"error": "All fields required"}), 400
 
-    hashed_pw = bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt())
+    hashed_pw = password_hasher.hash(password)
 
     try:
         db = get_db()
@@ -133,8 +969,8 @@ def officer_register():
         return jsonify({"message": "Officer registered successfully"}), 201
     except mysql.connector.IntegrityError:
         return jsonify({"error": "Email already exists"}), 409
-    except Exception as e:
-        print("Registration error:", e)
+    except Exception:
+        logger.exception("Registration error")
         return jsonify({"error": "Registration failed"}), 500
 
 
@@ -156,9 +992,9 @@ def officer_login():
     if not row:
         return jsonify({"error": "Invalid credentials"}), 401
 
-    stored = row["password_hash"].encode("utf-8")
-    if not bcrypt.checkpw(password.encode("utf-8"), stored):
+    if not password_hasher.check(password, row["password_hash"]):
         return jsonify({"error": "Invalid credentials"}), 401
+    rehash_if_needed("PlacementOfficer", "officer_id", row["officer_id"], password, row["password_hash"])
 
     token = jwt.encode({
         "id": row["officer_id"],
@@ -171,52 +1007,109 @@ def officer_login():
 # ===========================
 # Job Posting / Applications
 # ===========================
+# Stored in JobEligibility.branch for postings open to every branch
+ALL_BRANCHES = "*"
+
+# Open, eligible, not-yet-applied jobs; params: (branch, ALL_BRANCHES, cgpa, student_id)
+ELIGIBLE_JOBS_SQL = """
+    SELECT jp.job_id, jp.title, jp.description, jp.branch_eligibility, jp.min_cgpa, jp.package_stipend, jp.deadline, jp.created_at
+    FROM JobEligibility e
+    JOIN JobPosting jp ON jp.job_id = e.job_id
+    WHERE e.branch IN (%s, %s)
+    AND e.min_cgpa <= %s
+    AND e.deadline >= CURDATE()
+    AND jp.status = 'Open'
+    AND NOT EXISTS (SELECT 1 FROM Application a WHERE a.student_id = %s AND a.job_id = e.job_id)
+    ORDER BY jp.created_at DESC
+"""
+
+def parse_branch_eligibility(text):
+    """Split the free-text branch_eligibility ("CSE, IT", "CSE/ECE", "All") into branch names."""
+    branches = {b.strip() for b in re.split(r"[,/;|]", text or "") if b.strip()}
+    if not branches or any(b.lower() == "all" for b in branches):
+        return [ALL_BRANCHES]
+    return sorted(branches)
+
+def index_job_eligibility(cur, job_id, branch_eligibility, min_cgpa, deadline):
+    """(Re)write the JobEligibility rows for one posting."""
+    cur.execute("DELETE FROM JobEligibility WHERE job_id = %s", (job_id,))
+    cur.executemany(
+        "INSERT INTO JobEligibility (job_id, branch, min_cgpa, deadline) VALUES (%s, %s, %s, %s)",
+        [(job_id, branch, float(min_cgpa), deadline) for branch in parse_branch_eligibility(branch_eligibility)]
+    )
+
+@app.cli.command("rebuild-eligibility")
+def rebuild_eligibility_command():
+    """Rebuild JobEligibility from JobPosting.branch_eligibility (flask --app app rebuild-eligibility)."""
+    db = get_db()
+    cur = db.cursor()
+    cur.execute("SELECT job_id, branch_eligibility, min_cgpa, deadline FROM JobPosting")
+    jobs = cur.fetchall()
+    for job_id, branch_eligibility, min_cgpa, deadline in jobs:
+        index_job_eligibility(cur, job_id, branch_eligibility, min_cgpa, deadline)
+    db.commit()
+    cur.close(); db.close()
+    print(f"Indexed eligibility for {len(jobs)} job postings")
+
 @app.route("/api/jobs", methods=["GET"])
+@require_auth(role="student")
+@cached_response("jobs", ["jobs", "student:{user_id}"])
 def get_jobs():
-    token = request.headers.get("Authorization")
-    if not token or not token.startswith("Bearer "):
-        return jsonify({"error": "Authorization required"}), 401
-    try:
-        payload = jwt.decode(token.split(" ")[1], JWT_SECRET, algorithms=["HS256"])
-        student_id = payload["id"]
-    except jwt.ExpiredSignatureError:
-        return jsonify({"error": "Token expired"}), 401
-    except jwt.InvalidTokenError:
-        return jsonify({"error": "Invalid token"}), 401
+    """Open jobs the student is eligible for and has not applied to yet.
+
+    Served from the JobEligibility index. The weak ETag covers the student's
+    branch/CGPA, the postings and their applications, so an unchanged feed
+    answers If-None-Match with 304 after one cheap query.
+    """
+    student_id = g.user_id
 
     try:
         db = get_db()
         cur = db.cursor(dictionary=True)
-        # Get all open jobs that student hasn't applied to yet
         cur.execute("""
-            SELECT jp.job_id, jp.title, jp.description, jp.branch_eligibility, jp.min_cgpa, jp.package_stipend, jp.deadline, jp.created_at
-            FROM JobPosting jp
-            LEFT JOIN Application a ON jp.job_id = a.job_id AND a.student_id = %s
-            WHERE a.application_id IS NULL
-            AND jp.deadline >= CURDATE()
-            AND jp.status = 'Open'
-            ORDER BY jp.created_at DESC
+            SELECT s.branch, s.cgpa, CURDATE() AS today,
+                   (SELECT COUNT(*) FROM JobPosting) AS job_count,
+                   (SELECT MAX(updated_at) FROM JobPosting) AS jobs_updated,
+                   (SELECT COUNT(*) FROM Application a WHERE a.student_id = s.student_id) AS applied_count,
+                   (SELECT MAX(application_id) FROM Application a WHERE a.student_id = s.student_id) AS last_applied
+            FROM students s
+            WHERE s.student_id = %s
         """, (student_id,))
+        student = cur.fetchone()
+        if not student:
+            cur.close(); db.close()
+            return jsonify({"error": "Student not found"}), 404
+
+        etag = hashlib.sha1(json.dumps(list(student.values()), default=str).encode("utf-8")).hexdigest()
+        if request.if_none_match.contains_weak(etag):
+            cur.close(); db.close()
+            return "", 304, {"ETag": f'W/"{etag}"', "Cache-Control": "private, no-cache"}
+
+        cur.execute(ELIGIBLE_JOBS_SQL, (student["branch"], ALL_BRANCHES, student["cgpa"], student_id))
         rows = cur.fetchall()
         cur.close(); db.close()
-        return jsonify(rows)
-    except Exception as e:
-        print("Error fetching jobs:", e)
+        response = jsonify(rows)
+        response.set_etag(etag, weak=True)
+        response.headers["Cache-Control"] = "private, no-cache"
+        return response
+    except Exception:
+        logger.exception("Error fetching jobs")
         return jsonify({"error": "Failed to fetch jobs"}), 500
 
+# Statements behind apply_job, shared with the async handler in asgi.py
+APPLY_CHECK_SQL = """
+    SELECT jp.min_cgpa, jp.branch_eligibility, jp.officer_id, s.cgpa, s.branch
+    FROM JobPosting jp
+    JOIN students s ON s.student_id = %s
+    WHERE jp.job_id = %s
+"""
+APPLY_BRANCH_SQL = "SELECT 1 FROM JobEligibility WHERE job_id = %s AND branch IN (%s, %s)"
+APPLY_INSERT_SQL = "INSERT INTO Application (student_id, job_id, resume_path, status, applied_on) VALUES (%s, %s, %s, 'Applied', NOW())"
+
 @app.route("/api/jobs/<int:job_id>/apply", methods=["POST"])
+@require_auth(role="student")
 def apply_job(job_id):
-    # Extract student_id from JWT token
-    token = request.headers.get("Authorization")
-    if not token or not token.startswith("Bearer "):
-        return jsonify({"error": "Authorization required"}), 401
-    try:
-        payload = jwt.decode(token.split(" ")[1], JWT_SECRET, algorithms=["HS256"])
-        student_id = payload["id"]
-    except jwt.ExpiredSignatureError:
-        return jsonify({"error": "Token expired"}), 401
-    except jwt.InvalidTokenError:
-        return jsonify({"error": "Invalid token"}), 401
+    student_id = g.user_id
 
     resume = request.files.get("resume")
     if not resume:
@@ -225,12 +1118,7 @@ def apply_job(job_id):
     # Check eligibility
     db = get_db()
     cur = db.cursor(dictionary=True)
-    cur.execute("""
-        SELECT jp.min_cgpa, jp.branch_eligibility, s.cgpa, s.branch
-        FROM JobPosting jp
-        JOIN students s ON s.student_id = %s
-        WHERE jp.job_id = %s
-    """, (student_id, job_id))
+    cur.execute(APPLY_CHECK_SQL, (student_id, job_id))
     job = cur.fetchone()
     if not job:
         cur.close(); db.close()
@@ -242,56 +1130,131 @@ def apply_job(job_id):
         return jsonify({"error": f"CGPA requirement not met. Required: {job['min_cgpa']}, Your CGPA: {job['cgpa']}"}), 400
 
     # Check branch eligibility
-    if job['branch_eligibility'] != 'All' and job['branch'] not in job['branch_eligibility']:
+    cur.execute(APPLY_BRANCH_SQL, (job_id, job['branch'], ALL_BRANCHES))
+    if not cur.fetchall():
         cur.close(); db.close()
         return jsonify({"error": f"Branch eligibility not met. Eligible branches: {job['branch_eligibility']}, Your branch: {job['branch']}"}), 400
 
-    filename = secure_filename(resume.filename)
-    save_path = os.path.join(app.config["UPLOAD_FOLDER"], f"{student_id}_{int(datetime.datetime.utcnow().timestamp())}_{filename}")
-    resume.save(save_path)
+    resume_ref, content_type = store_resume(cur, resume)
 
-    cur.execute("INSERT INTO Application (student_id, job_id, resume_path, status, applied_on) VALUES (%s, %s, %s, 'Applied', NOW())",
-                (student_id, job_id, save_path))
+    cur.execute(APPLY_INSERT_SQL, (student_id, job_id, resume_ref))
+    application_id = cur.lastrowid
+    shift_application_summary(cur, "a.application_id = %s", [application_id], 1)
+    queue_resume_text(cur, resume_ref, content_type, student_id)
     db.commit()
     cur.close(); db.close()
+    response_cache.invalidate(f"student:{student_id}")
+    publish_events([(f"officer:{job['officer_id']}", "application",
+                     {"application_id": application_id, "job_id": job_id, "status": "Applied"})])
     return jsonify({"message": "Applied successfully"})
 
 # ===========================
 # Student Management
 # ===========================
+APPLICATION_STATUSES = ['Applied', 'Shortlisted', 'Selected', 'Rejected']
+
+# Sortable columns for the student list; student_id breaks ties
+STUDENT_SORT_COLUMNS = {
+    "created_at": "created_at",
+    "cgpa": "cgpa",
+    "name": "name",
+    "university_roll": "university_roll",
+}
+
 @app.route("/api/students", methods=["GET"])
 @app.route("/api/student/list", methods=["GET"])
+@require_auth(role="officer")
+@cached_response("student_list", ["students"], per_user=False)
 def get_all_students():
-    """Get all students with their details"""
+    """List students one keyset page at a time, with optional filters.
+
+    Query params: branch, cgpa_min, cgpa_max, skill, roll_prefix, name,
+    sort (created_at|cgpa|name|university_roll), order (asc|desc), limit, cursor.
+    The body is a JSON array; X-Next-Cursor and (on the first page) X-Total-Count
+    are returned as headers.
+    """
+    args = request.args
+    sort = args.get("sort", "created_at")
+    order = args.get("order", "desc").lower()
+    if sort not in STUDENT_SORT_COLUMNS or order not in ("asc", "desc"):
+        return jsonify({"error": "Invalid sort or order"}), 400
     try:
-        db = get_db()
-        cur = db.cursor(dictionary=True)
+        limit = max(1, min(int(args.get("limit", 50)), 500))
+        after = decode_cursor(args.get("cursor"))
+        cgpa_min = float(args["cgpa_min"]) if args.get("cgpa_min") else None
+        cgpa_max = float(args["cgpa_max"]) if args.get("cgpa_max") else None
+    except (TypeError, ValueError):
+        return jsonify({"error": "Invalid limit, cursor or CGPA range"}), 400
+
+    filters, params = [], []
+    if args.get("branch"):
+        filters.append("s.branch = %s")
+        params.append(args["branch"])
+    if cgpa_min is not None:
+        filters.append("s.cgpa >= %s")
+        params.append(cgpa_min)
+    if cgpa_max is not None:
+        filters.append("s.cgpa <= %s")
+        params.append(cgpa_max)
+    if args.get("roll_prefix"):
+        filters.append("CAST(s.university_roll AS CHAR) LIKE %s")
+        params.append(args["roll_prefix"].strip() + "%")
+    if args.get("name"):
+        filters.append("s.name LIKE %s")
+        params.append("%" + args["name"].strip() + "%")
+    if args.get("skill"):
+        filters.append("""EXISTS (SELECT 1 FROM StudentSkill ss JOIN Skill sk ON sk.skill_id = ss.skill_id
+                       WHERE ss.student_id = s.student_id AND sk.skill_name = %s)""")
+        params.append(normalize_skill(args["skill"]))
+
+    column = STUDENT_SORT_COLUMNS[sort]
+    op = "<" if order == "desc" else ">"
+    page_filters, page_params = list(filters), list(params)
+    if after:
+        page_filters.append(f"(s.{column} {op} %s OR (s.{column} = %s AND s.student_id {op} %s))")
+        page_params.extend([after[0], after[0], after[1]])
+    where = ("WHERE " + " AND ".join(page_filters)) if page_filters else ""
 
-        # Query to get all student details with skills
-        cur.execute("""
-            SELECT s.student_id, s.university_roll, s.name, s.email, s.branch as department, s.cgpa,
-                   GROUP_CONCAT(sk.skill_name) as skills, s.resume_path, s.created_at
+    try:
+        db = get_db()
+        cur = db.cursor()
+        # Skills per row from the (student_id, skill_id) key, so the page streams in one pass
+        cur.execute(f"""
+            SELECT s.student_id, s.university_roll, s.name, s.email, s.branch, s.branch as department, s.cgpa,
+                   s.resume_path, s.created_at,
+                   (SELECT JSON_ARRAYAGG(sk.skill_name) FROM StudentSkill ss JOIN Skill sk ON ss.skill_id = sk.skill_id
+                    WHERE ss.student_id = s.student_id) AS skills
             FROM students s
-            LEFT JOIN StudentSkill ss ON s.student_id = ss.student_id
-            LEFT JOIN Skill sk ON ss.skill_id = sk.skill_id
-            GROUP BY s.student_id
-            ORDER BY s.created_at DESC
-        """)
-
-        students = cur.fetchall()
-        # Convert skills string to array
-        for student in students:
-            student['skills'] = student['skills'].split(',') if student['skills'] else []
+            {where}
+            ORDER BY s.{column} {order.upper()}, s.student_id {order.upper()}
+            LIMIT %s
+        """, page_params + [limit + 1])
+
+        def with_skills(student):
+            student["skills"] = orjson.loads(student["skills"]) if student["skills"] else []
+            return student
+
+        body = json_body()
+        last, has_more = body.page(fetch_rows(cur, Config.JSON_FETCH_SIZE), limit, with_skills)
+
+        headers = {}
+        if has_more:
+            headers["X-Next-Cursor"] = encode_cursor([last[sort], last["student_id"]])
+        if not after:
+            where = ("WHERE " + " AND ".join(filters)) if filters else ""
+            cur.execute(f"SELECT COUNT(*) FROM students s {where}", params)
+            headers["X-Total-Count"] = str(cur.fetchone()[0])
         cur.close()
         db.close()
 
-        return jsonify(students)
+        return body.response(app.response_class, headers=headers)
 
-    except Exception as e:
-        print("Error fetching students:", e)
+    except Exception:
+        logger.exception("Error fetching students")
         return jsonify({"error": "Failed to fetch students"}), 500
 
 @app.route("/api/students/<int:student_id>", methods=["GET"])
+@require_auth(role="officer")
 def get_student_details(student_id):
     """Get detailed information about a specific student"""
     try:
@@ -315,23 +1278,16 @@ def get_student_details(student_id):
 
         return jsonify(student)
 
-    except Exception as e:
-        print("Error fetching student details:", e)
+    except Exception:
+        logger.exception("Error fetching student details")
         return jsonify({"error": "Failed to fetch student details"}), 500
 
 @app.route("/api/student/profile", methods=["GET"])
+@require_auth(role="student")
+@cached_response("student_profile", ["student:{user_id}"])
 def get_student_profile():
     """Get profile data for the logged-in student"""
-    token = request.headers.get("Authorization")
-    if not token or not token.startswith("Bearer "):
-        return jsonify({"error": "Authorization required"}), 401
-    try:
-        payload = jwt.decode(token.split(" ")[1], JWT_SECRET, algorithms=["HS256"])
-        student_id = payload["id"]
-    except jwt.ExpiredSignatureError:
-        return jsonify({"error": "Token expired"}), 401
-    except jwt.InvalidTokenError:
-        return jsonify({"error": "Invalid token"}), 401
+    student_id = g.user_id
 
     try:
         db = get_db()
@@ -355,26 +1311,18 @@ def get_student_profile():
         # Convert skills to list
         profile['skills'] = profile['skills'].split(',') if profile['skills'] else []
         # Check if resume exists
-        profile['resume_uploaded'] = bool(profile['resume_path'] and os.path.exists(profile['resume_path']))
+        profile['resume_uploaded'] = resume_store.exists(profile['resume_path'])
 
         return jsonify(profile)
-    except Exception as e:
-        print("Error fetching profile:", e)
+    except Exception:
+        logger.exception("Error fetching profile")
         return jsonify({"error": "Failed to fetch profile"}), 500
 
 @app.route("/api/student/profile", methods=["PUT"])
+@require_auth(role="student")
 def update_student_profile():
     """Update profile data for the logged-in student"""
-    token = request.headers.get("Authorization")
-    if not token or not token.startswith("Bearer "):
-        return jsonify({"error": "Authorization required"}), 401
-    try:
-        payload = jwt.decode(token.split(" ")[1], JWT_SECRET, algorithms=["HS256"])
-        student_id = payload["id"]
-    except jwt.ExpiredSignatureError:
-        return jsonify({"error": "Token expired"}), 401
-    except jwt.InvalidTokenError:
-        return jsonify({"error": "Invalid token"}), 401
+    student_id = g.user_id
 
     data = request.form or request.json or {}
     name = data.get("name")
@@ -420,50 +1368,51 @@ def update_student_profile():
 
         if update_fields:
             update_values.append(student_id)
+            # Report summaries are keyed by branch, so move this student's applications with it
+            if branch:
+                shift_application_summary(cur, "a.student_id = %s", [student_id], -1)
             cur.execute(f"UPDATE students SET {', '.join(update_fields)} WHERE student_id = %s", update_values)
+            if branch:
+                shift_application_summary(cur, "a.student_id = %s", [student_id], 1)
 
         # Handle resume upload
+        resume_ref = None
         if resume:
-            filename = secure_filename(resume.filename)
-            save_path = os.path.join(app.config["UPLOAD_FOLDER"], f"{student_id}_{int(datetime.datetime.utcnow().timestamp())}_{filename}")
-            resume.save(save_path)
-            cur.execute("UPDATE students SET resume_path = %s WHERE student_id = %s", (save_path, student_id))
-
-        # Handle skills
+            cur.execute("SELECT resume_path FROM students WHERE student_id = %s", (student_id,))
+            previous = cur.fetchone()
+            resume_ref, content_type = store_resume(cur, resume)
+            cur.execute("UPDATE students SET resume_path = %s WHERE student_id = %s", (resume_ref, student_id))
+            if previous:
+                release_resume(cur, previous[0])
+            queue_resume_text(cur, resume_ref, content_type, student_id)
+
+        # Handle skills: apply only the added/removed links; ids of new skills are cached after commit
+        new_skills = {}
         if skills:
-            # Remove existing skills
-            cur.execute("DELETE FROM StudentSkill WHERE student_id = %s", (student_id,))
-            # Add new skills
-            for skill_name in skills:
-                skill_name = skill_name.strip()
-                if skill_name:
-                    # Insert skill if not exists
-                    cur.execute("INSERT IGNORE INTO Skill (skill_name) VALUES (%s)", (skill_name,))
-                    cur.execute("SELECT skill_id FROM Skill WHERE skill_name = %s", (skill_name,))
-                    skill_id = cur.fetchone()[0]
-                    cur.execute("INSERT INTO StudentSkill (student_id, skill_id) VALUES (%s, %s)", (student_id, skill_id))
+            skill_resolver.sync_links(cur, "StudentSkill", student_id, skills, new_skills)
 
         db.commit()
+        skill_resolver.publish(new_skills)
+        response_cache.invalidate(f"student:{student_id}", "students")
+        if skills or cgpa:
+            match_engine.refresh_student(cur, student_id)
+        # A new resume reaches the index once its text is stored (see resume_text.py)
+        if branch or cgpa:
+            resume_search.refresh_student(cur, student_id)
         cur.close()
         db.close()
         return jsonify({"message": "Profile updated successfully"})
-    except Exception as e:
-        print("Error updating profile:", e)
+    except (UploadTooLarge, UnsupportedType):
+        raise
+    except Exception:
+        logger.exception("Error updating profile")
         return jsonify({"error": "Failed to update profile"}), 500
 
 @app.route("/api/student/applications", methods=["GET"])
+@require_auth(role="student")
 def get_student_applications():
     """Get applications for the logged-in student"""
-    token = request.headers.get("Authorization")
-    if not token or not token.startswith("Bearer "):
-        return jsonify({"error": "Authorization required"}), 401
-    try:
-        payload = jwt.decode(token.split(" ")[1], JWT_SECRET, algorithms=["HS256"])
-        student_id = payload["id"]
-    except jwt.ExpiredSignatureError:
-        return jsonify({"error": "Token expired"}), 401
-    except jwt.InvalidTokenError:
-        return jsonify({"error": "Invalid token"}), 401
+    student_id = g.user_id
 
     try:
         db = get_db()
@@ -479,29 +1428,25 @@ def get_student_applications():
         cur.close()
         db.close()
         return jsonify(applications)
-    except Exception as e:
-        print("Error fetching applications:", e)
+    except Exception:
+        logger.exception("Error fetching applications")
         return jsonify({"error": "Failed to fetch applications"}), 500
 
 @app.route("/api/student/applications/<int:application_id>", methods=["DELETE"])
+@require_auth(role="student")
 def withdraw_application(application_id):
     """Withdraw an application"""
-    token = request.headers.get("Authorization")
-    if not token or not token.startswith("Bearer "):
-        return jsonify({"error": "Authorization required"}), 401
-    try:
-        payload = jwt.decode(token.split(" ")[1], JWT_SECRET, algorithms=["HS256"])
-        student_id = payload["id"]
-    except jwt.ExpiredSignatureError:
-        return jsonify({"error": "Token expired"}), 401
-    except jwt.InvalidTokenError:
-        return jsonify({"error": "Invalid token"}), 401
+    student_id = g.user_id
 
     try:
         db = get_db()
         cur = db.cursor()
         # Check if application belongs to student and is not selected
-        cur.execute("SELECT status FROM Application WHERE application_id = %s AND student_id = %s", (application_id, student_id))
+        cur.execute("""
+            SELECT a.status, a.resume_path, a.job_id, j.officer_id
+            FROM Application a JOIN JobPosting j ON j.job_id = a.job_id
+            WHERE a.application_id = %s AND a.student_id = %s
+        """, (application_id, student_id))
         app = cur.fetchone()
         if not app:
             cur.close(); db.close()
@@ -510,59 +1455,125 @@ def withdraw_application(application_id):
             cur.close(); db.close()
             return jsonify({"error": "Cannot withdraw a shortlisted application"}), 400
 
+        # Tombstone so officers' incremental sync can drop the row
+        cur.execute("""
+            INSERT INTO DeletedApplication (application_id, job_id)
+            SELECT application_id, job_id FROM Application WHERE application_id = %s
+            ON DUPLICATE KEY UPDATE deleted_at = CURRENT_TIMESTAMP
+        """, (application_id,))
+        shift_application_summary(cur, "a.application_id = %s", [application_id], -1)
         cur.execute("DELETE FROM Application WHERE application_id = %s", (application_id,))
+        release_resume(cur, app[1])
         db.commit()
         cur.close()
         db.close()
+        response_cache.invalidate(f"student:{student_id}")
+        publish_events([(f"officer:{app[3]}", "application",
+                         {"application_id": application_id, "job_id": app[2], "deleted": True})])
         return jsonify({"message": "Application withdrawn successfully"})
-    except Exception as e:
-        print("Error withdrawing application:", e)
+    except Exception:
+        logger.exception("Error withdrawing application")
         return jsonify({"error": "Failed to withdraw application"}), 500
 
 @app.route("/api/student/notifications", methods=["GET"])
+@require_auth(role="student")
 def get_student_notifications():
     """Get notifications for the logged-in student"""
-    token = request.headers.get("Authorization")
-    if not token or not token.startswith("Bearer "):
-        return jsonify({"error": "Authorization required"}), 401
+    student_id = g.user_id
+
     try:
-        payload = jwt.decode(token.split(" ")[1], JWT_SECRET, algorithms=["HS256"])
-        student_id = payload["id"]
-    except jwt.ExpiredSignatureError:
-        return jsonify({"error": "Token expired"}), 401
-    except jwt.InvalidTokenError:
-        return jsonify({"error": "Invalid token"}), 401
+        limit = max(1, min(int(request.args.get("limit", 50)), 200))
+        after = decode_cursor(request.args.get("cursor"))
+    except (TypeError, ValueError):
+        return jsonify({"error": "Invalid limit or cursor"}), 400
 
     try:
         db = get_db()
-        cur = db.cursor(dictionary=True)
-        cur.execute("""
-            SELECT notification_id, message, is_read, created_at
-            FROM Notification
-            WHERE student_id = %s
-            ORDER BY created_at DESC
-        """, (student_id,))
-        notifications = cur.fetchall()
+        cur = db.cursor()
+        # Targeted rows (and broadcasts that were fanned out on write), merged in SQL with
+        # broadcasts read straight from SentNotifications (fan-out-on-read, or not yet copied
+        # to this student); each side is limited first so both use their indexes
+        keyset, keyset_params = keyset_before("created_at", "notification_id", NOTIFICATION_RANK, after)
+        broadcast_keyset, broadcast_params = keyset_before("sn.created_at", "sn.sent_id", BROADCAST_RANK, after)
+        cur.execute(f"""
+            (SELECT 'notification' AS kind, notification_id AS id, message, is_read, created_at, %s AS rnk
+             FROM Notification
+             WHERE student_id = %s {keyset}
+             ORDER BY created_at DESC, notification_id DESC
+             LIMIT %s)
+            UNION ALL
+            (SELECT 'broadcast', sn.sent_id, sn.message, (br.sent_id IS NOT NULL), sn.created_at, %s
+             FROM students s
+             JOIN SentNotifications sn ON sn.fanned_out = FALSE AND sn.created_at >= s.created_at
+                 AND sn.fanout_through < s.student_id
+             LEFT JOIN BroadcastRead br ON br.student_id = s.student_id AND br.sent_id = sn.sent_id
+             WHERE s.student_id = %s
+             AND (sn.target_branches IS NULL OR FIND_IN_SET(s.branch, sn.target_branches))
+             AND (sn.target_min_cgpa IS NULL OR s.cgpa >= sn.target_min_cgpa)
+             {broadcast_keyset}
+             ORDER BY sn.created_at DESC, sn.sent_id DESC
+             LIMIT %s)
+            ORDER BY created_at DESC, rnk DESC, id DESC
+            LIMIT %s
+        """, [NOTIFICATION_RANK, student_id] + keyset_params + [limit + 1, BROADCAST_RANK, student_id]
+             + broadcast_params + [limit + 1, limit + 1])
+
+        def feed_entry(row):
+            if row["kind"] == "broadcast":
+                return {"sent_id": row["id"], "message": row["message"], "is_read": bool(row["is_read"]),
+                        "created_at": row["created_at"], "kind": "broadcast"}
+            return {"notification_id": row["id"], "message": row["message"], "is_read": row["is_read"],
+                    "created_at": row["created_at"], "kind": "notification"}
+
+        body = json_body()
+        last, has_more = body.page(fetch_rows(cur, Config.JSON_FETCH_SIZE), limit, feed_entry)
         cur.close()
         db.close()
-        return jsonify(notifications)
-    except Exception as e:
-        print("Error fetching notifications:", e)
+
+        headers = {}
+        if has_more:
+            headers["X-Next-Cursor"] = encode_cursor(notification_sort_key(last))
+        return body.response(app.response_class, headers=headers)
+    except Exception:
+        logger.exception("Error fetching notifications")
         return jsonify({"error": "Failed to fetch notifications"}), 500
 
+@app.route("/api/student/notifications/read", methods=["PUT"])
+@require_auth(role="student")
+def mark_notifications_read():
+    """Mark targeted notifications and/or broadcasts as read for the logged-in student"""
+    student_id = g.user_id
+
+    data = request.json or {}
+    notification_ids = data.get("notification_ids", [])
+    broadcast_ids = data.get("broadcast_ids", [])
+    if not isinstance(notification_ids, list) or not isinstance(broadcast_ids, list):
+        return jsonify({"error": "notification_ids and broadcast_ids must be lists"}), 400
+
+    try:
+        db = get_db()
+        cur = db.cursor()
+        if notification_ids:
+            format_strings = ','.join(['%s'] * len(notification_ids))
+            cur.execute(f"UPDATE Notification SET is_read = TRUE WHERE student_id = %s AND notification_id IN ({format_strings})",
+                        [student_id] + notification_ids)
+        if broadcast_ids:
+            cur.executemany("INSERT IGNORE INTO BroadcastRead (student_id, sent_id) VALUES (%s, %s)",
+                            [(student_id, sent_id) for sent_id in broadcast_ids])
+        db.commit()
+        cur.close()
+        db.close()
+        return jsonify({"message": "Notifications marked as read"})
+    except Exception:
+        logger.exception("Error marking notifications read")
+        return jsonify({"error": "Failed to mark notifications read"}), 500
+
 @app.route("/api/officer/postings", methods=["GET"])
+@require_auth(role="officer")
+@cached_response("officer_postings", ["postings:{user_id}"])
 def get_officer_postings():
     """Get all job postings for officer"""
-    token = request.headers.get("Authorization")
-    if not token or not token.startswith("Bearer "):
-        return jsonify({"error": "Authorization required"}), 401
-    try:
-        payload = jwt.decode(token.split(" ")[1], JWT_SECRET, algorithms=["HS256"])
-        officer_id = payload["id"]
-    except jwt.ExpiredSignatureError:
-        return jsonify({"error": "Token expired"}), 401
-    except jwt.InvalidTokenError:
-        return jsonify({"error": "Invalid token"}), 401
+    officer_id = g.user_id
 
     try:
         db = get_db()
@@ -572,23 +1583,15 @@ def get_officer_postings():
         cur.close()
         db.close()
         return jsonify(postings)
-    except Exception as e:
-        print("Error fetching postings:", e)
+    except Exception:
+        logger.exception("Error fetching postings")
         return jsonify({"error": "Failed to fetch postings"}), 500
 
 @app.route("/api/officer/postings", methods=["POST"])
+@require_auth(role="officer")
 def create_job_posting():
     """Create a new job posting"""
-    token = request.headers.get("Authorization")
-    if not token or not token.startswith("Bearer "):
-        return jsonify({"error": "Authorization required"}), 401
-    try:
-        payload = jwt.decode(token.split(" ")[1], JWT_SECRET, algorithms=["HS256"])
-        officer_id = payload["id"]
-    except jwt.ExpiredSignatureError:
-        return jsonify({"error": "Token expired"}), 401
-    except jwt.InvalidTokenError:
-        return jsonify({"error": "Invalid token"}), 401
+    officer_id = g.user_id
 
     data = request.json or {}
     title = data.get("title")
@@ -613,29 +1616,57 @@ def create_job_posting():
         """, (officer_id, title, description, branch_eligibility, float(min_cgpa), float(package_stipend), deadline))
 
         job_id = cur.lastrowid
+        index_job_eligibility(cur, job_id, branch_eligibility, min_cgpa, deadline)
 
-        # Insert skills
+        # Insert skills; ids of new skills are cached after commit
+        new_skills = {}
         if skills:
-            for skill_name in skills:
-                skill_name = skill_name.strip()
-                if skill_name:
-                    # Insert skill if not exists
-                    cur.execute("INSERT IGNORE INTO Skill (skill_name) VALUES (%s)", (skill_name,))
-                    cur.execute("SELECT skill_id FROM Skill WHERE skill_name = %s", (skill_name,))
-                    skill_id_row = cur.fetchone()
-                    if skill_id_row:
-                        skill_id_val = skill_id_row[0]
-                        cur.execute("INSERT INTO JobSkill (job_id, skill_id) VALUES (%s, %s)", (job_id, skill_id_val))
+            skill_resolver.sync_links(cur, "JobSkill", job_id, skills, new_skills)
 
         db.commit()
+        skill_resolver.publish(new_skills)
+        # Every student's feed may gain this job
+        response_cache.invalidate("jobs", f"postings:{officer_id}")
+        match_engine.refresh_job(cur, job_id)
+        job_search.refresh_job(cur, job_id)
         cur.close()
         db.close()
         return jsonify({"message": "Job posting created successfully", "job_id": job_id}), 201
-    except Exception as e:
-        print("Error creating job posting:", e)
+    except Exception:
+        logger.exception("Error creating job posting")
         return jsonify({"error": "Failed to create job posting"}), 500
 
+@app.route("/api/officer/postings/<int:job_id>/status", methods=["PUT"])
+@require_auth(role="officer")
+def update_job_posting_status(job_id):
+    """Open or close one of the officer's postings ({"status": "Open"|"Closed"})"""
+    officer_id = g.user_id
+    status = (request.json or {}).get("status")
+    if status not in ("Open", "Closed"):
+        return jsonify({"error": "status must be Open or Closed"}), 400
+
+    try:
+        db = get_db()
+        cur = db.cursor()
+        cur.execute("SELECT status FROM JobPosting WHERE job_id = %s AND officer_id = %s FOR UPDATE", (job_id, officer_id))
+        row = cur.fetchone()
+        if not row:
+            db.rollback()
+            cur.close(); db.close()
+            return jsonify({"error": "Job not found"}), 404
+        if row[0] != status:
+            cur.execute("UPDATE JobPosting SET status = %s WHERE job_id = %s", (status, job_id))
+        db.commit()
+        response_cache.invalidate("jobs", f"postings:{officer_id}")
+        job_search.refresh_job(cur, job_id)
+        cur.close(); db.close()
+        return jsonify({"message": f"Job posting {status.lower()}", "job_id": job_id, "status": status})
+    except Exception:
+        logger.exception("Error updating job posting status")
+        return jsonify({"error": "Failed to update job posting"}), 500
+
 @app.route("/api/officer/student/<university_roll>", methods=["GET"])
+@require_auth(role="officer")
 def get_student_by_roll_number(university_roll):
     """Get student profile by university roll number"""
     try:
@@ -661,186 +1692,740 @@ def get_student_by_roll_number(university_roll):
         student['resume_uploaded'] = bool(student['resume_path'])
 
         return jsonify(student)
-    except Exception as e:
-        print("Error fetching student:", e)
+    except Exception:
+        logger.exception("Error fetching student")
         return jsonify({"error": "Failed to fetch student"}), 500
 
+@app.route("/api/officer/resumes/search", methods=["GET"])
+@require_auth(role="officer")
+def search_resumes():
+    """Students whose resumes match `q`, ranked by BM25.
+
+    Query params: q (required), branch, cgpa_min, cgpa_max, limit, cursor.
+    Returns {"students", "total", "next_cursor"}; resumes appear once their
+    background text extraction has finished.
+    """
+    args = request.args
+    query = (args.get("q") or "").strip()
+    if not query:
+        return jsonify({"error": "q is required"}), 400
+    try:
+        limit = max(1, min(int(args.get("limit", 20)), 100))
+        after = decode_cursor(args.get("cursor"))
+        cgpa_min = float(args["cgpa_min"]) if args.get("cgpa_min") else None
+        cgpa_max = float(args["cgpa_max"]) if args.get("cgpa_max") else None
+    except (TypeError, ValueError):
+        return jsonify({"error": "Invalid limit, cursor or CGPA range"}), 400
+
+    try:
+        resume_search.ensure_loaded(get_db)
+        page, next_after, total = resume_search.search(query, branch=args.get("branch") or None, cgpa_min=cgpa_min,
+                                                       cgpa_max=cgpa_max, limit=limit, after=after)
+        students = {}
+        if page:
+            db = get_db()
+            cur = db.cursor(dictionary=True)
+            cur.execute(f"""
+                SELECT student_id, university_roll, name, email, branch, cgpa, resume_path
+                FROM students WHERE student_id IN ({','.join(['%s'] * len(page))})
+            """, [student_id for student_id, _ in page])
+            students = {row["student_id"]: row for row in cur.fetchall()}
+            cur.close(); db.close()
+        return jsonify({
+            "students": [dict(students[sid], score=round(score, 4)) for sid, score in page if sid in students],
+            "total": total,
+            "next_cursor": encode_cursor(next_after) if next_after else None,
+        })
+    except Exception:
+        logger.exception("Error searching resumes")
+        return jsonify({"error": "Failed to search resumes"}), 500
+
+@app.route("/api/health/resume-text", methods=["GET"])
+def resume_text_metrics():
+    return jsonify({"extraction": resume_extractor.stats(), "index": resume_search.stats()})
+
+@app.cli.command("extract-resumes")
+def extract_resumes_command():
+    """Queue text extraction for every stored resume that has none yet (flask --app app extract-resumes)."""
+    db = get_db()
+    cur = db.cursor()
+    missing = resume_extractor.missing(cur)
+    for digest, content_type in missing:
+        task_queue.enqueue(cur, "resumes.extract", {"digest": digest, "content_type": content_type},
+                           key=resume_text_key(digest))
+    db.commit()
+    cur.close(); db.close()
+    print(f"Queued {len(missing)} resumes for extraction; run `flask --app app tasks work` to process them")
+
 @app.route("/api/officer/applications", methods=["GET"])
+@require_auth(role="officer")
 def get_officer_applications():
-    """Get all applications for officer"""
+    """Applications to the logged-in officer's postings.
+
+    Query params: job_id, status, applied_from, applied_to (YYYY-MM-DD), limit, cursor.
+    Browsing returns a JSON array newest-first, with X-Next-Cursor and (on the
+    first page) X-Total-Count headers. With updated_since=<server_time from a
+    previous poll> it returns {"applications", "deleted", "server_time",
+    "next_cursor"} holding only rows changed or withdrawn since then.
+    """
+    officer_id = g.user_id
+    args = request.args
+    status = args.get("status")
+    if status and status not in APPLICATION_STATUSES:
+        return jsonify({"error": "Invalid status"}), 400
+    try:
+        limit = max(1, min(int(args.get("limit", 100)), 1000))
+        after = decode_cursor(args.get("cursor"))
+        job_id = int(args["job_id"]) if args.get("job_id") else None
+        applied_from = datetime.date.fromisoformat(args["applied_from"]) if args.get("applied_from") else None
+        applied_to = datetime.date.fromisoformat(args["applied_to"]) if args.get("applied_to") else None
+        updated_since = datetime.datetime.fromisoformat(args["updated_since"]) if args.get("updated_since") else None
+    except (TypeError, ValueError):
+        return jsonify({"error": "Invalid query parameters"}), 400
+
+    filters, params = ["j.officer_id = %s"], [officer_id]
+    if job_id is not None:
+        filters.append("a.job_id = %s")
+        params.append(job_id)
+    if status:
+        filters.append("a.status = %s")
+        params.append(status)
+    if applied_from:
+        filters.append("a.applied_on >= %s")
+        params.append(applied_from)
+    if applied_to:
+        filters.append("a.applied_on < %s")
+        params.append(applied_to + datetime.timedelta(days=1))
+
+    if updated_since:
+        # Deltas are read oldest-first so a client can page forward to the present
+        column, op, direction = "updated_at", ">", "ASC"
+        filters.append("a.updated_at >= %s")
+        params.append(updated_since)
+    else:
+        column, op, direction = "applied_on", "<", "DESC"
+    page_filters, page_params = list(filters), list(params)
+    if after:
+        page_filters.append(f"(a.{column} {op} %s OR (a.{column} = %s AND a.application_id {op} %s))")
+        page_params.extend([after[0], after[0], after[1]])
+
     try:
         db = get_db()
-        cur = db.cursor(dictionary=True)
-        cur.execute("""
-            SELECT a.application_id, a.job_id, s.name as student_name, j.title as job_title, a.status, a.applied_on
+        cur = db.cursor()
+        cur.execute("SELECT NOW()")
+        server_time = cur.fetchone()[0]
+        cur.execute(f"""
+            SELECT a.application_id, a.job_id, s.name as student_name, j.title as job_title, a.status,
+                   a.applied_on, a.updated_at
             FROM Application a
-            JOIN students s ON a.student_id = s.student_id
             JOIN JobPosting j ON a.job_id = j.job_id
-            ORDER BY a.applied_on DESC
-        """)
-        applications = cur.fetchall()
+            JOIN students s ON a.student_id = s.student_id
+            WHERE {" AND ".join(page_filters)}
+            ORDER BY a.{column} {direction}, a.application_id {direction}
+            LIMIT %s
+        """, page_params + [limit + 1])
+
+        # The delta envelope is a single JSON document, so it is never NDJSON
+        body = json_body(fmt="json" if updated_since else None)
+        if updated_since:
+            body.raw(b'{"applications":')
+        last, has_more = body.page(fetch_rows(cur, Config.JSON_FETCH_SIZE), limit)
+        next_cursor = encode_cursor([last[column], last["application_id"]]) if has_more else None
+
+        if updated_since:
+            deleted = []
+            if not after:
+                cur.execute("""
+                    SELECT d.application_id
+                    FROM DeletedApplication d
+                    JOIN JobPosting j ON d.job_id = j.job_id
+                    WHERE j.officer_id = %s AND d.deleted_at >= %s
+                """, (officer_id, updated_since))
+                deleted = [row[0] for row in cur.fetchall()]
+            cur.close()
+            db.close()
+            body.close_array()
+            # The remaining keys, spliced in after "applications" (dropping the dict's opening brace)
+            body.raw(b',' + json_stream.dumps({
+                "deleted": deleted,
+                "server_time": str(server_time),
+                "next_cursor": next_cursor,
+            })[1:])
+            return body.response(app.response_class, close_array=False)
+
+        headers = {"X-Server-Time": str(server_time)}
+        if next_cursor:
+            headers["X-Next-Cursor"] = next_cursor
+        if not after:
+            cur.execute(f"""
+                SELECT COUNT(*) FROM Application a JOIN JobPosting j ON a.job_id = j.job_id
+                WHERE {" AND ".join(filters)}
+            """, params)
+            headers["X-Total-Count"] = str(cur.fetchone()[0])
         cur.close()
         db.close()
-        return jsonify(applications)
-    except Exception as e:
-        print("Error fetching applications:", e)
+        return body.response(app.response_class, headers=headers)
+    except Exception:
+        logger.exception("Error fetching applications")
         return jsonify({"error": "Failed to fetch applications"}), 500
 
+def status_events(notices, status):
+    """Stream events for committed status changes: the student's and the officer's views"""
+    for application_id, student_id, message in notices:
+        yield f"student:{student_id}", "status", {"application_id": application_id, "status": status}
+        yield f"student:{student_id}", "notification", {"message": message}
+        yield f"officer:{g.user_id}", "application", {"application_id": application_id, "status": status}
+
 @app.route("/api/officer/applications/<int:application_id>/status", methods=["PUT"])
+@require_auth(role="officer")
 def update_application_status(application_id):
-    """Update application status"""
-    token = request.headers.get("Authorization")
-    if not token or not token.startswith("Bearer "):
-        return jsonify({"error": "Authorization required"}), 401
-    try:
-        payload = jwt.decode(token.split(" ")[1], JWT_SECRET, algorithms=["HS256"])
-        # Verify officer role
-        if payload.get("role") != "officer":
-            return jsonify({"error": "Officer access required"}), 403
-    except jwt.ExpiredSignatureError:
-        return jsonify({"error": "Token expired"}), 401
-    except jwt.InvalidTokenError:
-        return jsonify({"error": "Invalid token"}), 401
-
+    """Update application status and notify the student"""
     data = request.json or {}
     status = data.get("status")
 
-    if not status or status not in ['Applied', 'Shortlisted', 'Selected', 'Rejected']:
+    if not status or status not in APPLICATION_STATUSES:
         return jsonify({"error": "Valid status required"}), 400
 
     try:
         db = get_db()
         cur = db.cursor()
-        cur.execute("UPDATE Application SET status = %s WHERE application_id = %s", (status, application_id))
-        if cur.rowcount == 0:
-            db.rollback()
-            cur.close()
-            db.close()
-            return jsonify({"error": "Application not found"}), 404
+        notices = []
+        results = apply_status_change(cur, [application_id], status, g.user_id, notices=notices)
         db.commit()
         cur.close()
         db.close()
+        publish_events(status_events(notices, status))
+        if results["not_found"]:
+            return jsonify({"error": "Application not found"}), 404
+        if results["invalid_transition"]:
+            return jsonify({"error": f"Cannot change this application to {status}"}), 409
         return jsonify({"message": "Application status updated successfully"})
-    except Exception as e:
-        print("Error updating application status:", e)
+    except Exception:
+        logger.exception("Error updating application status")
         return jsonify({"error": "Failed to update application status"}), 500
 
 @app.route("/api/officer/applications/bulk-status", methods=["PUT"])
+@require_auth(role="officer")
 def bulk_update_application_status():
-    """Bulk update application statuses"""
-    token = request.headers.get("Authorization")
-    if not token or not token.startswith("Bearer "):
-        return jsonify({"error": "Authorization required"}), 401
-    try:
-        payload = jwt.decode(token.split(" ")[1], JWT_SECRET, algorithms=["HS256"])
-        # Verify officer role
-        if payload.get("role") != "officer":
-            return jsonify({"error": "Officer access required"}), 403
-    except jwt.ExpiredSignatureError:
-        return jsonify({"error": "Token expired"}), 401
-    except jwt.InvalidTokenError:
-        return jsonify({"error": "Invalid token"}), 401
+    """Bulk update application statuses in one transaction.
 
+    Returns counts plus `results`, the application ids grouped by outcome
+    (updated, unchanged, invalid_transition, not_found).
+    """
     data = request.json or {}
     application_ids = data.get("application_ids", [])
     status = data.get("status")
 
     if not application_ids or not isinstance(application_ids, list):
         return jsonify({"error": "Application IDs list required"}), 400
-    if not status or status not in ['Applied', 'Shortlisted', 'Selected', 'Rejected']:
+    if not all(isinstance(i, int) and not isinstance(i, bool) for i in application_ids):
+        return jsonify({"error": "Application IDs must be integers"}), 400
+    if len(application_ids) > Config.STATUS_BULK_MAX_IDS:
+        return jsonify({"error": f"At most {Config.STATUS_BULK_MAX_IDS} applications per request"}), 413
+    if not status or status not in APPLICATION_STATUSES:
         return jsonify({"error": "Valid status required"}), 400
 
     try:
         db = get_db()
         cur = db.cursor()
-        # Update multiple applications
-        format_strings = ','.join(['%s'] * len(application_ids))
-        cur.execute(f"UPDATE Application SET status = %s WHERE application_id IN ({format_strings})", [status] + application_ids)
-        updated_count = cur.rowcount
+        notices = []
+        results = apply_status_change(cur, application_ids, status, g.user_id,
+                                      chunk_size=Config.STATUS_CHUNK_SIZE, notices=notices)
         db.commit()
         cur.close()
         db.close()
-        return jsonify({"message": f"Updated {updated_count} applications successfully"})
-    except Exception as e:
-        print("Error bulk updating application status:", e)
+        publish_events(status_events(notices, status))
+        counts = {outcome: len(ids) for outcome, ids in results.items()}
+        skipped = len(application_ids) - counts["updated"]
+        message = f"Updated {counts['updated']} applications successfully"
+        if skipped:
+            message += f" ({skipped} skipped)"
+        return jsonify({"message": message, "counts": counts, "results": results})
+    except Exception:
+        logger.exception("Error bulk updating application status")
         return jsonify({"error": "Failed to bulk update application status"}), 500
 
 @app.route("/api/officer/notifications", methods=["POST"])
+@require_auth(role="officer")
 def send_notification():
-    """Send notification to all students"""
-    token = request.headers.get("Authorization")
-    if not token or not token.startswith("Bearer "):
-        return jsonify({"error": "Authorization required"}), 401
-    try:
-        payload = jwt.decode(token.split(" ")[1], JWT_SECRET, algorithms=["HS256"])
-        # Verify officer role
-        if payload.get("role") != "officer":
-            return jsonify({"error": "Officer access required"}), 403
-        officer_id = payload["id"]
-    except jwt.ExpiredSignatureError:
-        return jsonify({"error": "Token expired"}), 401
-    except jwt.InvalidTokenError:
-        return jsonify({"error": "Invalid token"}), 401
+    """Send notification to all students, or to a branch / min CGPA segment"""
+    officer_id = g.user_id
 
     data = request.json or {}
     message = data.get("message")
+    branches = data.get("branch")
+    min_cgpa = data.get("min_cgpa")
 
     if not message:
         return jsonify({"error": "Message required"}), 400
+    if isinstance(branches, str):
+        branches = [branches]
+    try:
+        min_cgpa = float(min_cgpa) if min_cgpa not in (None, "") else None
+    except (TypeError, ValueError):
+        return jsonify({"error": "min_cgpa must be a number"}), 400
 
     try:
+        started = time.perf_counter()
         db = get_db()
         cur = db.cursor()
-        # Insert into SentNotifications
-        cur.execute("INSERT INTO SentNotifications (officer_id, message) VALUES (%s, %s)", (officer_id, message))
+        # Students read it from SentNotifications until (and unless) a worker copies it into Notification
+        cur.execute(
+            "INSERT INTO SentNotifications (officer_id, message, target_branches, target_min_cgpa) VALUES (%s, %s, %s, %s)",
+            (officer_id, message, ",".join(branches) if branches else None, min_cgpa)
+        )
         sent_id = cur.lastrowid
-        # Get all student IDs
-        cur.execute("SELECT student_id FROM students")
-        students = cur.fetchall()
-        # Insert notification for each student
-        for student in students:
-            cur.execute("INSERT INTO Notification (student_id, message) VALUES (%s, %s)", (student[0], message))
+        body = {
+            "message": "Notification sent to all students" if not (branches or min_cgpa is not None) else "Notification sent to selected students",
+            "mode": Config.NOTIFICATION_MODE,
+        }
+        if Config.NOTIFICATION_MODE == "write":
+            body["task_id"] = task_queue.enqueue(cur, "notifications.fan_out", {"sent_id": sent_id}, key=f"fan-out:{sent_id}")
+        else:
+            # Report the audience size only
+            body["recipients"] = count_broadcast_audience(cur, branches=branches, min_cgpa=min_cgpa)
         db.commit()
         cur.close()
         db.close()
-        return jsonify({"message": "Notification sent to all students"}), 201
-    except Exception as e:
-        print("Error sending notification:", e)
+        publish_events([(BROADCAST_CHANNEL, "notification", {
+            "message": message,
+            "target_branches": ",".join(branches) if branches else None,
+            "target_min_cgpa": min_cgpa,
+        })])
+        # Time to record (and, in write mode, queue) the broadcast; the fan-out's own cost is
+        # recorded on the broadcast and listed by GET /api/officer/notifications
+        body["enqueue_ms"] = round((time.perf_counter() - started) * 1000, 2)
+        return jsonify(body), 202 if "task_id" in body else 201
+    except Exception:
+        logger.exception("Error sending notification")
         return jsonify({"error": "Failed to send notification"}), 500
 
+def broadcast_segment(branches=None, min_cgpa=None):
+    """SQL (' AND ...') and params restricting students to a broadcast segment."""
+    filters, params = [], []
+    if branches:
+        filters.append(f"branch IN ({','.join(['%s'] * len(branches))})")
+        params.extend(branches)
+    if min_cgpa is not None:
+        filters.append("cgpa >= %s")
+        params.append(min_cgpa)
+    return "".join(f" AND {f}" for f in filters), params
+
+def count_broadcast_audience(cur, branches=None, min_cgpa=None):
+    segment, params = broadcast_segment(branches, min_cgpa)
+    cur.execute("SELECT COUNT(*) FROM students WHERE 1=1" + segment, params)
+    return cur.fetchone()[0]
+
+def fan_out_notification(db, sent_id, chunk_size=None):
+    """Copy a broadcast into Notification for every student it reached.
+
+    Uses one INSERT ... SELECT per student_id range so a broadcast is a handful
+    of set-based statements. Each chunk commits together with
+    SentNotifications.fanout_through, so a retry resumes after the last
+    committed chunk and never copies a range twice; students above it keep
+    reading the broadcast from SentNotifications meanwhile. The rows copied and
+    the time taken accumulate in fanout_rows and fanout_ms with each chunk.
+    Returns the number of rows inserted by this call.
+    """
+    chunk_size = chunk_size or Config.NOTIFICATION_CHUNK_SIZE
+    cur = db.cursor()
+    try:
+        cur.execute("SELECT MAX(student_id) FROM students")
+        high = cur.fetchone()[0] or 0
+        inserted = 0
+        while True:
+            cur.execute("""
+                SELECT message, target_branches, target_min_cgpa, created_at, fanned_out, fanout_through
+                FROM SentNotifications WHERE sent_id = %s
+                FOR UPDATE
+            """, (sent_id,))
+            row = cur.fetchone()
+            if row is None or row[4]:
+                db.rollback()
+                return inserted
+            message, branches, min_cgpa, created_at, _, through = row
+            if through >= high:
+                cur.execute("UPDATE SentNotifications SET fanned_out = TRUE, fanned_out_at = NOW() WHERE sent_id = %s",
+                            (sent_id,))
+                db.commit()
+                return inserted
+            end = min(through + chunk_size, high)
+            chunk_started = time.perf_counter()
+            segment, params = broadcast_segment(branches.split(",") if branches else None, min_cgpa)
+            # Same audience, timestamp and read state the student saw on the read path
+            cur.execute(
+                "INSERT INTO Notification (student_id, message, is_read, created_at) "
+                "SELECT s.student_id, %s, br.sent_id IS NOT NULL, %s FROM students s "
+                "LEFT JOIN BroadcastRead br ON br.student_id = s.student_id AND br.sent_id = %s "
+                "WHERE s.student_id > %s AND s.student_id <= %s AND s.created_at <= %s" + segment,
+                [message, created_at, sent_id, through, end, created_at] + params
+            )
+            rows = cur.rowcount
+            inserted += rows
+            cur.execute("""
+                UPDATE SentNotifications
+                SET fanout_through = %s, fanout_rows = fanout_rows + %s, fanout_ms = fanout_ms + %s
+                WHERE sent_id = %s
+            """, (end, rows, round((time.perf_counter() - chunk_started) * 1000), sent_id))
+            db.commit()
+    finally:
+        cur.close()
+
+@task_queue.task("notifications.fan_out")
+def fan_out_task(db, sent_id):
+    started = time.perf_counter()
+    inserted = fan_out_notification(db, sent_id)
+    logger.info("Broadcast fanned out", extra={"fields": {
+        "sent_id": sent_id, "rows": inserted, "ms": round((time.perf_counter() - started) * 1000, 2),
+    }})
+
 @app.route("/api/officer/notifications", methods=["GET"])
+@require_auth(role="officer")
 def get_officer_notifications():
     """Get recent notifications sent by officer (for display in dashboard)"""
-    token = request.headers.get("Authorization")
-    if not token or not token.startswith("Bearer "):
-        return jsonify({"error": "Authorization required"}), 401
-    try:
-        payload = jwt.decode(token.split(" ")[1], JWT_SECRET, algorithms=["HS256"])
-        # Verify officer role
-        if payload.get("role") != "officer":
-            return jsonify({"error": "Officer access required"}), 403
-        officer_id = payload["id"]
-    except jwt.ExpiredSignatureError:
-        return jsonify({"error": "Token expired"}), 401
-    except jwt.InvalidTokenError:
-        return jsonify({"error": "Invalid token"}), 401
+    officer_id = g.user_id
 
     try:
         db = get_db()
         cur = db.cursor(dictionary=True)
         # Get recent sent notifications by this officer (last 10)
-        cur.execute("SELECT message, created_at FROM SentNotifications WHERE officer_id = %s ORDER BY created_at DESC LIMIT 10", (officer_id,))
+        # fanout_* show how far a write-mode fan-out got and what it cost
+        cur.execute("""
+            SELECT sent_id, message, created_at, fanned_out, fanout_rows, fanout_ms, fanned_out_at
+            FROM SentNotifications WHERE officer_id = %s ORDER BY created_at DESC LIMIT 10
+        """, (officer_id,))
         notifications = cur.fetchall()
         cur.close()
         db.close()
         return jsonify(notifications)
-    except Exception as e:
-        print("Error fetching notifications:", e)
+    except Exception:
+        logger.exception("Error fetching notifications")
         return jsonify({"error": "Failed to fetch notifications"}), 500
-    
-    
+
+
+# ===========================
+# Bulk Import / Export
+# ===========================
+STUDENT_IMPORT_SQL = """
+    SELECT i.officer_id, i.status, i.total_rows, i.report, i.created_at, i.finished_at,
+           COALESCE(i.finished_at, i.created_at) < NOW() - INTERVAL %s SECOND AS credentials_expired,
+           t.status AS task_status, t.last_error
+    FROM StudentImport i
+    LEFT JOIN TaskQueue t ON t.task_id = i.task_id
+    WHERE i.import_id = %s
+"""
+
+def import_too_large():
+    return jsonify({"error": f"Import file must be at most {Config.IMPORT_MAX_BYTES // (1024 * 1024)} MB"}), 413
+
+@app.route("/api/officer/students/import", methods=["POST"])
+@require_auth(role="officer")
+def import_students_csv():
+    """Register students from a CSV upload ("file" field) or a text/csv request body.
+
+    Columns: university_roll (or roll), name, email, branch, cgpa, and optional
+    skills (separated by ";") and password. Files of up to IMPORT_SYNC_MAX_ROWS
+    rows are imported right away: the response has imported/failed counts,
+    per-line errors, and the generated initial password of every imported
+    student whose row had none. Larger files are queued (202 with an
+    import_id); the same report is then read from the status endpoint.
+    """
+    if request.content_length and request.content_length > Config.IMPORT_MAX_BYTES + 64 * 1024:
+        return import_too_large()
+    upload = request.files.get("file")
+    data = (upload.stream if upload else request.stream).read(Config.IMPORT_MAX_BYTES + 1)
+    if len(data) > Config.IMPORT_MAX_BYTES:
+        return import_too_large()
+    try:
+        # Parsing alone is cheap; this also rejects a bad header or encoding before anything is queued
+        total = sum(1 for _ in read_rows(io.BytesIO(data)))
+    except ImportFormatError as e:
+        return jsonify({"error": str(e)}), 400
+
+    if total > Config.IMPORT_SYNC_MAX_ROWS:
+        # Hashing thousands of passwords takes minutes; a task worker does it, not this request
+        db = get_db()
+        cur = db.cursor()
+        try:
+            cur.execute("INSERT INTO StudentImport (officer_id, total_rows, source) VALUES (%s, %s, %s)",
+                        (g.user_id, total, data))
+            import_id = cur.lastrowid
+            task_id = task_queue.enqueue(cur, "students.import", {"import_id": import_id}, key=f"student-import:{import_id}")
+            cur.execute("UPDATE StudentImport SET task_id = %s WHERE import_id = %s", (task_id, import_id))
+            db.commit()
+        except Exception:
+            db.rollback()
+            logger.exception("Error queueing student import")
+            return jsonify({"error": "Failed to queue import"}), 500
+        finally:
+            cur.close(); db.close()
+        return jsonify({"import_id": import_id, "task_id": task_id, "status": "queued", "total_rows": total,
+                        "status_url": f"/api/officer/students/import/{import_id}"}), 202
+
+    db = get_db()
+    try:
+        report = import_students(db, read_rows(io.BytesIO(data)), password_hasher, skill_resolver,
+                                 batch_size=Config.IMPORT_BATCH_SIZE, max_rows=Config.IMPORT_MAX_ROWS)
+    except ImportFormatError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception:
+        logger.exception("Error importing students")
+        return jsonify({"error": "Import failed; batches before the failure were saved"}), 500
+    finally:
+        db.close()
+        # Earlier batches are committed even when a later one fails
+        response_cache.invalidate("students")
+    return jsonify(report)
+
+@app.route("/api/officer/students/import/<int:import_id>", methods=["GET"])
+@require_auth(role="officer")
+def student_import_status(import_id):
+    """Progress and, once done, the report of a queued import.
+
+    status is queued, running, done or failed (the task ran out of attempts;
+    batches before the failure were saved). Generated initial passwords are
+    returned by the first request after the import is done (or failed) and
+    then deleted; they expire after IMPORT_CREDENTIALS_TTL_SECONDS either way.
+    """
+    try:
+        db = get_db()
+        cur = db.cursor(dictionary=True)
+        cur.execute(STUDENT_IMPORT_SQL, (Config.IMPORT_CREDENTIALS_TTL_SECONDS, import_id))
+        row = cur.fetchone()
+        if not row or row["officer_id"] != g.user_id:
+            cur.close(); db.close()
+            return jsonify({"error": "Import not found"}), 404
+        report = json.loads(row["report"]) if row["report"] else {"imported": 0, "failed": 0, "errors": [], "credentials": []}
+        status = "failed" if row["task_status"] == "dead" else row["status"]
+        if row["credentials_expired"]:
+            report["credentials"] = []
+        if status in ("done", "failed") and report["credentials"]:
+            cur.execute("UPDATE StudentImport SET report = JSON_SET(report, '$.credentials', JSON_ARRAY()) WHERE import_id = %s",
+                        (import_id,))
+            db.commit()
+        cur.close(); db.close()
+        body = dict(report, import_id=import_id, status=status, total_rows=row["total_rows"],
+                    created_at=row["created_at"], finished_at=row["finished_at"])
+        if status == "failed":
+            body["error"] = row["last_error"]
+        return jsonify(body)
+    except Exception:
+        logger.exception("Error fetching student import")
+        return jsonify({"error": "Failed to fetch import"}), 500
+
+@task_queue.task("students.import")
+def import_students_task(db, import_id):
+    """Run a queued import, resuming after the last batch an earlier attempt committed."""
+    cur = db.cursor()
+    try:
+        cur.execute("SELECT status, source, last_line, report FROM StudentImport WHERE import_id = %s", (import_id,))
+        row = cur.fetchone()
+        if row is None or row[0] == "done":
+            db.rollback()
+            return
+        _, source, last_line, saved = row
+        cur.execute("UPDATE StudentImport SET status = 'running' WHERE import_id = %s", (import_id,))
+        db.commit()
+
+        def checkpoint(cur, report, line):
+            cur.execute("UPDATE StudentImport SET last_line = %s, report = %s WHERE import_id = %s",
+                        (line, json.dumps(report), import_id))
+
+        try:
+            report = import_students(db, read_rows(io.BytesIO(source)), password_hasher, skill_resolver,
+                                     batch_size=Config.IMPORT_BATCH_SIZE, max_rows=Config.IMPORT_MAX_ROWS,
+                                     start_after=last_line, report=json.loads(saved) if saved else None,
+                                     checkpoint=checkpoint)
+        finally:
+            # Reaches web processes only with the redis backend (RESPONSE_CACHE_BACKEND)
+            response_cache.invalidate("students")
+        # The file is not needed once the report is final
+        cur.execute("""
+            UPDATE StudentImport SET status = 'done', report = %s, source = NULL, finished_at = NOW()
+            WHERE import_id = %s
+        """, (json.dumps(report), import_id))
+        db.commit()
+    finally:
+        cur.close()
+
+def csv_download(filename, header, sql, params):
+    return app.response_class(stream_csv(get_db, header, sql, params, Config.EXPORT_FETCH_SIZE), mimetype="text/csv", headers={
+        "Content-Disposition": f"attachment; filename={filename}",
+        "X-Accel-Buffering": "no",
+    })
+
+@app.route("/api/officer/export/students", methods=["GET"])
+@require_auth(role="officer")
+def export_students_csv():
+    """Stream all students (optionally ?branch= and ?cgpa_min=) as CSV in the import format"""
+    filters, params = [], []
+    if request.args.get("branch"):
+        filters.append("s.branch = %s")
+        params.append(request.args["branch"])
+    if request.args.get("cgpa_min"):
+        try:
+            params.append(float(request.args["cgpa_min"]))
+        except ValueError:
+            return jsonify({"error": "Invalid cgpa_min"}), 400
+        filters.append("s.cgpa >= %s")
+    where = ("WHERE " + " AND ".join(filters)) if filters else ""
+    return csv_download("students.csv", ["university_roll", "name", "email", "branch", "cgpa", "skills", "created_at"], f"""
+        SELECT s.university_roll, s.name, s.email, s.branch, s.cgpa,
+               (SELECT GROUP_CONCAT(sk.skill_name ORDER BY sk.skill_name SEPARATOR ';')
+                FROM StudentSkill ss JOIN Skill sk ON sk.skill_id = ss.skill_id
+                WHERE ss.student_id = s.student_id) AS skills,
+               s.created_at
+        FROM students s
+        {where}
+        ORDER BY s.student_id
+    """, params)
+
+@app.route("/api/officer/export/applications", methods=["GET"])
+@require_auth(role="officer")
+def export_applications_csv():
+    """Stream the officer's applications (optionally ?job_id= and ?status=) as CSV"""
+    filters, params = ["j.officer_id = %s"], [g.user_id]
+    status = request.args.get("status")
+    if status:
+        if status not in APPLICATION_STATUSES:
+            return jsonify({"error": "Invalid status"}), 400
+        filters.append("a.status = %s")
+        params.append(status)
+    if request.args.get("job_id"):
+        try:
+            params.append(int(request.args["job_id"]))
+        except ValueError:
+            return jsonify({"error": "Invalid job_id"}), 400
+        filters.append("a.job_id = %s")
+    return csv_download("applications.csv", ["application_id", "job_id", "job_title", "university_roll", "student_name",
+                                             "email", "branch", "cgpa", "status", "applied_on", "updated_at"], f"""
+        SELECT a.application_id, a.job_id, j.title, s.university_roll, s.name, s.email, s.branch, s.cgpa,
+               a.status, a.applied_on, a.updated_at
+        FROM Application a
+        JOIN JobPosting j ON j.job_id = a.job_id
+        JOIN students s ON s.student_id = a.student_id
+        WHERE {" AND ".join(filters)}
+        ORDER BY a.job_id, a.application_id
+    """, params)
+
+
+# ===========================
+# Reports
+# ===========================
+@app.route("/api/officer/reports", methods=["GET"])
+@require_auth(role="officer")
+def get_reports():
+    """Application counts, selection rate and package stats from ApplicationSummary.
+
+    Query params: group_by (branch|job|officer|month|year), branch, job_id,
+    officer_id ("me" for the caller), month_from, month_to (YYYY-MM).
+    """
+    args = request.args
+    group_by = args.get("group_by", "branch")
+    if group_by not in REPORT_GROUPS:
+        return jsonify({"error": f"group_by must be one of {', '.join(REPORT_GROUPS)}"}), 400
+    try:
+        filters = {
+            "branch": args.get("branch") or None,
+            "job_id": int(args["job_id"]) if args.get("job_id") else None,
+            "officer_id": g.user_id if args.get("officer_id") == "me" else (int(args["officer_id"]) if args.get("officer_id") else None),
+            "month_from": datetime.date.fromisoformat(args["month_from"] + "-01") if args.get("month_from") else None,
+            "month_to": datetime.date.fromisoformat(args["month_to"] + "-01") if args.get("month_to") else None,
+        }
+    except (TypeError, ValueError):
+        return jsonify({"error": "Invalid filters"}), 400
+
+    try:
+        db = get_db()
+        cur = db.cursor()
+        report = fetch_report(cur, group_by, filters)
+        cur.close()
+        db.close()
+        return jsonify(report)
+    except Exception:
+        logger.exception("Error building report")
+        return jsonify({"error": "Failed to build report"}), 500
+
+@app.route("/api/officer/reports/<report_type>/", defaults={"value": ""}, methods=["GET"])
+@app.route("/api/officer/reports/<report_type>/<value>", methods=["GET"])
+@require_auth(role="officer")
+def get_report_chart(report_type, value):
+    """Report shape used by the reports page chart (company, branch or year)"""
+    value = value.strip()
+    filters = {}
+    if report_type == "company":
+        group_by = "job"
+    elif report_type == "branch":
+        group_by = "branch"
+        filters["branch"] = value or None
+    elif report_type == "year":
+        group_by = "year"
+        if value:
+            if not value.isdigit():
+                return jsonify({"error": "Invalid year"}), 400
+            filters = {"month_from": datetime.date(int(value), 1, 1), "month_to": datetime.date(int(value), 12, 1)}
+    else:
+        return jsonify({"error": "Report type must be company, branch or year"}), 400
+
+    try:
+        db = get_db()
+        cur = db.cursor()
+        rows = fetch_report(cur, group_by, filters)
+        cur.close()
+        db.close()
+    except Exception:
+        logger.exception("Error building report")
+        return jsonify({"error": "Failed to build report"}), 500
+
+    if report_type == "company" and value:
+        # Postings have no company column; match on the job title
+        rows = [r for r in rows if value.lower() in (r["label"] or "").lower()]
+    for row in rows:
+        row[report_type] = row["label"]
+    return jsonify(rows)
+
+@app.cli.command("rebuild-reports")
+def rebuild_reports_command():
+    """Recompute ApplicationSummary from Application (flask --app app rebuild-reports)."""
+    db = get_db()
+    started = time.perf_counter()
+    rows = rebuild_application_summary(db)
+    db.close()
+    print(f"Rebuilt ApplicationSummary: {rows} rows in {time.perf_counter() - started:.2f}s")
+
+# ===========================
+# Schema Migrations
+# ===========================
+@app.cli.command("migrate")
+@click.option("--to", "target", type=int, help="stop after this version")
+@click.option("--status", is_flag=True, help="list applied and pending versions without running anything")
+@click.option("--fake", is_flag=True, help="record pending versions as applied without running them")
+def migrate_command(target, status, fake):
+    """Apply pending database/migrations in version order (flask --app app migrate).
+
+    A database set up by hand before the runner existed should first record
+    what it already has, e.g. `flask --app app migrate --fake --to 6`.
+    """
+    available = migrations.load_migrations()
+    db = get_db()
+    try:
+        if status:
+            cur = db.cursor()
+            pending = {m.version for m in migrations.pending_migrations(cur, available)}
+            cur.close()
+            for m in available:
+                print(f"{m.version:03d}_{m.name}: {'pending' if m.version in pending else 'applied'}")
+            return
+        applied = migrations.migrate(db, available, target=target, fake=fake)
+    except migrations.MigrationError as e:
+        raise click.ClickException(str(e))
+    finally:
+        db.close()
+    print(f"{'Recorded' if fake else 'Applied'} {len(applied)} migration(s)" + (f": {applied}" if applied else ""))
+
 # ===========================
 # Main Entry
 # ===========================
+# Development server only; see asgi.py for the production serving modes
 if __name__ == "__main__":
     app.run(debug=True, port=5000)
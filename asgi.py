@@ -0,0 +1,206 @@
+# asgi.py - async serving mode: native coroutine routes in front of the Flask app
+#
+# Serving modes (same routes and JSON in both):
+#   sync:   gunicorn -w 4 -k gevent -b 0.0.0.0:5000 app:app   (needs gevent)
+#           With plain threads (--threads 8) each event stream holds a thread, so
+#           only EVENTS_THREADED_STREAMS streams per worker are admitted.
+#   async:  uvicorn asgi:application --workers 4 --host 0.0.0.0 --port 5000
+#
+# In async mode each worker process runs one event loop:
+#   - NATIVE_ROUTES are coroutines on aiomysql (ASGI_DB_POOL_SIZE connections per
+#     worker) and aiofiles: the event stream, which keeps one connection open per
+#     client, and job applications, which stream resume uploads to disk.
+#   - Every other route is the unchanged Flask handler, run through a2wsgi on a
+#     bounded thread pool (ASGI_WSGI_THREADS per worker) with the app's own
+#     ConnectionPool, so a slow query never blocks the loop.
+# Size MySQL max_connections for
+#   workers * (ASGI_DB_POOL_SIZE + DB_POOL_SIZE + DB_POOL_MAX_OVERFLOW).
+# With more than one worker set EVENTS_BACKEND=redis (and RESPONSE_CACHE_BACKEND=redis)
+# so events and invalidations reach every process.
+#
+# Requires uvicorn, starlette, a2wsgi, aiomysql and aiofiles.
+import asyncio
+import contextlib
+import time
+
+import aiomysql
+import jwt
+from a2wsgi import WSGIMiddleware
+from starlette.applications import Starlette
+from starlette.datastructures import UploadFile
+from starlette.responses import JSONResponse, StreamingResponse
+from starlette.routing import Match, Route
+
+import app as placement
+from config import Config
+from reports import application_summary_shift
+from resume_storage import UnsupportedType, UploadTooLarge
+from resume_text import RESUME_TEXT_TOUCH_SQL
+from task_queue import enqueue_params
+
+db_pool = None
+
+
+@contextlib.asynccontextmanager
+async def lifespan(_app):
+    """One aiomysql pool per worker process for the native routes."""
+    global db_pool
+    db_pool = await aiomysql.create_pool(
+        host=Config.DB_HOST,
+        user=Config.DB_USER,
+        password=Config.DB_PASSWORD,
+        db=Config.DB_NAME,
+        minsize=1,
+        maxsize=Config.ASGI_DB_POOL_SIZE,
+        pool_recycle=Config.DB_POOL_RECYCLE,
+        autocommit=False,
+    )
+    try:
+        yield
+    finally:
+        db_pool.close()
+        await db_pool.wait_closed()
+
+
+def error(message, status):
+    return JSONResponse({"error": message}, status_code=status)
+
+
+def authenticate(request, role=None, allow_query_token=False):
+    token, payload, failure = placement.authenticate(
+        request.headers.get("Authorization"), role,
+        request.query_params.get("access_token") if allow_query_token else None,
+    )
+    return token, payload, (error(*failure) if failure else None)
+
+
+# ===========================
+# Event Stream
+# ===========================
+async def event_stream(request):
+    """Async twin of app.event_stream: waiting clients cost a coroutine, not a thread"""
+    token, payload, failure = authenticate(request, allow_query_token=True)
+    if failure:
+        return failure
+    role, user_id = payload.get("role"), payload["id"]
+    channels = [f"{role}:{user_id}"]
+    student = None
+    if role == "student":
+        channels.append(placement.BROADCAST_CHANNEL)
+        async with db_pool.acquire() as conn:
+            async with conn.cursor() as cur:
+                await cur.execute("SELECT branch, cgpa FROM students WHERE student_id = %s", (user_id,))
+                student = await cur.fetchone()
+            await conn.rollback()
+        if not student:
+            return error("Student not found", 404)
+        student = (student[0], float(student[1]))
+
+    positions = placement.resume_positions(
+        request.headers.get("Last-Event-ID") or request.query_params.get("last_event_id"), channels)
+    closes_at = min(payload.get("exp") or float("inf"), time.time() + Config.EVENTS_MAX_SECONDS)
+
+    async def generate():
+        nonlocal positions
+        yield f"retry: {Config.EVENTS_RETRY_MS}\n\n"
+        while time.time() < closes_at:
+            try:
+                placement.token_cache.verify(token)
+            except jwt.InvalidTokenError:
+                return
+            events, positions, resync = await placement.event_hub.read_async(positions, timeout=Config.EVENTS_HEARTBEAT)
+            yield placement.render_events(channels, events, positions, resync, student)
+
+    return StreamingResponse(generate(), media_type="text/event-stream", headers={
+        "Cache-Control": "no-cache",
+        "X-Accel-Buffering": "no",
+    })
+
+
+# ===========================
+# Job Applications
+# ===========================
+async def apply_job(request):
+    """Async twin of app.apply_job: the resume is streamed to the blob store with aiofiles"""
+    _, payload, failure = authenticate(request, role="student")
+    if failure:
+        return failure
+    student_id, job_id = payload["id"], request.path_params["job_id"]
+    if int(request.headers.get("content-length") or 0) > placement.app.config["MAX_CONTENT_LENGTH"]:
+        return error(f"Resume must be at most {Config.RESUME_MAX_BYTES // (1024 * 1024)} MB", 413)
+
+    form = await request.form()
+    resume = form.get("resume")
+    if not isinstance(resume, UploadFile):
+        return error("Resume file required", 400)
+
+    async with db_pool.acquire() as conn:
+        try:
+            async with conn.cursor(aiomysql.DictCursor) as cur:
+                await cur.execute(placement.APPLY_CHECK_SQL, (student_id, job_id))
+                job = await cur.fetchone()
+                if not job:
+                    await conn.rollback()
+                    return error("Job not found", 404)
+                if job["cgpa"] < job["min_cgpa"]:
+                    await conn.rollback()
+                    return error(f"CGPA requirement not met. Required: {job['min_cgpa']}, Your CGPA: {job['cgpa']}", 400)
+                await cur.execute(placement.APPLY_BRANCH_SQL, (job_id, job["branch"], placement.ALL_BRANCHES))
+                if not await cur.fetchall():
+                    await conn.rollback()
+                    return error(f"Branch eligibility not met. Eligible branches: {job['branch_eligibility']}, "
+                                 f"Your branch: {job['branch']}", 400)
+
+                try:
+                    resume_ref, digest, size, content_type = await placement.resume_store.save_async(resume.read)
+                except UploadTooLarge:
+                    await conn.rollback()
+                    return error(f"Resume must be at most {Config.RESUME_MAX_BYTES // (1024 * 1024)} MB", 413)
+                except UnsupportedType:
+                    await conn.rollback()
+                    return error("Resume must be a PDF, DOC or DOCX file", 415)
+                await cur.execute(placement.RESUME_REFERENCE_SQL, (digest, size, content_type))
+                await cur.execute(placement.APPLY_INSERT_SQL, (student_id, job_id, resume_ref))
+                application_id = cur.lastrowid
+                await cur.execute(*application_summary_shift("a.application_id = %s", [application_id], 1))
+                await cur.execute(RESUME_TEXT_TOUCH_SQL, (digest,))
+                await cur.execute(*enqueue_params("resumes.extract", {
+                    "digest": digest, "content_type": content_type, "student_id": student_id,
+                }, key=placement.resume_text_key(digest, student_id)))
+            await conn.commit()
+        except BaseException:
+            await conn.rollback()
+            raise
+        finally:
+            await form.close()
+
+    def after_commit():
+        if placement.task_queue.mode == "sync":
+            placement.task_queue.drain()
+        placement.response_cache.invalidate(f"student:{student_id}")
+        placement.publish_events([(f"officer:{job['officer_id']}", "application",
+                                   {"application_id": application_id, "job_id": job_id, "status": "Applied"})])
+
+    # Either backend may do network I/O (redis), so keep it off the loop
+    await asyncio.to_thread(after_commit)
+    return JSONResponse({"message": "Applied successfully"})
+
+
+# ===========================
+# Application
+# ===========================
+NATIVE_ROUTES = [
+    Route("/api/events/stream", event_stream, methods=["GET"]),
+    Route("/api/jobs/{job_id:int}/apply", apply_job, methods=["POST"]),
+]
+
+native = Starlette(routes=NATIVE_ROUTES, lifespan=lifespan)
+wsgi = WSGIMiddleware(placement.app, workers=Config.ASGI_WSGI_THREADS)
+
+
+async def application(scope, receive, send):
+    """Dispatch native routes to Starlette and everything else to the Flask app."""
+    if scope["type"] == "http" and not any(route.matches(scope)[0] == Match.FULL for route in NATIVE_ROUTES):
+        await wsgi(scope, receive, send)
+    else:
+        await native(scope, receive, send)
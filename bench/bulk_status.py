@@ -0,0 +1,84 @@
+# bench/bulk_status.py - bulk status changes for large batches at several chunk sizes
+#
+# Usage: python bench/bulk_status.py --applications 10000 --chunk-sizes 500,1000,5000
+# Uses the same scratch database as bench/notification_models.py (BENCH_DB_NAME),
+# dropped and recreated from database/schema.sql; never point it at production.
+import argparse
+import json
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.environ["DB_NAME"] = os.getenv("BENCH_DB_NAME", "student_placement_bench")
+
+import app as placement  # noqa: E402  (reads DB_NAME at import)
+from bench.notification_models import reset_database  # noqa: E402
+from status_updates import apply_status_change  # noqa: E402
+
+
+def seed(cur, applications):
+    cur.execute("INSERT INTO PlacementOfficer (name, email, password_hash) VALUES ('Bench', 'bench@example.com', 'x')")
+    officer_id = cur.lastrowid
+    cur.execute("""
+        INSERT INTO JobPosting (officer_id, title, description, branch_eligibility, min_cgpa, package_stipend, deadline)
+        VALUES (%s, 'Bench Engineer', 'Benchmark posting', 'All', 6.0, 10.0, CURDATE() + INTERVAL 30 DAY)
+    """, (officer_id,))
+    job_id = cur.lastrowid
+    cur.executemany(
+        "INSERT INTO students (name, email, password_hash, branch, cgpa, university_roll) VALUES (%s, %s, 'x', %s, %s, %s)",
+        [(f"Student {i}", f"s{i}@example.com", ("CSE", "ECE", "ME", "CE")[i % 4], 6 + (i % 40) / 10, 100000 + i)
+         for i in range(applications)]
+    )
+    cur.execute("INSERT INTO Application (student_id, job_id, status) SELECT student_id, %s, 'Applied' FROM students", (job_id,))
+    cur.execute("SELECT application_id FROM Application ORDER BY application_id")
+    return officer_id, [row[0] for row in cur.fetchall()]
+
+
+def run(applications, chunk_sizes):
+    db_name = placement.DB_CONFIG["database"]
+    server = dict(placement.db_pool.db_config)
+    server.pop("database")
+    conn = placement.mysql.connector.connect(**server)
+    cur = conn.cursor()
+    reset_database(cur, db_name)
+    officer_id, ids = seed(cur, applications)
+    conn.commit()
+    placement.rebuild_application_summary(conn)
+
+    results = {"applications": applications}
+    for chunk_size in chunk_sizes:
+        # Shortlist everything, then reject everything (another allowed transition)
+        timings = {}
+        for status in ("Shortlisted", "Rejected"):
+            started = time.perf_counter()
+            outcome = apply_status_change(cur, ids, status, officer_id, chunk_size=chunk_size)
+            conn.commit()
+            timings[f"{status.lower()}_ms"] = round((time.perf_counter() - started) * 1000, 1)
+            timings[f"{status.lower()}_updated"] = len(outcome["updated"])
+        # Mixed batch: a third unknown ids, the rest now Rejected -> Selected is invalid
+        mixed = ids[: len(ids) * 2 // 3] + list(range(10 ** 9, 10 ** 9 + len(ids) // 3))
+        started = time.perf_counter()
+        outcome = apply_status_change(cur, mixed, "Selected", officer_id, chunk_size=chunk_size)
+        conn.rollback()
+        timings["mixed_invalid_ms"] = round((time.perf_counter() - started) * 1000, 1)
+        timings["mixed_counts"] = {k: len(v) for k, v in outcome.items()}
+
+        cur.execute("UPDATE Application SET status = 'Applied'")
+        cur.execute("DELETE FROM Notification")
+        conn.commit()
+        placement.rebuild_application_summary(conn)
+        results[f"chunk_{chunk_size}"] = timings
+
+    cur.close()
+    conn.close()
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Time bulk application status changes and their notifications")
+    parser.add_argument("--applications", type=int, default=10000)
+    parser.add_argument("--chunk-sizes", default="500,1000,5000")
+    args = parser.parse_args()
+    print(json.dumps(run(args.applications, [int(c) for c in args.chunk_sizes.split(",")]), indent=2))
@@ -0,0 +1,173 @@
+# bench/explain_check.py - fail when a hot route's SQL plans a full scan
+#
+# Usage: python bench/explain_check.py [--students 5000 --jobs 200 --min-rows 100]
+#
+# Seeds the scratch database (BENCH_DB_NAME) the same way bench/harness.py does,
+# calls each route in ROUTES through Flask's test client while recording the
+# statements it executes, then runs EXPLAIN on every recorded statement. A plan
+# row of type ALL (table scan) or index (full index scan) over at least
+# --min-rows estimated rows is a failure unless listed in ALLOWED_SCANS; the
+# script prints the plans as JSON and exits 1 on any failure.
+import argparse
+import json
+import os
+import random
+import sys
+import threading
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.environ["DB_NAME"] = os.getenv("BENCH_DB_NAME", "student_placement_bench")
+
+import app as placement  # noqa: E402  (reads DB_NAME at import)
+from bench.harness import seed  # noqa: E402
+from bench.load_test import mint_token  # noqa: E402
+
+# (label, role, method, path, json body); "{job_id}" and "{application_id}" are
+# filled in from the seeded data and belong to the officer whose token is used
+ROUTES = [
+    ("GET /api/jobs", "student", "GET", "/api/jobs", None),
+    ("GET /api/student/profile", "student", "GET", "/api/student/profile", None),
+    ("GET /api/student/applications", "student", "GET", "/api/student/applications", None),
+    ("GET /api/student/notifications", "student", "GET", "/api/student/notifications?limit=50", None),
+    ("GET /api/officer/postings", "officer", "GET", "/api/officer/postings", None),
+    ("GET /api/officer/applications", "officer", "GET", "/api/officer/applications?limit=100", None),
+    ("GET /api/officer/applications by job+status", "officer", "GET",
+     "/api/officer/applications?job_id={job_id}&status=Applied", None),
+    ("GET /api/officer/notifications", "officer", "GET", "/api/officer/notifications", None),
+    ("GET /api/officer/student/<roll>", "officer", "GET", "/api/officer/student/{university_roll}", None),
+    ("GET /api/student/list", "officer", "GET", "/api/student/list?limit=50", None),
+    ("GET /api/student/list by branch+cgpa", "officer", "GET", "/api/student/list?branch=CSE&cgpa_min=8&sort=cgpa", None),
+    ("GET /api/officer/reports", "officer", "GET", "/api/officer/reports?group_by=officer&officer_id=me", None),
+    ("PUT /api/officer/applications/<id>/status", "officer", "PUT",
+     "/api/officer/applications/{application_id}/status", {"status": "Shortlisted"}),
+]
+
+# Scans that are expected: (route label, EXPLAIN table, SQL fragment, reason)
+ALLOWED_SCANS = [
+    ("GET /api/jobs", "JobPosting", "COUNT(*) FROM JobPosting",
+     "posting count in the feed ETag; JobPosting holds hundreds of rows, not student-scale data"),
+    ("GET /api/student/list", "s", "COUNT(*) AS total FROM students",
+     "unfiltered X-Total-Count, first page only and served from the response cache"),
+]
+
+EXPLAINABLE = ("SELECT", "UPDATE", "DELETE")
+FULL_SCAN_TYPES = ("ALL", "index")
+
+_recorded = threading.local()
+
+
+class RecordingCursor:
+    def __init__(self, cursor):
+        self._cursor = cursor
+
+    def execute(self, operation, params=None, *args, **kwargs):
+        statements = getattr(_recorded, "statements", None)
+        if statements is not None and operation.lstrip().upper().startswith(EXPLAINABLE):
+            statements.append((operation, params))
+        return self._cursor.execute(operation, params, *args, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+
+class RecordingConnection:
+    def __init__(self, db):
+        self._db = db
+
+    def cursor(self, *args, **kwargs):
+        return RecordingCursor(self._db.cursor(*args, **kwargs))
+
+    def __getattr__(self, name):
+        return getattr(self._db, name)
+
+
+def record_route(client, method, path, token, body):
+    _recorded.statements = []
+    try:
+        response = client.open(path, method=method, json=body, headers={"Authorization": f"Bearer {token}"})
+        return response.status_code, _recorded.statements
+    finally:
+        _recorded.statements = None
+
+
+def allowed(label, table, sql):
+    for route, allowed_table, fragment, reason in ALLOWED_SCANS:
+        if route == label and allowed_table == table and fragment in " ".join(sql.split()):
+            return reason
+    return None
+
+
+def explain(cur, label, sql, params, min_rows):
+    cur.execute("EXPLAIN " + sql, params)
+    plan = cur.fetchall()
+    failures = []
+    for row in plan:
+        if row["type"] in FULL_SCAN_TYPES and (row["rows"] or 0) >= min_rows:
+            reason = allowed(label, row["table"], sql)
+            row["allowed"] = reason
+            if not reason:
+                failures.append(f"{label}: {row['type']} scan of {row['table']} (~{row['rows']} rows)")
+    return plan, failures
+
+
+def run(args):
+    rng = random.Random(args.seed)
+    server = dict(placement.db_pool.db_config)
+    server.pop("database")
+    conn = placement.mysql.connector.connect(**server)
+    report = {"seed": seed(conn, args, rng)}
+    cur = conn.cursor(dictionary=True)
+    cur.execute(f"USE {placement.DB_CONFIG['database']}")
+    cur.executemany("INSERT INTO SentNotifications (officer_id, message, target_branches, fanned_out) "
+                    "SELECT officer_id, %s, %s, FALSE FROM PlacementOfficer",
+                    [(f"Synthetic broadcast {i}", rng.choice((None, "CSE", "CSE,IT"))) for i in range(args.broadcasts)])
+    conn.commit()
+    for table in ("students", "StudentSkill", "JobPosting", "JobEligibility", "Application", "Notification",
+                  "SentNotifications", "ApplicationSummary"):
+        cur.execute(f"ANALYZE TABLE {table}")
+        cur.fetchall()
+
+    cur.execute("""
+        SELECT a.application_id, a.student_id, a.job_id, j.officer_id, s.university_roll
+        FROM Application a JOIN JobPosting j ON j.job_id = a.job_id JOIN students s ON s.student_id = a.student_id
+        WHERE a.status = 'Applied' LIMIT 1
+    """)
+    sample = cur.fetchone()
+    tokens = {"student": mint_token(sample["student_id"], "student"), "officer": mint_token(sample["officer_id"], "officer")}
+
+    get_db = placement.get_db
+    placement.get_db = lambda: RecordingConnection(get_db())
+    client = placement.app.test_client()
+    report["routes"], failures = {}, []
+    for label, role, method, path, body in ROUTES:
+        status, statements = record_route(client, method, path.format(**sample), tokens[role], body)
+        entry = report["routes"][label] = {"status": status, "statements": []}
+        if status >= 400:
+            failures.append(f"{label}: returned {status}")
+        for sql, params in statements:
+            plan, problems = explain(cur, label, sql, params, args.min_rows)
+            entry["statements"].append({"sql": " ".join(sql.split()), "plan": plan})
+            failures.extend(problems)
+    conn.rollback()
+    cur.close(); conn.close()
+    report["failures"] = failures
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="EXPLAIN every hot route's SQL on a seeded database")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--students", type=int, default=5000)
+    parser.add_argument("--officers", type=int, default=10)
+    parser.add_argument("--skills", type=int, default=300)
+    parser.add_argument("--jobs", type=int, default=200)
+    parser.add_argument("--skills-per-student", type=int, default=6)
+    parser.add_argument("--skills-per-job", type=int, default=4)
+    parser.add_argument("--applications-per-student", type=int, default=5)
+    parser.add_argument("--notifications-per-student", type=int, default=10)
+    parser.add_argument("--broadcasts", type=int, default=50, help="fan-out-on-read broadcasts per officer")
+    parser.add_argument("--min-rows", type=int, default=100, help="ignore scans the optimizer estimates below this")
+    result = run(parser.parse_args())
+    print(json.dumps(result, indent=2, default=str))
+    sys.exit(1 if result["failures"] else 0)
@@ -0,0 +1,411 @@
+# bench/harness.py - seed a scratch database and replay placement-day traffic
+#
+# Usage:
+#   python bench/harness.py run --students 20000 --jobs 500 --output before.json
+#   python bench/harness.py run --base-url http://127.0.0.1:5000 --no-seed --output after.json
+#   python bench/harness.py compare before.json after.json
+#
+# `run` recreates the scratch database (BENCH_DB_NAME, as in the other bench
+# scripts) from database/schema.sql, fills it with synthetic students, skills,
+# postings, applications and notifications, then replays these scenarios in order:
+#   login_storm        concurrent student logins (bcrypt bound)
+#   student_dashboard  profile, jobs feed, applications and notifications per student
+#   officer_dashboard  postings, applications, student list, reports and sent notifications
+#   apply_burst        one new posting, then students applying with PDF uploads
+#   bulk_shortlist     the officer shortlisting every burst applicant in batches
+#   broadcast          officer broadcasts to everyone and to segments
+# Without --base-url requests go through Flask's test client in this process,
+# which also counts DB queries per request; with --base-url they go over HTTP to
+# a server that must be using the same database, and only the per-scenario
+# total (MySQL's Questions counter) is available. Output is one JSON document.
+import argparse
+import datetime
+import http.client
+import io
+import json
+import os
+import random
+import sys
+import threading
+import time
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.environ["DB_NAME"] = os.getenv("BENCH_DB_NAME", "student_placement_bench")
+
+import app as placement  # noqa: E402  (reads DB_NAME at import)
+from bench.load_test import Recorder, mint_token, multipart  # noqa: E402
+from bench.notification_models import reset_database  # noqa: E402
+
+BRANCHES = ("CSE", "ECE", "ME", "CE", "EE", "IT")
+STATUS_WEIGHTS = (("Applied", 70), ("Shortlisted", 15), ("Selected", 5), ("Rejected", 10))
+PASSWORD = "bench-password"
+BATCH = 5000
+
+
+# ===========================
+# Seeding
+# ===========================
+def insert_batches(cur, sql, rows):
+    for start in range(0, len(rows), BATCH):
+        cur.executemany(sql, rows[start:start + BATCH])
+
+
+def seed(conn, args, rng):
+    """Fill the scratch database; returns row counts and the seeding time."""
+    started = time.perf_counter()
+    cur = conn.cursor()
+    reset_database(cur, placement.DB_CONFIG["database"])
+    password_hash = placement.password_hasher.hash(PASSWORD)
+
+    insert_batches(cur, "INSERT INTO students (name, email, password_hash, branch, cgpa, university_roll) "
+                        "VALUES (%s, %s, %s, %s, %s, %s)",
+                   [(f"Student {i}", f"student{i}@bench.test", password_hash, rng.choice(BRANCHES),
+                     round(rng.uniform(5, 10), 2), 100000 + i) for i in range(args.students)])
+    insert_batches(cur, "INSERT INTO PlacementOfficer (name, email, password_hash) VALUES (%s, %s, %s)",
+                   [(f"Officer {i}", f"officer{i}@bench.test", password_hash) for i in range(args.officers)])
+    insert_batches(cur, "INSERT INTO Skill (skill_name) VALUES (%s)", [(f"skill-{i}",) for i in range(args.skills)])
+    cur.execute("SELECT student_id FROM students")
+    student_ids = [row[0] for row in cur.fetchall()]
+    cur.execute("SELECT officer_id FROM PlacementOfficer")
+    officer_ids = [row[0] for row in cur.fetchall()]
+    cur.execute("SELECT skill_id FROM Skill")
+    skill_ids = [row[0] for row in cur.fetchall()]
+
+    insert_batches(cur, "INSERT INTO StudentSkill (student_id, skill_id) VALUES (%s, %s)",
+                   [(s, k) for s in student_ids for k in rng.sample(skill_ids, min(args.skills_per_student, len(skill_ids)))])
+
+    today = datetime.date.today()
+    job_ids = []
+    for i in range(args.jobs):
+        branches = "All" if rng.random() < 0.4 else ", ".join(sorted(rng.sample(BRANCHES, rng.randint(1, 3))))
+        min_cgpa = round(rng.uniform(5, 8), 1)
+        deadline = today + datetime.timedelta(days=rng.randint(-15, 60))
+        cur.execute(
+            "INSERT INTO JobPosting (officer_id, title, description, branch_eligibility, min_cgpa, package_stipend, deadline) "
+            "VALUES (%s, %s, %s, %s, %s, %s, %s)",
+            (rng.choice(officer_ids), f"Role {i}", f"Synthetic posting {i}", branches, min_cgpa,
+             round(rng.uniform(3, 40), 2), deadline)
+        )
+        job_ids.append(cur.lastrowid)
+        placement.index_job_eligibility(cur, cur.lastrowid, branches, min_cgpa, deadline)
+    insert_batches(cur, "INSERT INTO JobSkill (job_id, skill_id) VALUES (%s, %s)",
+                   [(j, k) for j in job_ids for k in rng.sample(skill_ids, min(args.skills_per_job, len(skill_ids)))])
+
+    statuses, weights = zip(*STATUS_WEIGHTS)
+    insert_batches(cur, "INSERT INTO Application (student_id, job_id, status, applied_on) VALUES (%s, %s, %s, %s)",
+                   [(s, j, rng.choices(statuses, weights)[0], today - datetime.timedelta(days=rng.randint(0, 365)))
+                    for s in student_ids for j in rng.sample(job_ids, min(args.applications_per_student, len(job_ids)))])
+    insert_batches(cur, "INSERT INTO Notification (student_id, message) VALUES (%s, %s)",
+                   [(s, f"Synthetic notification {n}") for s in student_ids for n in range(args.notifications_per_student)])
+    conn.commit()
+    placement.rebuild_application_summary(conn)
+
+    counts = {}
+    for table in ("students", "PlacementOfficer", "Skill", "StudentSkill", "JobPosting", "JobSkill", "Application", "Notification"):
+        cur.execute(f"SELECT COUNT(*) FROM {table}")
+        counts[table] = cur.fetchone()[0]
+    cur.close()
+    return {"rows": counts, "seconds": round(time.perf_counter() - started, 1)}
+
+
+# ===========================
+# Clients
+# ===========================
+_queries = threading.local()
+
+
+class CountingCursor:
+    def __init__(self, cursor):
+        self._cursor = cursor
+
+    def execute(self, *args, **kwargs):
+        _queries.count = getattr(_queries, "count", 0) + 1
+        return self._cursor.execute(*args, **kwargs)
+
+    def executemany(self, *args, **kwargs):
+        _queries.count = getattr(_queries, "count", 0) + 1
+        return self._cursor.executemany(*args, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+
+class CountingConnection:
+    def __init__(self, db):
+        self._db = db
+
+    def cursor(self, *args, **kwargs):
+        return CountingCursor(self._db.cursor(*args, **kwargs))
+
+    def __getattr__(self, name):
+        return getattr(self._db, name)
+
+
+def install_query_counter():
+    """Route the app's get_db() through counting wrappers (in-process mode only)."""
+    get_db = placement.get_db
+    placement.get_db = lambda: CountingConnection(get_db())
+
+
+class InProcessClient:
+    def __init__(self):
+        self._client = placement.app.test_client()
+
+    def call(self, method, path, token=None, body=None, upload=None):
+        headers = {"Authorization": f"Bearer {token}"} if token else {}
+        kwargs = {"json": body} if body is not None else {}
+        if upload:
+            kwargs = {"data": {"resume": (io.BytesIO(upload), "resume.pdf", "application/pdf")},
+                      "content_type": "multipart/form-data"}
+        _queries.count = 0
+        response = self._client.open(path, method=method, headers=headers, **kwargs)
+        return response.status_code, response.get_json(silent=True), _queries.count
+
+
+class HttpClient:
+    def __init__(self, base_url):
+        url = urllib.parse.urlsplit(base_url)
+        self._conn = http.client.HTTPConnection(url.hostname, url.port or 80, timeout=60)
+
+    def call(self, method, path, token=None, body=None, upload=None):
+        headers = {"Authorization": f"Bearer {token}"} if token else {}
+        payload = None
+        if body is not None:
+            payload = json.dumps(body)
+            headers["Content-Type"] = "application/json"
+        if upload:
+            payload, headers["Content-Type"] = multipart("resume", "resume.pdf", upload)
+        try:
+            self._conn.request(method, path, body=payload, headers=headers)
+            response = self._conn.getresponse()
+            raw = response.read()
+        except (OSError, http.client.HTTPException):
+            self._conn.close()
+            return 599, None, None
+        try:
+            return response.status, json.loads(raw), None
+        except ValueError:
+            return response.status, None, None
+
+
+def fake_pdf(size, rng):
+    return b"%PDF-1.4\n" + rng.randbytes(max(0, size - 16)) + b"\n%%EOF\n"
+
+
+# ===========================
+# Scenarios
+# ===========================
+class Harness:
+    def __init__(self, args, rng):
+        self.args = args
+        self.rng = rng
+        self._local = threading.local()
+        conn = placement.mysql.connector.connect(**placement.db_pool.db_config)
+        cur = conn.cursor()
+        cur.execute("SELECT student_id, email FROM students")
+        self.students = cur.fetchall()
+        cur.execute("SELECT officer_id FROM PlacementOfficer")
+        self.officers = [row[0] for row in cur.fetchall()]
+        cur.close()
+        self._status_conn = conn
+
+    def client(self):
+        if not hasattr(self._local, "client"):
+            self._local.client = HttpClient(self.args.base_url) if self.args.base_url else InProcessClient()
+        return self._local.client
+
+    def questions(self):
+        cur = self._status_conn.cursor()
+        cur.execute("SHOW GLOBAL STATUS LIKE 'Questions'")
+        value = int(cur.fetchone()[1])
+        cur.close()
+        return value
+
+    def phase(self, tasks, concurrency=None):
+        """Run (endpoint, method, path, token, body, upload) tasks; returns the scenario report."""
+        recorder = Recorder()
+
+        def one(task):
+            name, method, path, token, body, upload = task
+            started = time.perf_counter()
+            status, payload, queries = self.client().call(method, path, token, body, upload)
+            recorder.add(name, (time.perf_counter() - started) * 1000, status < 400, queries)
+            return payload
+
+        before = self.questions()
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency or self.args.concurrency) as pool:
+            results = list(pool.map(one, tasks))
+        elapsed = time.perf_counter() - started
+        # Minus one for the SHOW STATUS itself
+        questions = self.questions() - before - 1
+        endpoints = recorder.summary(elapsed)
+        requests = sum(e["requests"] for e in endpoints.values())
+        return {
+            "requests": requests,
+            "seconds": round(elapsed, 2),
+            "throughput_rps": round(requests / elapsed, 1) if elapsed else None,
+            "db_questions": questions,
+            "db_questions_per_request": round(questions / requests, 2) if requests else None,
+            "endpoints": endpoints,
+        }, results
+
+    def student_token(self, student_id):
+        return mint_token(student_id, "student")
+
+    def login_storm(self):
+        sample = self.rng.choices(self.students, k=self.args.logins)
+        return self.phase([("POST /api/student/login", "POST", "/api/student/login", None,
+                            {"email": email, "password": PASSWORD}, None) for _, email in sample])[0]
+
+    def student_dashboard(self):
+        tasks = []
+        for student_id, _ in self.rng.choices(self.students, k=self.args.dashboard_loads):
+            token = self.student_token(student_id)
+            for path in ("/api/student/profile", "/api/jobs", "/api/student/applications", "/api/student/notifications"):
+                tasks.append((f"GET {path}", "GET", path, token, None, None))
+        return self.phase(tasks)[0]
+
+    def officer_dashboard(self):
+        tasks = []
+        for officer_id in self.rng.choices(self.officers, k=self.args.officer_loads):
+            token = mint_token(officer_id, "officer")
+            for name, path in (
+                ("GET /api/officer/postings", "/api/officer/postings"),
+                ("GET /api/officer/applications", "/api/officer/applications?limit=1000"),
+                ("GET /api/student/list", "/api/student/list?limit=50"),
+                ("GET /api/officer/reports", "/api/officer/reports?group_by=officer&officer_id=me"),
+                ("GET /api/officer/notifications", "/api/officer/notifications"),
+            ):
+                tasks.append((name, "GET", path, token, None, None))
+        return self.phase(tasks)[0]
+
+    def apply_burst(self):
+        officer_id = self.officers[0]
+        self.officer_token = mint_token(officer_id, "officer")
+        posting, (created,) = self.phase([("POST /api/officer/postings", "POST", "/api/officer/postings", self.officer_token, {
+            "title": "Burst Role", "description": "Open to everyone", "branch_eligibility": "All",
+            "min_cgpa": 0, "package_stipend": 12, "deadline": str(datetime.date.today() + datetime.timedelta(days=7)),
+            "skills": ["skill-1", "skill-2"],
+        }, None)], concurrency=1)
+        self.burst_job = (created or {}).get("job_id")
+        if not self.burst_job:
+            return {"error": "could not create the burst posting", "create": posting}
+        pdf = fake_pdf(self.args.resume_kb * 1024, self.rng)
+        applicants = self.rng.sample(self.students, min(self.args.applicants, len(self.students)))
+        report, _ = self.phase([("POST /api/jobs/<id>/apply", "POST", f"/api/jobs/{self.burst_job}/apply",
+                                 self.student_token(student_id), None, pdf) for student_id, _ in applicants])
+        report["create_posting"] = posting["endpoints"]
+        return report
+
+    def bulk_shortlist(self):
+        if not getattr(self, "burst_job", None):
+            return {"error": "apply_burst did not run"}
+        cur = self._status_conn.cursor()
+        self._status_conn.commit()
+        cur.execute("SELECT application_id FROM Application WHERE job_id = %s", (self.burst_job,))
+        ids = [row[0] for row in cur.fetchall()]
+        cur.close()
+        batches = [ids[i:i + self.args.bulk_batch] for i in range(0, len(ids), self.args.bulk_batch)]
+        report, _ = self.phase([("PUT /api/officer/applications/bulk-status", "PUT", "/api/officer/applications/bulk-status",
+                                 self.officer_token, {"application_ids": batch, "status": "Shortlisted"}, None)
+                                for batch in batches], concurrency=1)
+        report["applications"] = len(ids)
+        return report
+
+    def broadcast(self):
+        token = mint_token(self.officers[0], "officer")
+        bodies = [{"message": "Placement drive tomorrow"}, {"message": "CSE/IT briefing", "branch": ["CSE", "IT"]},
+                  {"message": "High-CGPA shortlist", "min_cgpa": 8.5}]
+        return self.phase([("POST /api/officer/notifications", "POST", "/api/officer/notifications", token,
+                            bodies[i % len(bodies)], None) for i in range(self.args.broadcasts)], concurrency=1)[0]
+
+
+SCENARIOS = ("login_storm", "student_dashboard", "officer_dashboard", "apply_burst", "bulk_shortlist", "broadcast")
+
+
+def run(args):
+    rng = random.Random(args.seed)
+    report = {
+        "label": args.label,
+        "started_at": datetime.datetime.now().isoformat(timespec="seconds"),
+        "mode": "http" if args.base_url else "in-process",
+        "config": {k: v for k, v in vars(args).items() if k not in ("command", "output")},
+    }
+    if not args.no_seed:
+        server = dict(placement.db_pool.db_config)
+        server.pop("database")
+        conn = placement.mysql.connector.connect(**server)
+        report["seed"] = seed(conn, args, rng)
+        conn.close()
+    if not args.base_url:
+        install_query_counter()
+
+    harness = Harness(args, rng)
+    report["scenarios"] = {}
+    for name in args.scenarios.split(","):
+        report["scenarios"][name] = getattr(harness, name)()
+    return report
+
+
+def compare(baseline, candidate):
+    """p95 and throughput deltas per scenario/endpoint between two run outputs."""
+    rows = {}
+    for scenario, current in candidate["scenarios"].items():
+        before = baseline["scenarios"].get(scenario, {})
+        for endpoint, stats in current.get("endpoints", {}).items():
+            old = before.get("endpoints", {}).get(endpoint)
+            if not old:
+                continue
+            rows[f"{scenario} {endpoint}"] = {
+                "p95_ms": [old["p95_ms"], stats["p95_ms"]],
+                "p95_change_pct": round((stats["p95_ms"] - old["p95_ms"]) / old["p95_ms"] * 100, 1) if old["p95_ms"] else None,
+                "rps": [old["rps"], stats["rps"]],
+                "queries_per_request": [old.get("queries_per_request"), stats.get("queries_per_request")],
+            }
+    return {"baseline": baseline.get("label"), "candidate": candidate.get("label"), "endpoints": rows}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Seed synthetic placement data and replay realistic traffic")
+    commands = parser.add_subparsers(dest="command", required=True)
+    run_parser = commands.add_parser("run", help="seed the scratch database and replay the scenarios")
+    run_parser.add_argument("--label", default="run")
+    run_parser.add_argument("--base-url", help="replay over HTTP against this server instead of in-process")
+    run_parser.add_argument("--no-seed", action="store_true", help="reuse the existing scratch database")
+    run_parser.add_argument("--seed", type=int, default=7, help="random seed")
+    run_parser.add_argument("--students", type=int, default=5000)
+    run_parser.add_argument("--officers", type=int, default=10)
+    run_parser.add_argument("--skills", type=int, default=300)
+    run_parser.add_argument("--jobs", type=int, default=200)
+    run_parser.add_argument("--skills-per-student", type=int, default=6)
+    run_parser.add_argument("--skills-per-job", type=int, default=4)
+    run_parser.add_argument("--applications-per-student", type=int, default=5)
+    run_parser.add_argument("--notifications-per-student", type=int, default=10)
+    run_parser.add_argument("--concurrency", type=int, default=16)
+    run_parser.add_argument("--logins", type=int, default=200)
+    run_parser.add_argument("--dashboard-loads", type=int, default=500)
+    run_parser.add_argument("--officer-loads", type=int, default=50)
+    run_parser.add_argument("--applicants", type=int, default=1000)
+    run_parser.add_argument("--resume-kb", type=int, default=150)
+    run_parser.add_argument("--bulk-batch", type=int, default=500)
+    run_parser.add_argument("--broadcasts", type=int, default=6)
+    run_parser.add_argument("--scenarios", default=",".join(SCENARIOS))
+    run_parser.add_argument("--output", help="write the JSON report here as well as to stdout")
+    compare_parser = commands.add_parser("compare", help="diff two run outputs")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("candidate")
+    args = parser.parse_args()
+
+    if args.command == "compare":
+        with open(args.baseline) as a, open(args.candidate) as b:
+            result = compare(json.load(a), json.load(b))
+    else:
+        result = run(args)
+        if args.output:
+            with open(args.output, "w") as f:
+                json.dump(result, f, indent=2)
+    print(json.dumps(result, indent=2))
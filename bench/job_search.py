@@ -0,0 +1,101 @@
+# bench/job_search.py - build and query latency of the in-process job search index
+#
+# Usage: python bench/job_search.py --jobs 10000 --queries 2000
+# Runs entirely in memory on synthetic postings (no database needed), so it
+# measures the index itself: build time, per-query latency with and without
+# filters, and the per-posting cost of refresh-style re-indexing.
+import argparse
+import datetime
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from job_search import JobSearch  # noqa: E402
+
+ROLES = ["software engineer", "data analyst", "backend developer", "frontend developer", "ml engineer",
+         "devops engineer", "product analyst", "embedded engineer", "qa engineer", "business analyst",
+         "mechanical design engineer", "site engineer", "network engineer", "security analyst", "intern"]
+SKILLS = ["python", "java", "c++", "sql", "react", "node.js", "aws", "docker", "kubernetes", "pandas",
+          "tensorflow", "spring", "linux", "excel", "tableau", "autocad", "matlab", "go", "rust", "c#"]
+WORDS = ("team build design develop maintain scalable services customers data pipelines testing agile cloud "
+         "systems analysis reporting dashboards mentoring internship campus graduate fresher stipend remote "
+         "onsite hybrid product platform api microservices performance monitoring automation").split()
+QUERIES = ["python developer", "data analyst sql", "java spring backend", "react frontend", "ml engineer tensorflow",
+           "devops kubernetes aws", "embedded c++", "intern", "security", "autocad design", "remote python",
+           "cloud platform engineer", "tableau dashboards", "go rust systems", "qa automation testing"]
+
+
+def percentile(samples, p):
+    return round(samples[min(len(samples) - 1, int(len(samples) * p / 100))], 3)
+
+
+def synthetic_jobs(n, rng):
+    today = datetime.date.today()
+    jobs, job_skills = [], []
+    for job_id in range(1, n + 1):
+        skills = rng.sample(SKILLS, rng.randint(2, 5))
+        title = f"{rng.choice(['Senior', 'Junior', 'Associate', ''])} {rng.choice(ROLES)}".strip()
+        description = " ".join(rng.choices(WORDS, k=rng.randint(40, 160)) + skills)
+        status = "Open" if rng.random() < 0.85 else "Closed"
+        jobs.append((job_id, title, description, round(rng.uniform(3, 40), 2),
+                     today + datetime.timedelta(days=rng.randint(-30, 90)), status))
+        job_skills.extend((job_id, s) for s in skills)
+    return jobs, job_skills
+
+
+def time_queries(search, queries, rng, **filters):
+    samples = []
+    hits = 0
+    for _ in range(queries):
+        started = time.perf_counter()
+        page, _, total = search.search(rng.choice(QUERIES), limit=20, **filters)
+        samples.append((time.perf_counter() - started) * 1000)
+        hits += total
+    samples.sort()
+    return {"p50_ms": percentile(samples, 50), "p95_ms": percentile(samples, 95), "p99_ms": percentile(samples, 99),
+            "avg_matches": round(hits / queries, 1)}
+
+
+def run(args):
+    rng = random.Random(args.seed)
+    jobs, job_skills = synthetic_jobs(args.jobs, rng)
+    search = JobSearch()
+    started = time.perf_counter()
+    search.load_rows(jobs, job_skills)
+    build_ms = (time.perf_counter() - started) * 1000
+
+    today = datetime.date.today()
+    report = {
+        "jobs": args.jobs,
+        "queries": args.queries,
+        "build_ms": round(build_ms, 1),
+        "index": search.stats(),
+        "unfiltered": time_queries(search, args.queries, rng),
+        "package_range": time_queries(search, args.queries, rng, package_min=10, package_max=25),
+        "deadline_window": time_queries(search, args.queries, rng, deadline_from=today,
+                                        deadline_to=today + datetime.timedelta(days=30)),
+        "skill": time_queries(search, args.queries, rng, skill="python"),
+        "all_filters": time_queries(search, args.queries, rng, package_min=5, package_max=30, skill="sql",
+                                    deadline_to=today + datetime.timedelta(days=60)),
+    }
+    samples = []
+    for job_id, title, description, package, deadline, status in rng.sample(jobs, min(500, len(jobs))):
+        started = time.perf_counter()
+        search._put(search.index, search._jobs, job_id, title, description + " updated", package, deadline, status,
+                    ["python", "sql"])
+        samples.append((time.perf_counter() - started) * 1000)
+    samples.sort()
+    report["reindex_one"] = {"p50_ms": percentile(samples, 50), "p95_ms": percentile(samples, 95)}
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure the in-process job search index")
+    parser.add_argument("--jobs", type=int, default=10000)
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=7)
+    print(json.dumps(run(parser.parse_args()), indent=2))
@@ -0,0 +1,188 @@
+# bench/load_test.py - compare the sync (gunicorn) and async (uvicorn asgi:application) modes
+#
+# Start the server in one mode, then run e.g.
+#   python bench/load_test.py --base-url http://127.0.0.1:5000 --label sync \
+#       --student-ids 1-500 --job-id 1 --concurrency 64 --duration 30 --sse-clients 500
+# and repeat against the other mode with the same arguments. Tokens are minted
+# locally with JWT_SECRET, so no logins (and no bcrypt) are in the measurement.
+# --apply-rate adds resume uploads; each student can apply to --job-id once, so
+# reset Application between runs when using it.
+import argparse
+import datetime
+import http.client
+import json
+import os
+import random
+import sys
+import threading
+import time
+import urllib.parse
+import uuid
+
+import jwt
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import Config  # noqa: E402
+
+READ_ENDPOINTS = ["/api/jobs", "/api/student/profile", "/api/student/notifications", "/api/student/applications"]
+
+
+def mint_token(user_id, role):
+    exp = datetime.datetime.utcnow() + datetime.timedelta(hours=2)
+    return jwt.encode({"id": user_id, "role": role, "exp": exp}, Config.JWT_SECRET, algorithm="HS256")
+
+
+def parse_ids(text):
+    start, _, end = text.partition("-")
+    return list(range(int(start), int(end or start) + 1))
+
+
+def percentile(samples, p):
+    return round(samples[min(len(samples) - 1, int(len(samples) * p / 100))], 2) if samples else None
+
+
+class Recorder:
+    """Latency samples, errors and (when known) DB query counts per endpoint name."""
+
+    def __init__(self):
+        self.samples = {}
+        self.errors = {}
+        self.queries = {}
+        self._lock = threading.Lock()
+
+    def add(self, name, ms, ok, queries=None):
+        with self._lock:
+            self.samples.setdefault(name, []).append(ms)
+            if not ok:
+                self.errors[name] = self.errors.get(name, 0) + 1
+            if queries is not None:
+                self.queries[name] = self.queries.get(name, 0) + queries
+
+    def summary(self, duration):
+        report = {}
+        for name, samples in sorted(self.samples.items()):
+            samples.sort()
+            report[name] = {
+                "requests": len(samples),
+                "errors": self.errors.get(name, 0),
+                "rps": round(len(samples) / duration, 1),
+                "p50_ms": percentile(samples, 50),
+                "p95_ms": percentile(samples, 95),
+                "p99_ms": percentile(samples, 99),
+            }
+            if name in self.queries:
+                report[name]["queries_per_request"] = round(self.queries[name] / len(samples), 2)
+        return report
+
+
+def multipart(field, filename, payload):
+    boundary = uuid.uuid4().hex
+    body = (f"--{boundary}\r\nContent-Disposition: form-data; name=\"{field}\"; filename=\"{filename}\"\r\n"
+            f"Content-Type: application/pdf\r\n\r\n").encode() + payload + f"\r\n--{boundary}--\r\n".encode()
+    return body, f"multipart/form-data; boundary={boundary}"
+
+
+def request(conn, method, path, token, body=None, content_type=None):
+    headers = {"Authorization": f"Bearer {token}"}
+    if content_type:
+        headers["Content-Type"] = content_type
+    conn.request(method, path, body=body, headers=headers)
+    response = conn.getresponse()
+    response.read()
+    return response.status
+
+
+def worker(base, tokens, stop_at, recorder, job_id, apply_every, resume_bytes):
+    url = urllib.parse.urlsplit(base)
+    conn = http.client.HTTPConnection(url.hostname, url.port or 80, timeout=30)
+    sent = 0
+    while time.time() < stop_at:
+        student_id, token = random.choice(tokens)
+        sent += 1
+        if apply_every and sent % apply_every == 0:
+            name, method = "POST /api/jobs/<id>/apply", "POST"
+            path = f"/api/jobs/{job_id}/apply"
+            body, content_type = multipart("resume", f"{student_id}.pdf", os.urandom(resume_bytes))
+        else:
+            name = path = random.choice(READ_ENDPOINTS)
+            method, body, content_type = "GET", None, None
+        started = time.perf_counter()
+        try:
+            status = request(conn, method, path, token, body, content_type)
+            ok = status < 500
+        except (OSError, http.client.HTTPException):
+            conn.close()
+            conn = http.client.HTTPConnection(url.hostname, url.port or 80, timeout=30)
+            ok = False
+        recorder.add(f"{method} {name}" if method == "GET" else name, (time.perf_counter() - started) * 1000, ok)
+    conn.close()
+
+
+def sse_client(base, token, stop_at, opened, failed):
+    """Hold one event stream open (reading heartbeats) until the run ends."""
+    url = urllib.parse.urlsplit(base)
+    conn = http.client.HTTPConnection(url.hostname, url.port or 80, timeout=Config.EVENTS_HEARTBEAT * 2)
+    try:
+        conn.request("GET", f"/api/events/stream?access_token={token}")
+        response = conn.getresponse()
+        if response.status != 200:
+            failed.append(response.status)
+            return
+        opened.append(1)
+        while time.time() < stop_at and response.readline():
+            pass
+    except (OSError, http.client.HTTPException) as e:
+        failed.append(type(e).__name__)
+    finally:
+        conn.close()
+
+
+def run(args):
+    tokens = [(i, mint_token(i, "student")) for i in parse_ids(args.student_ids)]
+    recorder = Recorder()
+    stop_at = time.time() + args.duration + args.warmup
+
+    opened, failed = [], []
+    streams = [threading.Thread(target=sse_client, args=(args.base_url, tokens[i % len(tokens)][1], stop_at, opened, failed),
+                                daemon=True) for i in range(args.sse_clients)]
+    for t in streams:
+        t.start()
+
+    time.sleep(args.warmup)
+    apply_every = int(1 / args.apply_rate) if args.apply_rate else 0
+    started = time.time()
+    workers = [threading.Thread(target=worker, args=(args.base_url, tokens, stop_at, recorder, args.job_id,
+                                                     apply_every, args.resume_kb * 1024))
+               for _ in range(args.concurrency)]
+    for t in workers:
+        t.start()
+    for t in workers:
+        t.join()
+    elapsed = time.time() - started
+
+    endpoints = recorder.summary(elapsed)
+    return {
+        "label": args.label,
+        "base_url": args.base_url,
+        "concurrency": args.concurrency,
+        "duration_s": round(elapsed, 1),
+        "sse_clients": {"requested": args.sse_clients, "opened": len(opened), "failed": len(failed)},
+        "total_rps": round(sum(e["requests"] for e in endpoints.values()) / elapsed, 1),
+        "endpoints": endpoints,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load-test one serving mode of the placement API")
+    parser.add_argument("--base-url", default="http://127.0.0.1:5000")
+    parser.add_argument("--label", default="run")
+    parser.add_argument("--student-ids", default="1-100", help="inclusive range of existing student ids, e.g. 1-500")
+    parser.add_argument("--job-id", type=int, default=1)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=int, default=30)
+    parser.add_argument("--warmup", type=int, default=3)
+    parser.add_argument("--sse-clients", type=int, default=0, help="idle event streams held open during the run")
+    parser.add_argument("--apply-rate", type=float, default=0.0, help="fraction of requests that upload a resume")
+    parser.add_argument("--resume-kb", type=int, default=200)
+    print(json.dumps(run(parser.parse_args()), indent=2))
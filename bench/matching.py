@@ -0,0 +1,82 @@
+# bench/matching.py - MatchEngine load, ranking and incremental-update timings
+#
+# Usage: python bench/matching.py --students 50000 --jobs 2000 --skills 1500
+# Purely in-memory (synthetic data), no database needed.
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from matching import MatchEngine  # noqa: E402
+
+
+def timed(fn, repeat=1):
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    samples.sort()
+    return result, round(samples[len(samples) // 2], 3)
+
+
+def synthetic(n_students, n_jobs, n_skills, skills_per_student, skills_per_job, seed=7):
+    rng = np.random.default_rng(seed)
+    # Zipf-ish popularity so a few skills are common and most are rare
+    popularity = 1 / np.arange(1, n_skills + 1) ** 0.8
+    popularity /= popularity.sum()
+
+    def links(n, per):
+        owners = np.repeat(np.arange(1, n + 1), per)
+        skills = rng.choice(n_skills, size=n * per, p=popularity) + 1
+        return np.unique(np.stack([owners, skills], axis=1), axis=0)
+
+    students = np.stack([np.arange(1, n_students + 1), rng.uniform(5, 10, n_students).round(2)], axis=1)
+    jobs = np.stack([np.arange(1, n_jobs + 1), rng.uniform(5, 9, n_jobs).round(1)], axis=1)
+    return students, links(n_students, skills_per_student), jobs, links(n_jobs, skills_per_job)
+
+
+def run(args):
+    students, student_skills, jobs, job_skills = synthetic(
+        args.students, args.jobs, args.skills, args.skills_per_student, args.skills_per_job
+    )
+    engine = MatchEngine()
+    _, load_ms = timed(lambda: engine.load_rows(students, student_skills, jobs, job_skills))
+
+    all_students = list(range(1, args.students + 1))
+    all_jobs = list(range(1, args.jobs + 1))
+    applicants = all_students[: args.applicants]
+    _, applicants_ms = timed(lambda: engine.rank_students(1, applicants, k=args.k), repeat=5)
+    _, all_students_ms = timed(lambda: engine.rank_students(1, all_students, k=args.k), repeat=5)
+    _, jobs_ms = timed(lambda: engine.rank_jobs(1, all_jobs, k=args.k), repeat=5)
+    _, update_ms = timed(lambda: engine.set_student(1, 8.5, [1, 2, 3, args.skills + 1]), repeat=5)
+
+    return {
+        "students": args.students,
+        "jobs": args.jobs,
+        "skills": args.skills,
+        "k": args.k,
+        "load_ms": load_ms,
+        f"rank_{args.applicants}_applicants_ms": applicants_ms,
+        "rank_all_students_for_job_ms": all_students_ms,
+        "rank_all_jobs_for_student_ms": jobs_ms,
+        "incremental_student_update_ms": update_ms,
+        "engine": engine.stats(),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the skill-match ranking engine")
+    parser.add_argument("--students", type=int, default=50000)
+    parser.add_argument("--jobs", type=int, default=2000)
+    parser.add_argument("--skills", type=int, default=1500)
+    parser.add_argument("--skills-per-student", type=int, default=8)
+    parser.add_argument("--skills-per-job", type=int, default=6)
+    parser.add_argument("--applicants", type=int, default=5000)
+    parser.add_argument("--k", type=int, default=20)
+    print(json.dumps(run(parser.parse_args()), indent=2))
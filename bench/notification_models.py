@@ -0,0 +1,92 @@
+# bench/notification_models.py - fan-out-on-write vs fan-out-on-read broadcasts
+#
+# Usage: python bench/notification_models.py --students 20000 --broadcasts 20
+# Uses a scratch database (BENCH_DB_NAME, default student_placement_bench) that is
+# dropped and recreated from database/schema.sql; never point it at production.
+import argparse
+import json
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.environ["DB_NAME"] = os.getenv("BENCH_DB_NAME", "student_placement_bench")
+
+import app as placement  # noqa: E402  (reads DB_NAME at import)
+
+
+def reset_database(cur, db_name):
+    cur.execute(f"DROP DATABASE IF EXISTS {db_name}")
+    cur.execute(f"CREATE DATABASE {db_name}")
+    cur.execute(f"USE {db_name}")
+    with open(os.path.join(ROOT, "database", "schema.sql")) as f:
+        lines = [l for l in f if not l.lstrip().startswith("--")]
+    for statement in "".join(lines).split(";"):
+        statement = statement.strip()
+        if statement and not statement.upper().startswith(("CREATE DATABASE", "USE ")):
+            cur.execute(statement)
+
+
+def table_bytes(cur, db_name, table):
+    cur.execute(f"ANALYZE TABLE {table}")
+    cur.fetchall()
+    cur.execute(
+        "SELECT DATA_LENGTH + INDEX_LENGTH FROM information_schema.TABLES WHERE TABLE_SCHEMA = %s AND TABLE_NAME = %s",
+        (db_name, table)
+    )
+    return int(cur.fetchone()[0])
+
+
+def run(students, broadcasts, message_len):
+    db_name = placement.DB_CONFIG["database"]
+    server = dict(placement.db_pool.db_config)
+    server.pop("database")
+    conn = placement.mysql.connector.connect(**server)
+    cur = conn.cursor()
+    reset_database(cur, db_name)
+
+    cur.execute("INSERT INTO PlacementOfficer (name, email, password_hash) VALUES ('Bench', 'bench@example.com', 'x')")
+    officer_id = cur.lastrowid
+    cur.executemany(
+        "INSERT INTO students (name, email, password_hash, branch, cgpa, university_roll) VALUES (%s, %s, 'x', %s, %s, %s)",
+        [(f"Student {i}", f"s{i}@example.com", ("CSE", "ECE", "ME", "CE")[i % 4], 6 + (i % 40) / 10, 100000 + i)
+         for i in range(students)]
+    )
+    conn.commit()
+
+    message = "x" * message_len
+    results = {"students": students, "broadcasts": broadcasts, "message_bytes": message_len}
+    for mode in ("write", "read"):
+        cur.execute("DELETE FROM Notification")
+        cur.execute("DELETE FROM SentNotifications")
+        conn.commit()
+        latencies = []
+        for _ in range(broadcasts):
+            started = time.perf_counter()
+            cur.execute("INSERT INTO SentNotifications (officer_id, message) VALUES (%s, %s)", (officer_id, message))
+            conn.commit()
+            if mode == "write":
+                # The work the notifications.fan_out task does in a worker
+                placement.fan_out_notification(conn, cur.lastrowid)
+            latencies.append((time.perf_counter() - started) * 1000)
+        latencies.sort()
+        results[mode] = {
+            "broadcast_ms_p50": round(latencies[len(latencies) // 2], 2),
+            "broadcast_ms_max": round(latencies[-1], 2),
+            "notification_bytes": table_bytes(cur, db_name, "Notification"),
+            "sent_notifications_bytes": table_bytes(cur, db_name, "SentNotifications"),
+        }
+
+    cur.close()
+    conn.close()
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare broadcast latency and table size for both notification modes")
+    parser.add_argument("--students", type=int, default=20000)
+    parser.add_argument("--broadcasts", type=int, default=20)
+    parser.add_argument("--message-len", type=int, default=200)
+    args = parser.parse_args()
+    print(json.dumps(run(args.students, args.broadcasts, args.message_len), indent=2))
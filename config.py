@@ -5,4 +5,101 @@ class Config:
     DB_USER = os.getenv("DB_USER","root")
     DB_PASSWORD = os.getenv("DB_PASSWORD","Ecommerce@1")
     DB_NAME = os.getenv("DB_NAME","student_placement_system")
-    JWT_SECRET = os.getenv("JWT_SECRET","change_this_secret")
\ No newline at end of file
+    JWT_SECRET = os.getenv("JWT_SECRET","change_this_secret")
+    # Connection pool (see db_pool.py)
+    DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE","10"))
+    DB_POOL_MAX_OVERFLOW = int(os.getenv("DB_POOL_MAX_OVERFLOW","10"))
+    DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT","5"))
+    DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING","true").lower() in ("true", "1")
+    DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE","1800"))
+    # Students per INSERT ... SELECT chunk when fanning out broadcasts
+    NOTIFICATION_CHUNK_SIZE = int(os.getenv("NOTIFICATION_CHUNK_SIZE","5000"))
+    # "write": a background task copies broadcasts into Notification per student; "read": students read SentNotifications directly
+    NOTIFICATION_MODE = os.getenv("NOTIFICATION_MODE","write")
+    # Verified-token cache (see token_cache.py)
+    AUTH_CACHE_SIZE = int(os.getenv("AUTH_CACHE_SIZE","10000"))
+    AUTH_CACHE_TTL = int(os.getenv("AUTH_CACHE_TTL","300"))
+    # Password hashing pool (see password_pool.py)
+    BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS","12"))
+    BCRYPT_WORKERS = int(os.getenv("BCRYPT_WORKERS","4"))
+    BCRYPT_MAX_QUEUE = int(os.getenv("BCRYPT_MAX_QUEUE","64"))
+    BCRYPT_RETRY_AFTER = int(os.getenv("BCRYPT_RETRY_AFTER","1"))
+    # Resume uploads (see resume_storage.py)
+    RESUME_MAX_BYTES = int(os.getenv("RESUME_MAX_BYTES",str(5 * 1024 * 1024)))
+    RESUME_CHUNK_SIZE = int(os.getenv("RESUME_CHUNK_SIZE",str(64 * 1024)))
+    RESUME_GC_GRACE = int(os.getenv("RESUME_GC_GRACE","3600"))
+    # Skill-match ranking (see matching.py)
+    MATCH_SKILL_WEIGHT = float(os.getenv("MATCH_SKILL_WEIGHT","0.8"))
+    MATCH_CGPA_WEIGHT = float(os.getenv("MATCH_CGPA_WEIGHT","0.2"))
+    MATCH_RELOAD_SECONDS = int(os.getenv("MATCH_RELOAD_SECONDS","600"))
+    # Response cache for hot GET endpoints (see response_cache.py); backend "local" or "redis"
+    RESPONSE_CACHE_ENABLED = os.getenv("RESPONSE_CACHE_ENABLED","true").lower() == "true"
+    # "local" entries are only invalidated by writes in the same process; use "redis" when task
+    # workers (e.g. queued student imports) write data that web processes cache
+    RESPONSE_CACHE_BACKEND = os.getenv("RESPONSE_CACHE_BACKEND","local")
+    RESPONSE_CACHE_URL = os.getenv("RESPONSE_CACHE_URL","redis://localhost:6379/0")
+    RESPONSE_CACHE_ROUTES = {
+        "jobs": {"ttl": int(os.getenv("RESPONSE_CACHE_JOBS_TTL","60")), "maxsize": int(os.getenv("RESPONSE_CACHE_JOBS_SIZE","20000"))},
+        "officer_postings": {"ttl": int(os.getenv("RESPONSE_CACHE_POSTINGS_TTL","300")), "maxsize": int(os.getenv("RESPONSE_CACHE_POSTINGS_SIZE","1000"))},
+        "student_profile": {"ttl": int(os.getenv("RESPONSE_CACHE_PROFILE_TTL","300")), "maxsize": int(os.getenv("RESPONSE_CACHE_PROFILE_SIZE","20000"))},
+        "student_list": {"ttl": int(os.getenv("RESPONSE_CACHE_STUDENTS_TTL","30")), "maxsize": int(os.getenv("RESPONSE_CACHE_STUDENTS_SIZE","2000"))},
+    }
+    # Application status changes (see status_updates.py)
+    STATUS_CHUNK_SIZE = int(os.getenv("STATUS_CHUNK_SIZE","1000"))
+    STATUS_BULK_MAX_IDS = int(os.getenv("STATUS_BULK_MAX_IDS","20000"))
+    # Server-sent event stream (see events.py); backend "local" or "redis"
+    EVENTS_BACKEND = os.getenv("EVENTS_BACKEND","local")
+    EVENTS_URL = os.getenv("EVENTS_URL","redis://localhost:6379/0")
+    EVENTS_REPLAY = int(os.getenv("EVENTS_REPLAY","256"))
+    EVENTS_HEARTBEAT = int(os.getenv("EVENTS_HEARTBEAT","15"))
+    EVENTS_RETRY_MS = int(os.getenv("EVENTS_RETRY_MS","3000"))
+    EVENTS_MAX_SECONDS = int(os.getenv("EVENTS_MAX_SECONDS","3600"))
+    # Open streams per worker process: under gevent/eventlet, and on plain threads (0 = refuse streams there)
+    EVENTS_MAX_STREAMS = int(os.getenv("EVENTS_MAX_STREAMS","1000"))
+    EVENTS_THREADED_STREAMS = int(os.getenv("EVENTS_THREADED_STREAMS","4"))
+    EVENTS_BUSY_RETRY_AFTER = int(os.getenv("EVENTS_BUSY_RETRY_AFTER","30"))
+    # Async serving mode (see asgi.py); both are per worker process
+    ASGI_DB_POOL_SIZE = int(os.getenv("ASGI_DB_POOL_SIZE","20"))
+    ASGI_WSGI_THREADS = int(os.getenv("ASGI_WSGI_THREADS","32"))
+    # Instrumentation (see instrumentation.py); SLOW_QUERY_MS=0 disables the slow-query log
+    METRICS_ENABLED = os.getenv("METRICS_ENABLED","false").lower() == "true"
+    SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS","0"))
+    LOG_LEVEL = os.getenv("LOG_LEVEL","INFO")
+    LOG_FORMAT = os.getenv("LOG_FORMAT","json")
+    # Bulk student import and CSV export (see student_import.py)
+    IMPORT_BATCH_SIZE = int(os.getenv("IMPORT_BATCH_SIZE","500"))
+    IMPORT_MAX_ROWS = int(os.getenv("IMPORT_MAX_ROWS","20000"))
+    IMPORT_MAX_BYTES = int(os.getenv("IMPORT_MAX_BYTES",str(10 * 1024 * 1024)))
+    # Generated initial passwords are kept in the import report at most this long (`tasks purge` clears them)
+    IMPORT_CREDENTIALS_TTL_SECONDS = int(os.getenv("IMPORT_CREDENTIALS_TTL_SECONDS",str(24 * 3600)))
+    # Larger files are imported by a background task (see task_queue.py) instead of in the request
+    IMPORT_SYNC_MAX_ROWS = int(os.getenv("IMPORT_SYNC_MAX_ROWS","50"))
+    BCRYPT_BULK_WORKERS = int(os.getenv("BCRYPT_BULK_WORKERS","2"))
+    EXPORT_FETCH_SIZE = int(os.getenv("EXPORT_FETCH_SIZE","1000"))
+    # Job search index (see job_search.py); rebuilt from the database this often
+    SEARCH_RELOAD_SECONDS = int(os.getenv("SEARCH_RELOAD_SECONDS","600"))
+    # ...and checked for postings written by other processes at most this often
+    SEARCH_CHECK_SECONDS = float(os.getenv("SEARCH_CHECK_SECONDS","2"))
+    # Background resume text extraction and resume search (see resume_text.py)
+    RESUME_EXTRACT_WORKERS = int(os.getenv("RESUME_EXTRACT_WORKERS","2"))
+    RESUME_EXTRACT_TIMEOUT = int(os.getenv("RESUME_EXTRACT_TIMEOUT","60"))
+    RESUME_TEXT_MAX_CHARS = int(os.getenv("RESUME_TEXT_MAX_CHARS","20000"))
+    RESUME_INDEX_RELOAD_SECONDS = int(os.getenv("RESUME_INDEX_RELOAD_SECONDS","3600"))
+    RESUME_INDEX_CHECK_SECONDS = float(os.getenv("RESUME_INDEX_CHECK_SECONDS","2"))
+    # Background task queue (see task_queue.py); mode "worker" (run `flask tasks work`) or "sync" (drained after each request)
+    TASK_QUEUE_MODE = os.getenv("TASK_QUEUE_MODE","worker")
+    TASK_MAX_ATTEMPTS = int(os.getenv("TASK_MAX_ATTEMPTS","5"))
+    TASK_BACKOFF_BASE = float(os.getenv("TASK_BACKOFF_BASE","2"))
+    TASK_BACKOFF_MAX = float(os.getenv("TASK_BACKOFF_MAX","600"))
+    TASK_LEASE_SECONDS = int(os.getenv("TASK_LEASE_SECONDS","300"))
+    TASK_POLL_SECONDS = float(os.getenv("TASK_POLL_SECONDS","1"))
+    TASK_RETENTION_SECONDS = int(os.getenv("TASK_RETENTION_SECONDS",str(7 * 24 * 3600)))
+    # Fingerprinted, precompressed frontend build (see static_assets.py); set ASSET_BUILD_ON_START=false
+    # when `flask build-assets` runs at deploy time instead
+    ASSET_BUILD_DIR = os.getenv("ASSET_BUILD_DIR","frontend_dist")
+    ASSET_BUILD_ON_START = os.getenv("ASSET_BUILD_ON_START","true").lower() == "true"
+    ASSET_BROTLI = os.getenv("ASSET_BROTLI","true").lower() == "true"
+    # Streamed JSON list responses (see json_stream.py); bodies past JSON_SPOOL_BYTES spill to a temp file
+    JSON_FETCH_SIZE = int(os.getenv("JSON_FETCH_SIZE","500"))
+    JSON_SPOOL_BYTES = int(os.getenv("JSON_SPOOL_BYTES",str(1024 * 1024)))
+    JSON_GZIP_LEVEL = int(os.getenv("JSON_GZIP_LEVEL","6"))
\ No newline at end of file
@@ -0,0 +1,44 @@
+-- Optional, run by hand after 001_fanout_on_read:
+--   mysql student_placement_system < database/collapse_broadcast_copies.sql
+-- Replaces the per-student Notification copies of old broadcasts with the broadcast itself
+-- (read state is kept as BroadcastRead markers), so NOTIFICATION_MODE=read serves them.
+--
+-- Notification records neither its sender nor its broadcast, so copies are matched by text:
+-- a copy is a Notification with the broadcast's message written after it and before the next
+-- broadcast with the same text (at most an hour later), one per student. Broadcasts whose text
+-- another officer sent within that window are skipped, because their copies cannot be told apart.
+USE student_placement_system;
+
+CREATE TEMPORARY TABLE broadcast_windows AS
+    SELECT sn.sent_id, sn.message, sn.created_at AS starts_at,
+           LEAST(sn.created_at + INTERVAL 1 HOUR,
+                 COALESCE((SELECT MIN(later.created_at) FROM SentNotifications later
+                           WHERE later.message = sn.message AND later.created_at > sn.created_at),
+                          sn.created_at + INTERVAL 1 HOUR)) AS ends_at
+    FROM SentNotifications sn
+    WHERE sn.fanned_out = TRUE
+      AND NOT EXISTS (SELECT 1 FROM SentNotifications other
+                      WHERE other.message = sn.message AND other.officer_id <> sn.officer_id
+                        AND other.created_at BETWEEN sn.created_at - INTERVAL 1 HOUR AND sn.created_at + INTERVAL 1 HOUR);
+
+CREATE TEMPORARY TABLE broadcast_copies AS
+    SELECT n.notification_id, n.student_id, n.is_read, bw.sent_id
+    FROM broadcast_windows bw
+    JOIN Notification n ON n.message = bw.message
+        AND n.created_at >= bw.starts_at AND n.created_at < bw.ends_at
+    WHERE n.notification_id = (SELECT MIN(first.notification_id) FROM Notification first
+                               WHERE first.student_id = n.student_id AND first.message = bw.message
+                                 AND first.created_at >= bw.starts_at AND first.created_at < bw.ends_at);
+
+START TRANSACTION;
+-- Carry read state over as read markers
+INSERT IGNORE INTO BroadcastRead (student_id, sent_id)
+    SELECT student_id, sent_id FROM broadcast_copies WHERE is_read = TRUE;
+DELETE n FROM Notification n JOIN broadcast_copies bc ON bc.notification_id = n.notification_id;
+UPDATE SentNotifications sn
+    JOIN (SELECT DISTINCT sent_id FROM broadcast_copies) bc ON bc.sent_id = sn.sent_id
+    SET sn.fanned_out = FALSE;
+COMMIT;
+
+DROP TEMPORARY TABLE broadcast_copies;
+DROP TEMPORARY TABLE broadcast_windows;
@@ -0,0 +1,22 @@
+-- Fan-out-on-read notifications
+-- Run once against an existing database before switching NOTIFICATION_MODE=read.
+USE student_placement_system;
+
+-- Existing broadcasts were all copied into Notification, so they default to fanned_out = TRUE
+ALTER TABLE SentNotifications
+    ADD COLUMN target_branches VARCHAR(255) AFTER message,
+    ADD COLUMN target_min_cgpa DECIMAL(3,2) AFTER target_branches,
+    ADD COLUMN fanned_out BOOLEAN NOT NULL DEFAULT TRUE AFTER target_min_cgpa;
+ALTER TABLE SentNotifications ALTER COLUMN fanned_out SET DEFAULT FALSE;
+
+CREATE TABLE IF NOT EXISTS BroadcastRead (
+    student_id INT NOT NULL,
+    sent_id INT NOT NULL,
+    read_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (student_id, sent_id),
+    FOREIGN KEY (student_id) REFERENCES students(student_id) ON DELETE CASCADE,
+    FOREIGN KEY (sent_id) REFERENCES SentNotifications(sent_id) ON DELETE CASCADE
+);
+
+-- Existing per-student copies stay as they are; database/collapse_broadcast_copies.sql folds
+-- them into their broadcasts, for deployments that want to (it is not run by the migration runner).
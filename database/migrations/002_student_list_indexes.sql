@@ -0,0 +1,12 @@
+-- Indexes behind the paginated, filtered /api/student/list
+USE student_placement_system;
+
+ALTER TABLE students
+    ADD INDEX idx_students_created (created_at),
+    ADD INDEX idx_students_branch_cgpa (branch, cgpa),
+    ADD INDEX idx_students_cgpa (cgpa),
+    ADD INDEX idx_students_name (name),
+    ADD INDEX idx_students_roll (university_roll);
+
+ALTER TABLE StudentSkill
+    ADD INDEX idx_studentskill_skill (skill_id, student_id);
@@ -0,0 +1,16 @@
+-- Officer-scoped, incrementally synced /api/officer/applications
+USE student_placement_system;
+
+ALTER TABLE Application
+    ADD COLUMN updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP AFTER applied_on,
+    ADD INDEX idx_application_job_applied (job_id, applied_on),
+    ADD INDEX idx_application_updated (updated_at);
+UPDATE Application SET updated_at = applied_on;
+
+CREATE TABLE IF NOT EXISTS DeletedApplication (
+    application_id INT PRIMARY KEY,
+    job_id INT NOT NULL,
+    deleted_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    INDEX idx_deleted_application_job (job_id, deleted_at),
+    FOREIGN KEY (job_id) REFERENCES JobPosting(job_id) ON DELETE CASCADE
+);
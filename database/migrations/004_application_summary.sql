@@ -0,0 +1,23 @@
+-- Summary table behind /api/officer/reports
+USE student_placement_system;
+
+CREATE TABLE IF NOT EXISTS ApplicationSummary (
+    job_id INT NOT NULL,
+    branch VARCHAR(50) NOT NULL,
+    month DATE NOT NULL,
+    status ENUM('Applied', 'Shortlisted', 'Selected', 'Rejected') NOT NULL,
+    app_count INT NOT NULL DEFAULT 0,
+    PRIMARY KEY (job_id, branch, month, status),
+    INDEX idx_summary_branch (branch, month),
+    INDEX idx_summary_month (month),
+    FOREIGN KEY (job_id) REFERENCES JobPosting(job_id) ON DELETE CASCADE
+);
+
+-- Backfill from existing applications (same as `flask --app app rebuild-reports`)
+DELETE FROM ApplicationSummary;
+INSERT INTO ApplicationSummary (job_id, branch, month, status, app_count)
+SELECT a.job_id, s.branch, DATE(a.applied_on - INTERVAL DAYOFMONTH(a.applied_on) - 1 DAY) AS month,
+       a.status, COUNT(*)
+FROM Application a
+JOIN students s ON s.student_id = a.student_id
+GROUP BY a.job_id, s.branch, month, a.status;
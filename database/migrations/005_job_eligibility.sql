@@ -0,0 +1,17 @@
+-- Normalised branch eligibility behind GET /api/jobs
+-- After running this, populate the index with: flask --app app rebuild-eligibility
+USE student_placement_system;
+
+ALTER TABLE JobPosting
+    ADD COLUMN updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP AFTER created_at,
+    ADD INDEX idx_jobposting_updated (updated_at);
+
+CREATE TABLE IF NOT EXISTS JobEligibility (
+    job_id INT NOT NULL,
+    branch VARCHAR(50) NOT NULL,
+    min_cgpa DECIMAL(3,2) NOT NULL,
+    deadline DATE NOT NULL,
+    PRIMARY KEY (job_id, branch),
+    INDEX idx_eligibility_lookup (branch, min_cgpa, deadline, job_id),
+    FOREIGN KEY (job_id) REFERENCES JobPosting(job_id) ON DELETE CASCADE
+);
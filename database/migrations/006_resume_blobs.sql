@@ -0,0 +1,14 @@
+-- Content-addressed resume storage
+-- After running this, move existing files with: flask --app app migrate-uploads
+-- Deployed databases already carry Application.resume_path (apply_job writes it);
+-- only databases built from the old schema.sql need:
+--   ALTER TABLE Application ADD COLUMN resume_path VARCHAR(255) AFTER status;
+USE student_placement_system;
+
+CREATE TABLE IF NOT EXISTS ResumeBlob (
+    sha256 CHAR(64) PRIMARY KEY,
+    size_bytes INT NOT NULL,
+    content_type VARCHAR(100) NOT NULL,
+    ref_count INT NOT NULL DEFAULT 0,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
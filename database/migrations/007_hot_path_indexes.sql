@@ -0,0 +1,23 @@
+-- Indexes behind the per-student, per-officer and per-job routes
+-- (bench/explain_check.py EXPLAINs each route's SQL against a seeded database)
+-- students(university_roll) is already covered by idx_students_roll from 002.
+USE student_placement_system;
+
+-- GET /api/student/notifications: WHERE student_id = ? ORDER BY created_at DESC, notification_id DESC
+ALTER TABLE Notification
+    ADD INDEX idx_notification_student_created (student_id, created_at);
+
+-- Officer application views filtered by job and status; GET /api/student/applications
+ALTER TABLE Application
+    ADD INDEX idx_application_job_status (job_id, status),
+    ADD INDEX idx_application_student_applied (student_id, applied_on);
+
+-- Open, not-yet-closed postings newest first; GET /api/officer/postings
+ALTER TABLE JobPosting
+    ADD INDEX idx_jobposting_status_deadline (status, deadline, created_at),
+    ADD INDEX idx_jobposting_officer_created (officer_id, created_at);
+
+-- GET /api/officer/notifications and fan-out-on-read broadcasts in GET /api/student/notifications
+ALTER TABLE SentNotifications
+    ADD INDEX idx_sent_officer_created (officer_id, created_at),
+    ADD INDEX idx_sent_fanout_created (fanned_out, created_at);
@@ -0,0 +1,12 @@
+-- Extracted resume text behind GET /api/officer/resumes/search
+-- After running this, extract existing resumes with: flask --app app extract-resumes
+USE student_placement_system;
+
+CREATE TABLE IF NOT EXISTS ResumeText (
+    sha256 CHAR(64) PRIMARY KEY,
+    status ENUM('done', 'failed') NOT NULL,
+    text MEDIUMTEXT,
+    error VARCHAR(255),
+    extracted_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (sha256) REFERENCES ResumeBlob(sha256) ON DELETE CASCADE
+);
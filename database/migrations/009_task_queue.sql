@@ -0,0 +1,23 @@
+-- Durable background task queue (task_queue.py), worked by `flask --app app tasks work`.
+-- Write-mode broadcasts are now fanned out by a task that checkpoints in fanout_through.
+USE student_placement_system;
+
+CREATE TABLE IF NOT EXISTS TaskQueue (
+    task_id BIGINT AUTO_INCREMENT PRIMARY KEY,
+    kind VARCHAR(64) NOT NULL,
+    payload JSON NOT NULL,
+    idempotency_key VARCHAR(191),
+    status ENUM('queued', 'running', 'done', 'dead') NOT NULL DEFAULT 'queued',
+    attempts INT NOT NULL DEFAULT 0,
+    run_after DATETIME(3) NOT NULL,
+    locked_by VARCHAR(100),
+    locked_until DATETIME(3),
+    last_error VARCHAR(1000),
+    created_at DATETIME(3) NOT NULL DEFAULT CURRENT_TIMESTAMP(3),
+    finished_at DATETIME(3),
+    UNIQUE KEY uq_task_idempotency (idempotency_key),
+    INDEX idx_task_due (status, run_after)
+);
+
+ALTER TABLE SentNotifications
+    ADD COLUMN fanout_through INT NOT NULL DEFAULT 0 AFTER fanned_out;
@@ -0,0 +1,17 @@
+-- Queued bulk student imports (POST /api/officer/students/import above IMPORT_SYNC_MAX_ROWS rows),
+-- run by the "students.import" task. report is checkpointed with every committed batch.
+USE student_placement_system;
+
+CREATE TABLE IF NOT EXISTS StudentImport (
+    import_id INT AUTO_INCREMENT PRIMARY KEY,
+    officer_id INT NOT NULL,
+    task_id BIGINT,
+    status ENUM('queued', 'running', 'done') NOT NULL DEFAULT 'queued',
+    total_rows INT NOT NULL,
+    source LONGBLOB,
+    last_line INT NOT NULL DEFAULT 0,
+    report JSON,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    finished_at TIMESTAMP NULL,
+    FOREIGN KEY (officer_id) REFERENCES PlacementOfficer(officer_id) ON DELETE CASCADE
+);
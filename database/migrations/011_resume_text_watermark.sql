@@ -0,0 +1,8 @@
+-- ResumeText.updated_at moves whenever a blob's text, or the set of students using it, changes.
+-- Every web process's resume search polls it, so text extracted by a task worker is searchable
+-- within RESUME_INDEX_CHECK_SECONDS instead of after the next full index reload.
+USE student_placement_system;
+
+ALTER TABLE ResumeText
+    ADD COLUMN updated_at TIMESTAMP(3) NOT NULL DEFAULT CURRENT_TIMESTAMP(3) AFTER extracted_at,
+    ADD INDEX idx_resume_text_updated (updated_at);
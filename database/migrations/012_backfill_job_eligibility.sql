@@ -0,0 +1,29 @@
+-- Backfill JobEligibility for postings created before 005_job_eligibility. Until this runs,
+-- apply_job finds no eligibility rows for them and rejects every application.
+-- Same parsing as parse_branch_eligibility() in app.py: names separated by , / ; or |,
+-- trimmed; no names or an "All" means every branch ('*'). Postings that already have rows
+-- (written by the app or by `flask rebuild-eligibility`) are left alone, so this is safe to re-run.
+USE student_placement_system;
+
+INSERT IGNORE INTO JobEligibility (job_id, branch, min_cgpa, deadline)
+WITH RECURSIVE split (job_id, branch, rest) AS (
+    SELECT job_id, CAST('' AS CHAR(255)),
+           CAST(CONCAT(REPLACE(REPLACE(REPLACE(COALESCE(branch_eligibility, ''), '/', ','), '|', ','),
+                               CHAR(59 USING utf8mb4), ','), ',') AS CHAR(2000))
+    FROM JobPosting
+    WHERE job_id NOT IN (SELECT job_id FROM JobEligibility)
+    UNION ALL
+    SELECT job_id, TRIM(SUBSTRING_INDEX(rest, ',', 1)), SUBSTRING(rest, LOCATE(',', rest) + 1)
+    FROM split
+    WHERE rest <> ''
+),
+names AS (
+    SELECT job_id, branch FROM split WHERE branch <> ''
+)
+SELECT jp.job_id,
+       IF(MAX(n.branch IS NULL OR LOWER(n.branch) = 'all') OVER (PARTITION BY jp.job_id) = 1, '*', n.branch),
+       jp.min_cgpa, jp.deadline
+FROM JobPosting jp
+LEFT JOIN names n ON n.job_id = jp.job_id
+WHERE jp.deadline IS NOT NULL
+  AND jp.job_id NOT IN (SELECT job_id FROM JobEligibility);
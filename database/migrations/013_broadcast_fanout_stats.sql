@@ -0,0 +1,8 @@
+-- Cost of each write-mode broadcast fan-out, shown in the officer's notification list.
+-- Both counters grow with every committed chunk, so retries add to them rather than restart.
+USE student_placement_system;
+
+ALTER TABLE SentNotifications
+    ADD COLUMN fanout_rows INT NOT NULL DEFAULT 0 AFTER fanout_through,
+    ADD COLUMN fanout_ms INT NOT NULL DEFAULT 0 AFTER fanout_rows,
+    ADD COLUMN fanned_out_at TIMESTAMP NULL AFTER fanout_ms;
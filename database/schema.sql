@@ -12,10 +12,15 @@ CREATE TABLE students (
     password_hash VARCHAR(255) NOT NULL,
     branch VARCHAR(50) NOT NULL,
     cgpa DECIMAL(3,2) NOT NULL,
-    resume_path VARCHAR(255),
+    resume_path VARCHAR(255), -- "blobs/<sha256>" reference into the resume blob store
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     university_roll INT NOT NULL,
-    PRIMARY KEY (student_id)
+    PRIMARY KEY (student_id),
+    INDEX idx_students_created (created_at),
+    INDEX idx_students_branch_cgpa (branch, cgpa),
+    INDEX idx_students_cgpa (cgpa),
+    INDEX idx_students_name (name),
+    INDEX idx_students_roll (university_roll)
 );
 
 CREATE TABLE Skill (
@@ -27,6 +32,7 @@ CREATE TABLE StudentSkill (
     student_id INT NOT NULL,
     skill_id INT NOT NULL,
     PRIMARY KEY (student_id, skill_id),
+    INDEX idx_studentskill_skill (skill_id, student_id),
     FOREIGN KEY (student_id) REFERENCES students(student_id) ON DELETE CASCADE,
     FOREIGN KEY (skill_id) REFERENCES Skill(skill_id) ON DELETE CASCADE
 );
@@ -50,9 +56,24 @@ CREATE TABLE JobPosting (
     deadline DATE NOT NULL,
     status ENUM('Open', 'Closed') DEFAULT 'Open',
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    INDEX idx_jobposting_updated (updated_at),
+    INDEX idx_jobposting_status_deadline (status, deadline, created_at),
+    INDEX idx_jobposting_officer_created (officer_id, created_at),
     FOREIGN KEY (officer_id) REFERENCES PlacementOfficer(officer_id) ON DELETE CASCADE
 );
 
+-- Eligibility index: one row per (job, eligible branch); branch '*' means every branch
+CREATE TABLE JobEligibility (
+    job_id INT NOT NULL,
+    branch VARCHAR(50) NOT NULL,
+    min_cgpa DECIMAL(3,2) NOT NULL,
+    deadline DATE NOT NULL,
+    PRIMARY KEY (job_id, branch),
+    INDEX idx_eligibility_lookup (branch, min_cgpa, deadline, job_id),
+    FOREIGN KEY (job_id) REFERENCES JobPosting(job_id) ON DELETE CASCADE
+);
+
 CREATE TABLE JobSkill (
     job_id INT NOT NULL,
     skill_id INT NOT NULL,
@@ -66,10 +87,25 @@ CREATE TABLE Application (
     student_id INT NOT NULL,
     job_id INT NOT NULL,
     status ENUM('Applied', 'Shortlisted', 'Selected', 'Rejected') DEFAULT 'Applied',
+    resume_path VARCHAR(255), -- "blobs/<sha256>" reference into the resume blob store
     applied_on TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
     FOREIGN KEY (student_id) REFERENCES students(student_id) ON DELETE CASCADE,
     FOREIGN KEY (job_id) REFERENCES JobPosting(job_id) ON DELETE CASCADE,
-    UNIQUE (student_id, job_id) -- Prevent duplicate applications
+    UNIQUE (student_id, job_id), -- Prevent duplicate applications
+    INDEX idx_application_job_applied (job_id, applied_on),
+    INDEX idx_application_updated (updated_at),
+    INDEX idx_application_job_status (job_id, status),
+    INDEX idx_application_student_applied (student_id, applied_on)
+);
+
+-- Tombstones for withdrawn applications, read by incremental sync
+CREATE TABLE DeletedApplication (
+    application_id INT PRIMARY KEY,
+    job_id INT NOT NULL,
+    deleted_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    INDEX idx_deleted_application_job (job_id, deleted_at),
+    FOREIGN KEY (job_id) REFERENCES JobPosting(job_id) ON DELETE CASCADE
 );
 
 CREATE TABLE Notification (
@@ -78,6 +114,7 @@ CREATE TABLE Notification (
     message TEXT NOT NULL,
     is_read BOOLEAN DEFAULT FALSE,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    INDEX idx_notification_student_created (student_id, created_at),
     FOREIGN KEY (student_id) REFERENCES students(student_id) ON DELETE CASCADE
 );
 
@@ -85,6 +122,117 @@ CREATE TABLE SentNotifications (
     sent_id INT AUTO_INCREMENT PRIMARY KEY,
     officer_id INT NOT NULL,
     message TEXT NOT NULL,
+    target_branches VARCHAR(255), -- comma-separated; NULL means every branch
+    target_min_cgpa DECIMAL(3,2),
+    fanned_out BOOLEAN NOT NULL DEFAULT FALSE, -- TRUE when copied into Notification per student
+    fanout_through INT NOT NULL DEFAULT 0, -- students up to this id already have their copy
+    fanout_rows INT NOT NULL DEFAULT 0, -- Notification rows copied so far
+    fanout_ms INT NOT NULL DEFAULT 0, -- time spent copying them
+    fanned_out_at TIMESTAMP NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    INDEX idx_sent_officer_created (officer_id, created_at),
+    INDEX idx_sent_fanout_created (fanned_out, created_at),
+    FOREIGN KEY (officer_id) REFERENCES PlacementOfficer(officer_id) ON DELETE CASCADE
+);
+
+-- Read markers for broadcasts delivered fan-out-on-read
+CREATE TABLE BroadcastRead (
+    student_id INT NOT NULL,
+    sent_id INT NOT NULL,
+    read_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (student_id, sent_id),
+    FOREIGN KEY (student_id) REFERENCES students(student_id) ON DELETE CASCADE,
+    FOREIGN KEY (sent_id) REFERENCES SentNotifications(sent_id) ON DELETE CASCADE
+);
+
+-- Application counts per (job, branch, month applied, status), kept in step by
+-- every write to Application; rebuild with `flask --app app rebuild-reports`
+CREATE TABLE ApplicationSummary (
+    job_id INT NOT NULL,
+    branch VARCHAR(50) NOT NULL,
+    month DATE NOT NULL,
+    status ENUM('Applied', 'Shortlisted', 'Selected', 'Rejected') NOT NULL,
+    app_count INT NOT NULL DEFAULT 0,
+    PRIMARY KEY (job_id, branch, month, status),
+    INDEX idx_summary_branch (branch, month),
+    INDEX idx_summary_month (month),
+    FOREIGN KEY (job_id) REFERENCES JobPosting(job_id) ON DELETE CASCADE
+);
+
+-- Deduplicated resume files, one row per distinct content
+CREATE TABLE ResumeBlob (
+    sha256 CHAR(64) PRIMARY KEY,
+    size_bytes INT NOT NULL,
+    content_type VARCHAR(100) NOT NULL,
+    ref_count INT NOT NULL DEFAULT 0,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Text extracted from each resume blob in the background (resume_text.py)
+CREATE TABLE ResumeText (
+    sha256 CHAR(64) PRIMARY KEY,
+    status ENUM('done', 'failed') NOT NULL,
+    text MEDIUMTEXT,
+    error VARCHAR(255),
+    extracted_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    -- Moves when the text or its users change; resume search indexes poll it
+    updated_at TIMESTAMP(3) NOT NULL DEFAULT CURRENT_TIMESTAMP(3),
+    INDEX idx_resume_text_updated (updated_at),
+    FOREIGN KEY (sha256) REFERENCES ResumeBlob(sha256) ON DELETE CASCADE
+);
+
+-- Durable background tasks (task_queue.py); status 'dead' is the dead-letter list
+CREATE TABLE TaskQueue (
+    task_id BIGINT AUTO_INCREMENT PRIMARY KEY,
+    kind VARCHAR(64) NOT NULL,
+    payload JSON NOT NULL,
+    idempotency_key VARCHAR(191),
+    status ENUM('queued', 'running', 'done', 'dead') NOT NULL DEFAULT 'queued',
+    attempts INT NOT NULL DEFAULT 0,
+    run_after DATETIME(3) NOT NULL,
+    locked_by VARCHAR(100),
+    locked_until DATETIME(3),
+    last_error VARCHAR(1000),
+    created_at DATETIME(3) NOT NULL DEFAULT CURRENT_TIMESTAMP(3),
+    finished_at DATETIME(3),
+    UNIQUE KEY uq_task_idempotency (idempotency_key),
+    INDEX idx_task_due (status, run_after)
+);
+
+-- Queued bulk student imports (student_import.py); report is checkpointed per committed batch
+CREATE TABLE StudentImport (
+    import_id INT AUTO_INCREMENT PRIMARY KEY,
+    officer_id INT NOT NULL,
+    task_id BIGINT,
+    status ENUM('queued', 'running', 'done') NOT NULL DEFAULT 'queued',
+    total_rows INT NOT NULL,
+    source LONGBLOB,
+    last_line INT NOT NULL DEFAULT 0,
+    report JSON,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    finished_at TIMESTAMP NULL,
     FOREIGN KEY (officer_id) REFERENCES PlacementOfficer(officer_id) ON DELETE CASCADE
 );
+
+-- Versions of database/migrations already reflected above; `flask --app app migrate`
+-- applies only newer ones (checksum NULL: recorded by this file, not by the runner)
+CREATE TABLE SchemaMigration (
+    version INT PRIMARY KEY,
+    name VARCHAR(200) NOT NULL,
+    checksum CHAR(64),
+    applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+INSERT INTO SchemaMigration (version, name) VALUES
+    (1, 'fanout_on_read'),
+    (2, 'student_list_indexes'),
+    (3, 'application_sync'),
+    (4, 'application_summary'),
+    (5, 'job_eligibility'),
+    (6, 'resume_blobs'),
+    (7, 'hot_path_indexes'),
+    (8, 'resume_text'),
+    (9, 'task_queue'),
+    (10, 'student_import'),
+    (11, 'resume_text_watermark'),
+    (12, 'backfill_job_eligibility'),
+    (13, 'broadcast_fanout_stats');
@@ -0,0 +1,181 @@
+# db_pool.py - bounded MySQL connection pool used by app.get_db()
+import threading
+import time
+from collections import deque
+
+import mysql.connector
+
+
+class PoolTimeout(Exception):
+    """Raised when no connection could be checked out within the timeout."""
+
+
+class PooledConnection:
+    """Wraps a raw connection so that close() returns it to the pool.
+
+    Every other attribute is forwarded to the underlying mysql.connector
+    connection, so handlers keep using cursor()/commit()/rollback() as before.
+    """
+
+    def __init__(self, pool, raw, created_at):
+        self._pool = pool
+        self._raw = raw
+        self._created_at = created_at
+
+    def __getattr__(self, name):
+        if self._raw is None:
+            raise AttributeError(f"connection already returned to pool ({name})")
+        return getattr(self._raw, name)
+
+    def close(self):
+        if self._raw is not None:
+            raw, self._raw = self._raw, None
+            self._pool._release(raw, self._created_at)
+
+
+class ConnectionPool:
+    def __init__(self, db_config, size=10, max_overflow=10, timeout=5.0, pre_ping=True, recycle=1800):
+        self.db_config = dict(db_config)
+        self.size = size
+        self.max_overflow = max_overflow
+        self.timeout = timeout
+        self.pre_ping = pre_ping
+        self.recycle = recycle
+
+        self._idle = deque()  # (raw, created_at)
+        self._cond = threading.Condition()
+        self._open = 0
+        self._in_use = 0
+        self._waiting = 0
+        self._stats = {
+            "checkouts": 0,
+            "timeouts": 0,
+            "created": 0,
+            "recycled": 0,
+            "ping_failures": 0,
+            "wait_time_total": 0.0,
+            "wait_time_max": 0.0,
+        }
+
+    # ---------------------------
+    # Checkout / return
+    # ---------------------------
+    def acquire(self, timeout=None):
+        timeout = self.timeout if timeout is None else timeout
+        started = time.monotonic()
+        deadline = started + timeout
+        with self._cond:
+            while True:
+                if self._idle:
+                    raw, created_at = self._idle.pop()
+                    break
+                if self._open < self.size + self.max_overflow:
+                    raw, created_at = None, None
+                    self._open += 1
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._stats["timeouts"] += 1
+                    raise PoolTimeout(f"no database connection available after {timeout:.1f}s")
+                self._waiting += 1
+                try:
+                    self._cond.wait(remaining)
+                finally:
+                    self._waiting -= 1
+            self._in_use += 1
+
+        try:
+            if raw is not None:
+                raw, created_at = self._validate(raw, created_at)
+            if raw is None:
+                raw, created_at = self._connect(), time.monotonic()
+        except Exception:
+            with self._cond:
+                self._open -= 1
+                self._in_use -= 1
+                self._cond.notify()
+            raise
+
+        waited = time.monotonic() - started
+        with self._cond:
+            self._stats["checkouts"] += 1
+            self._stats["wait_time_total"] += waited
+            self._stats["wait_time_max"] = max(self._stats["wait_time_max"], waited)
+        return PooledConnection(self, raw, created_at)
+
+    def _release(self, raw, created_at):
+        try:
+            # Never hand a half-finished transaction to the next borrower
+            if raw.in_transaction:
+                raw.rollback()
+            healthy = True
+        except Exception:
+            healthy = False
+
+        with self._cond:
+            self._in_use -= 1
+            if healthy and len(self._idle) < self.size:
+                self._idle.append((raw, created_at))
+                self._cond.notify()
+                return
+            self._open -= 1
+            self._cond.notify()
+        self._close_quietly(raw)
+
+    def _validate(self, raw, created_at):
+        """Returns (raw, created_at), or (None, None) if the connection must be replaced."""
+        if self.recycle and time.monotonic() - created_at > self.recycle:
+            self._stats["recycled"] += 1
+            self._close_quietly(raw)
+            return None, None
+        if self.pre_ping:
+            try:
+                raw.ping(reconnect=False)
+            except Exception:
+                self._stats["ping_failures"] += 1
+                self._close_quietly(raw)
+                return None, None
+        return raw, created_at
+
+    def _connect(self):
+        raw = mysql.connector.connect(**self.db_config)
+        self._stats["created"] += 1
+        return raw
+
+    @staticmethod
+    def _close_quietly(raw):
+        try:
+            raw.close()
+        except Exception:
+            pass
+
+    # ---------------------------
+    # Housekeeping
+    # ---------------------------
+    def dispose(self):
+        """Close all idle connections (checked-out ones are closed on return)."""
+        with self._cond:
+            idle, self._idle = list(self._idle), deque()
+            self._open -= len(idle)
+        for raw, _ in idle:
+            self._close_quietly(raw)
+
+    def metrics(self):
+        with self._cond:
+            checkouts = self._stats["checkouts"]
+            return {
+                "size": self.size,
+                "max_overflow": self.max_overflow,
+                "open": self._open,
+                "idle": len(self._idle),
+                "in_use": self._in_use,
+                "waiting": self._waiting,
+                "overflow": max(0, self._open - self.size),
+                "checkouts": checkouts,
+                "timeouts": self._stats["timeouts"],
+                "created": self._stats["created"],
+                "recycled": self._stats["recycled"],
+                "ping_failures": self._stats["ping_failures"],
+                "wait_time_avg_ms": round(self._stats["wait_time_total"] / checkouts * 1000, 3) if checkouts else 0.0,
+                "wait_time_max_ms": round(self._stats["wait_time_max"] * 1000, 3),
+            }
@@ -0,0 +1,268 @@
+# events.py - pub/sub hub behind the server-sent event stream
+#
+# Publishers call hub.publish(channel, event, data) after their transaction
+# commits. A stream calls hub.read(positions, timeout) in a loop, where
+# `positions` maps each channel it follows to the last position it delivered
+# (None = start from now). Positions are opaque strings the client gets back
+# through Last-Event-ID, so a reconnect resumes where it stopped; if the hub
+# can no longer replay that far back, read() reports resync=True and the client
+# should refetch its lists.
+#
+# read() blocks the calling thread, so the WSGI app must serve streams from a
+# cooperative worker (gunicorn -k gevent, which needs the gevent package) or
+# the ASGI mode in asgi.py, whose read_async() is the same call on the event
+# loop. StreamSlots enforces this per worker process: under plain OS threads
+# only a handful of streams are admitted and the rest get a 503, so open
+# dashboards cannot take every thread from the other routes.
+import asyncio
+import json
+import re
+import sys
+import threading
+import time
+import uuid
+from collections import deque
+
+from instrumentation import logger
+
+_STREAM_ID_RE = re.compile(r"^\d+-\d+$")
+
+
+class LocalHub:
+    """In-process hub: one bounded replay buffer per channel, one sequence per process."""
+
+    def __init__(self, replay=256):
+        self.replay = replay
+        self._epoch = uuid.uuid4().hex[:8]
+        self._seq = 0
+        self._channels = {}
+        self._cond = threading.Condition()
+        self._async_waiters = set()
+
+    def _position(self, seq):
+        return f"{self._epoch}-{seq}"
+
+    def _parse(self, position):
+        """Sequence number for a position from this process, else None."""
+        epoch, _, seq = (position or "").partition("-")
+        return int(seq) if epoch == self._epoch and seq.isdigit() else None
+
+    def publish(self, channel, event, data):
+        with self._cond:
+            self._seq += 1
+            buffer = self._channels.setdefault(channel, deque(maxlen=self.replay))
+            buffer.append((self._seq, event, data))
+            self._cond.notify_all()
+            for wake in self._async_waiters:
+                wake()
+            return self._position(self._seq)
+
+    # The helpers below expect self._cond to be held
+    def _start(self, positions):
+        """Sequence to read after for each channel, and whether replay fell short."""
+        resync = False
+        after = {}
+        for channel, position in positions.items():
+            seq = self._parse(position)
+            buffer = self._channels.get(channel)
+            if seq is None or seq > self._seq:
+                resync = resync or position is not None
+                seq = self._seq
+            elif buffer and len(buffer) == buffer.maxlen and buffer[0][0] > seq + 1:
+                resync = True
+            after[channel] = seq
+        return after, resync
+
+    def _collect(self, after):
+        events = [
+            (channel, self._position(seq), event, data)
+            for channel in after
+            for seq, event, data in self._channels.get(channel, ())
+            if seq > after[channel]
+        ]
+        events.sort(key=lambda e: self._parse(e[1]))
+        return events
+
+    def _advance(self, after, events):
+        return {channel: self._position(max([seq] + [self._parse(e[1]) for e in events if e[0] == channel]))
+                for channel, seq in after.items()}
+
+    def read(self, positions, timeout):
+        """Return (events, positions, resync); events are (channel, position, event, data)."""
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            after, resync = self._start(positions)
+            while True:
+                events = self._collect(after)
+                remaining = deadline - time.monotonic()
+                if events or resync or remaining <= 0:
+                    return events, self._advance(after, events), resync
+                self._cond.wait(remaining)
+
+    async def read_async(self, positions, timeout):
+        """read() for an event loop; publishers on other threads wake it thread-safely."""
+        loop = asyncio.get_running_loop()
+        waiter = asyncio.Event()
+
+        def wake():
+            try:
+                loop.call_soon_threadsafe(waiter.set)
+            except RuntimeError:
+                pass  # loop already closed
+
+        deadline = loop.time() + timeout
+        with self._cond:
+            after, resync = self._start(positions)
+            self._async_waiters.add(wake)
+        try:
+            while True:
+                with self._cond:
+                    events = self._collect(after)
+                    if events or resync or loop.time() >= deadline:
+                        return events, self._advance(after, events), resync
+                    # Cleared under the lock, so a publish after this check still sets it
+                    waiter.clear()
+                try:
+                    await asyncio.wait_for(waiter.wait(), deadline - loop.time())
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            with self._cond:
+                self._async_waiters.discard(wake)
+
+    def stats(self):
+        with self._cond:
+            return {"backend": "local", "channels": len(self._channels), "published": self._seq}
+
+
+class RedisHub:
+    """Shared hub on Redis streams (one capped stream per channel); needs the `redis` package.
+
+    Stream entry ids are the positions, so XREAD resumes from Last-Event-ID directly.
+    """
+
+    def __init__(self, url, replay=256, prefix="placement:events:"):
+        try:
+            import redis
+        except ImportError as e:
+            raise RuntimeError("EVENTS_BACKEND=redis needs the 'redis' package installed") from e
+        self._redis = redis.Redis.from_url(url, decode_responses=True)
+        self._url = url
+        self._async_redis = None
+        self.replay = replay
+        self._prefix = prefix
+
+    def publish(self, channel, event, data):
+        return self._redis.xadd(self._prefix + channel, {"event": event, "data": json.dumps(data, default=str)},
+                                maxlen=self.replay, approximate=True)
+
+    def _start(self, position, first, last, length):
+        """Stream id to read after, given the stream's first/last entries; and whether to resync."""
+        if position is not None and not _STREAM_ID_RE.match(position):
+            return (last[0][0] if last else "0-0"), True
+        if position is None:
+            return (last[0][0] if last else "0-0"), False
+        return position, bool(first and _stream_id(first[0][0]) > _stream_id(position) and length >= self.replay)
+
+    def _finish(self, positions, streams, result):
+        new_positions = {channel: streams[self._prefix + channel] for channel in positions}
+        events = []
+        for key, entries in result or []:
+            channel = key[len(self._prefix):]
+            for entry_id, fields in entries:
+                events.append((channel, entry_id, fields["event"], json.loads(fields["data"])))
+                new_positions[channel] = entry_id
+        events.sort(key=lambda e: _stream_id(e[1]))
+        return events, new_positions
+
+    def read(self, positions, timeout):
+        resync = False
+        streams = {}
+        for channel, position in positions.items():
+            key = self._prefix + channel
+            streams[key], stale = self._start(position, self._redis.xrange(key, count=1),
+                                              self._redis.xrevrange(key, count=1), self._redis.xlen(key))
+            resync = resync or stale
+        if resync:
+            return [], self._finish(positions, streams, None)[1], True
+        result = self._redis.xread(streams, block=max(1, int(timeout * 1000)))
+        return (*self._finish(positions, streams, result), False)
+
+    async def read_async(self, positions, timeout):
+        if self._async_redis is None:
+            import redis.asyncio
+            self._async_redis = redis.asyncio.Redis.from_url(self._url, decode_responses=True)
+        client = self._async_redis
+        resync = False
+        streams = {}
+        for channel, position in positions.items():
+            key = self._prefix + channel
+            streams[key], stale = self._start(position, await client.xrange(key, count=1),
+                                              await client.xrevrange(key, count=1), await client.xlen(key))
+            resync = resync or stale
+        if resync:
+            return [], self._finish(positions, streams, None)[1], True
+        result = await client.xread(streams, block=max(1, int(timeout * 1000)))
+        return (*self._finish(positions, streams, result), False)
+
+    def stats(self):
+        return {"backend": "redis"}
+
+
+def _stream_id(entry_id):
+    ms, _, seq = str(entry_id).partition("-")
+    return int(ms or 0), int(seq or 0)
+
+
+def cooperative():
+    """True when gevent or eventlet has patched threading, so a blocked read() parks a greenlet, not a thread."""
+    if "gevent.monkey" in sys.modules and sys.modules["gevent.monkey"].is_module_patched("threading"):
+        return True
+    if "eventlet.patcher" in sys.modules and sys.modules["eventlet.patcher"].is_monkey_patched("thread"):
+        return True
+    return False
+
+
+class StreamSlots:
+    """Caps the event streams one worker process holds open at a time.
+
+    The cap is `cooperative_limit` under gevent/eventlet and `threaded_limit`
+    on plain threads (0 refuses every stream). It is picked at the first
+    acquire(), after the server has had the chance to monkey-patch.
+    """
+
+    def __init__(self, cooperative_limit=1000, threaded_limit=4):
+        self.cooperative_limit = cooperative_limit
+        self.threaded_limit = threaded_limit
+        self.limit = None
+        self._lock = threading.Lock()
+        self._open = 0
+        self.rejected = 0
+
+    def _resolve(self):
+        if self.limit is None:
+            if cooperative():
+                self.limit = self.cooperative_limit
+            else:
+                self.limit = self.threaded_limit
+                logger.warning("Event streams are served from OS threads; run the WSGI app under gunicorn -k gevent "
+                               "or use asgi.py", extra={"fields": {"max_streams": self.limit}})
+
+    def acquire(self):
+        """Take a slot; False when the worker is at its cap."""
+        with self._lock:
+            self._resolve()
+            if self._open >= self.limit:
+                self.rejected += 1
+                return False
+            self._open += 1
+            return True
+
+    def release(self):
+        with self._lock:
+            self._open -= 1
+
+    def stats(self):
+        with self._lock:
+            return {"open": self._open, "limit": self.limit, "rejected": self.rejected,
+                    "cooperative": cooperative()}
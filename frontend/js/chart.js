@@ -3,7 +3,7 @@ let chart;
 function generateReport() {
   const type = document.getElementById('report-type').value;
   const value = document.getElementById('report-value').value;
-  fetch(`http://localhost:3000/api/officer/reports/${type}/${value}`, {
+  fetch(`/api/officer/reports/${type}/${encodeURIComponent(value.trim())}`, {
     headers: { 'Authorization': `Bearer ${localStorage.getItem('token')}` }
   }).then(res => res.json()).then(data => {
     const ctx = document.getElementById('report-chart').getContext('2d');
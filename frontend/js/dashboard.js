@@ -13,8 +13,27 @@ document.addEventListener('DOMContentLoaded', () => {
   loadApplications();
   loadReports();
   loadNotifications();
+  subscribeToEvents();
 });
 
+// Server-pushed updates; the browser reconnects and resumes via Last-Event-ID
+let eventSource = null;
+
+function subscribeToEvents() {
+  eventSource = new EventSource(`${API_BASE}/api/events/stream?access_token=${encodeURIComponent(token)}`);
+  eventSource.addEventListener('notification', () => loadNotifications());
+  eventSource.addEventListener('status', () => loadApplications());
+  // Events were missed (e.g. a long disconnect): refetch everything they feed
+  eventSource.addEventListener('resync', () => {
+    loadApplications();
+    loadNotifications();
+  });
+  // A busy server answers 503, which closes the EventSource for good; try again later
+  eventSource.onerror = () => {
+    if (eventSource.readyState === EventSource.CLOSED) setTimeout(subscribeToEvents, 30000);
+  };
+}
+
 // Load Profile Info
 async function loadProfile() {
   try {
@@ -232,6 +251,13 @@ async function withdrawApplication(applicationId) {
 
 // Logout function
 function logout() {
+  if (eventSource) eventSource.close();
+  // Revoke the token server-side; keepalive lets the request finish after navigation
+  fetch(`${API_BASE}/api/logout`, {
+    method: 'POST',
+    headers: { 'Authorization': `Bearer ${token}` },
+    keepalive: true
+  }).catch(() => {});
   localStorage.removeItem('token');
   localStorage.removeItem('role');
   window.location.href = '/';
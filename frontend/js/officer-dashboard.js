@@ -13,8 +13,82 @@ document.addEventListener('DOMContentLoaded', () => {
   loadRecentApplications();
   loadOfficerReports();
   loadOfficerNotifications();
+  subscribeToEvents();
 });
 
+// Server-pushed application changes; each burst triggers one incremental sync
+let eventSource = null;
+let syncTimer = null;
+
+function scheduleSync() {
+  clearTimeout(syncTimer);
+  syncTimer = setTimeout(syncApplications, 250);
+}
+
+function subscribeToEvents() {
+  eventSource = new EventSource(`${API_BASE}/api/events/stream?access_token=${encodeURIComponent(token)}`);
+  eventSource.addEventListener('application', scheduleSync);
+  // After a reconnect or missed events, catch up through updated_since
+  eventSource.addEventListener('open', scheduleSync);
+  eventSource.addEventListener('resync', scheduleSync);
+  // A busy server answers 503, which closes the EventSource for good; try again later
+  eventSource.onerror = () => {
+    if (eventSource.readyState === EventSource.CLOSED) setTimeout(subscribeToEvents, 30000);
+  };
+}
+
+// Applications to this officer's postings, kept in sync with incremental fetches
+const applicationsById = new Map();
+let applicationsSyncedAt = null;
+
+async function fetchAllApplications() {
+  applicationsById.clear();
+  let cursor = null;
+  do {
+    const params = new URLSearchParams({ limit: 1000 });
+    if (cursor) params.set('cursor', cursor);
+    const res = await fetch(`${API_BASE}/api/officer/applications?${params}`, {
+      headers: { 'Authorization': `Bearer ${token}` }
+    });
+    if (!res.ok) return false;
+    if (!cursor) applicationsSyncedAt = res.headers.get('X-Server-Time');
+    (await res.json()).forEach(app => applicationsById.set(app.application_id, app));
+    cursor = res.headers.get('X-Next-Cursor');
+  } while (cursor);
+  return true;
+}
+
+// Fetch only what changed since the last sync and re-render if anything did
+async function syncApplications() {
+  if (!applicationsSyncedAt) return;
+  try {
+    let cursor = null;
+    let changed = false;
+    let serverTime = null;
+    do {
+      const params = new URLSearchParams({ updated_since: applicationsSyncedAt, limit: 1000 });
+      if (cursor) params.set('cursor', cursor);
+      const res = await fetch(`${API_BASE}/api/officer/applications?${params}`, {
+        headers: { 'Authorization': `Bearer ${token}` }
+      });
+      if (!res.ok) return;
+      const delta = await res.json();
+      serverTime = serverTime || delta.server_time;
+      delta.applications.forEach(app => applicationsById.set(app.application_id, app));
+      delta.deleted.forEach(id => applicationsById.delete(id));
+      changed = changed || delta.applications.length > 0 || delta.deleted.length > 0;
+      cursor = delta.next_cursor;
+    } while (cursor);
+    applicationsSyncedAt = serverTime;
+    if (changed) {
+      loadApplicationPipeline(false);
+      loadOfficerReports();
+    }
+  } catch (error) {
+    console.error('Error syncing applications:', error);
+  }
+}
+
 // Load Officer Profile Info - Removed as per user request
 
 // Load Active Postings
@@ -48,18 +122,54 @@ async function loadActivePostings() {
   }
 }
 
-// Load Registered Students
-async function loadRecentApplications() {
+// Load Registered Students (one server-side page at a time)
+let studentsCursor = null;
+let studentSearchTimer = null;
+
+function studentRow(student) {
+  return `
+    <tr>
+      <td>${student.student_id}</td>
+      <td>${student.university_roll}</td>
+      <td>${student.name}</td>
+      <td>${student.email}</td>
+      <td>${student.branch}</td>
+      <td>${student.cgpa}</td>
+      <td>${student.skills ? student.skills.join(', ') : 'N/A'}</td>
+      <td>${student.resume_path ? `<a href="/uploads/${student.resume_path.split('/').pop()}?access_token=${encodeURIComponent(token)}">Download</a>` : 'N/A'}</td>
+    </tr>
+  `;
+}
+
+// Map the single search box onto the list endpoint's filters
+function studentSearchParams() {
+  const input = document.getElementById('student-search');
+  const term = input ? input.value.trim() : '';
+  const params = new URLSearchParams({ limit: 50 });
+  if (/^\d+$/.test(term)) {
+    params.set('roll_prefix', term);
+  } else if (term) {
+    params.set('name', term);
+  }
+  return params;
+}
+
+async function loadRecentApplications(append = false) {
   try {
-    const res = await fetch(`${API_BASE}/api/student/list`, {
+    const params = studentSearchParams();
+    if (append && studentsCursor) params.set('cursor', studentsCursor);
+    const res = await fetch(`${API_BASE}/api/student/list?${params}`, {
       headers: { 'Authorization': `Bearer ${token}` }
     });
     if (res.ok) {
       const students = await res.json();
+      studentsCursor = res.headers.get('X-Next-Cursor');
+      const total = res.headers.get('X-Total-Count');
       const studentsTable = document.getElementById('recent-applications');
-      if (students.length > 0) {
+      if (!document.getElementById('students-table')) {
         studentsTable.innerHTML = `
-          <input type="text" id="student-search" placeholder="Search by roll number, branch, or skill..." onkeyup="filterStudents()">
+          <input type="text" id="student-search" placeholder="Search by roll number or name..." oninput="filterStudents()">
+          <p id="students-count"></p>
           <table id="students-table">
             <thead>
               <tr>
@@ -73,25 +183,22 @@ async function loadRecentApplications() {
                 <th>Resume</th>
               </tr>
             </thead>
-            <tbody>
-              ${students.map(student => `
-                <tr>
-                  <td>${student.student_id}</td>
-                  <td>${student.university_roll}</td>
-                  <td>${student.name}</td>
-                  <td>${student.email}</td>
-                  <td>${student.branch}</td>
-                  <td>${student.cgpa}</td>
-                  <td>${student.skills ? student.skills.join(', ') : 'N/A'}</td>
-                  <td>${student.resume_path ? `<a href="/uploads/${student.resume_path.split('/').pop()}" target="_blank">View</a>` : 'N/A'}</td>
-                </tr>
-              `).join('')}
-            </tbody>
+            <tbody></tbody>
           </table>
+          <button id="students-more" onclick="loadRecentApplications(true)">Load more</button>
         `;
+      }
+      const tbody = document.querySelector('#students-table tbody');
+      const rows = students.map(studentRow).join('');
+      if (append) {
+        tbody.insertAdjacentHTML('beforeend', rows);
       } else {
-        studentsTable.innerHTML = '<p>No registered students.</p>';
+        tbody.innerHTML = rows || '<tr><td colspan="8">No registered students.</td></tr>';
       }
+      if (total !== null) {
+        document.getElementById('students-count').textContent = `${total} students`;
+      }
+      document.getElementById('students-more').style.display = studentsCursor ? '' : 'none';
     } else {
       document.getElementById('recent-applications').innerHTML = '<p>Failed to load students.</p>';
     }
@@ -101,53 +208,30 @@ async function loadRecentApplications() {
   }
 }
 
-// Filter students by roll number, branch, or skill
+// Filter students by roll number prefix or name (server-side, debounced)
 function filterStudents() {
-  const input = document.getElementById('student-search');
-  const filter = input.value.toLowerCase();
-  const table = document.getElementById('students-table');
-  const tr = table.getElementsByTagName('tr');
-
-  for (let i = 1; i < tr.length; i++) {
-    const tdRollNo = tr[i].getElementsByTagName('td')[0]; // Student ID
-    const tdUniRollNo = tr[i].getElementsByTagName('td')[1]; // University Roll Number
-    const tdBranch = tr[i].getElementsByTagName('td')[4];
-    const tdSkills = tr[i].getElementsByTagName('td')[6];
-    if (tdRollNo || tdUniRollNo || tdBranch || tdSkills) {
-      const txtValueRollNo = tdRollNo.textContent || tdRollNo.innerText;
-      const txtValueUniRollNo = tdUniRollNo.textContent || tdUniRollNo.innerText;
-      const txtValueBranch = tdBranch.textContent || tdBranch.innerText;
-      const txtValueSkills = tdSkills.textContent || tdSkills.innerText;
-      if (txtValueRollNo.toLowerCase().indexOf(filter) > -1 ||
-          txtValueUniRollNo.toLowerCase().indexOf(filter) > -1 ||
-          txtValueBranch.toLowerCase().indexOf(filter) > -1 ||
-          txtValueSkills.toLowerCase().indexOf(filter) > -1) {
-        tr[i].style.display = '';
-      } else {
-        tr[i].style.display = 'none';
-      }
-    }
-  }
+  clearTimeout(studentSearchTimer);
+  studentSearchTimer = setTimeout(() => loadRecentApplications(false), 300);
 }
 
 // Load Officer Reports
 async function loadOfficerReports() {
   try {
-    // Fetch postings and applications to calculate reports
+    // Fetch postings and the officer summary report
     const postingsRes = await fetch(`${API_BASE}/api/officer/postings`, {
       headers: { 'Authorization': `Bearer ${token}` }
     });
-    const appsRes = await fetch(`${API_BASE}/api/officer/applications`, {
+    // Totals come pre-aggregated from the summary-backed reports API
+    const reportRes = await fetch(`${API_BASE}/api/officer/reports?group_by=officer&officer_id=me`, {
       headers: { 'Authorization': `Bearer ${token}` }
     });
-    if (postingsRes.ok && appsRes.ok) {
+    if (postingsRes.ok && reportRes.ok) {
       const postings = await postingsRes.json();
-      const apps = await appsRes.json();
+      const [summary] = await reportRes.json();
       const totalPostings = postings.length;
-      const totalApps = apps.length;
-      const selected = apps.filter(app => app.status === 'Selected').length;
-      // Assuming package is not in applications, set to 0 for now
-      const avgPackage = 0;
+      const totalApps = summary ? summary.total_applications : 0;
+      const selected = summary ? summary.selected : 0;
+      const avgPackage = summary && summary.avg_package !== null ? summary.avg_package : 0;
 
       document.getElementById('total-postings').textContent = totalPostings;
       document.getElementById('total-apps').textContent = totalApps;
@@ -257,18 +341,16 @@ async function loadOfficerNotifications() {
 }
 
 // Load Application Pipeline
-async function loadApplicationPipeline() {
+async function loadApplicationPipeline(refetch = true) {
   try {
     const postingsRes = await fetch(`${API_BASE}/api/officer/postings`, {
       headers: { 'Authorization': `Bearer ${token}` }
     });
-    const appsRes = await fetch(`${API_BASE}/api/officer/applications`, {
-      headers: { 'Authorization': `Bearer ${token}` }
-    });
+    const appsOk = refetch ? await fetchAllApplications() : true;
 
-    if (postingsRes.ok && appsRes.ok) {
+    if (postingsRes.ok && appsOk) {
       const postings = await postingsRes.json();
-      const applications = await appsRes.json();
+      const applications = Array.from(applicationsById.values());
 
       const pipelineContainer = document.getElementById('application-pipeline');
 
@@ -452,6 +534,13 @@ async function bulkUpdateStatus(applicationIds, status) {
 
 // Logout function
 function logout() {
+  if (eventSource) eventSource.close();
+  // Revoke the token server-side; keepalive lets the request finish after navigation
+  fetch(`${API_BASE}/api/logout`, {
+    method: 'POST',
+    headers: { 'Authorization': `Bearer ${token}` },
+    keepalive: true
+  }).catch(() => {});
   localStorage.removeItem('token');
   localStorage.removeItem('role');
   window.location.href = '/';
@@ -0,0 +1,253 @@
+# instrumentation.py - per-request timings, Prometheus-style metrics and structured logs
+#
+# install() hooks a Flask app so every request collects wall time, DB time,
+# query and row counts, response bytes and bcrypt/upload time in g, aggregates
+# them per route, and logs one JSON line. Connections are only wrapped
+# (InstrumentedConnection) and the hooks only registered when metrics are
+# enabled, so a disabled deployment runs the plain code paths.
+import json
+import logging
+import re
+import threading
+import time
+from contextlib import contextmanager
+
+from flask import g, has_request_context, request
+
+from metrics import Histogram
+
+logger = logging.getLogger("placement")
+
+# Counters accumulated per request (times in milliseconds)
+REQUEST_FIELDS = ("db_ms", "queries", "rows", "bcrypt_ms", "upload_ms")
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line; `extra={"fields": {...}}` adds keys."""
+
+    def format(self, record):
+        entry = {
+            "ts": self.formatTime(record, "%Y-%m-%dT%H:%M:%S"),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        entry.update(getattr(record, "fields", {}))
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+def configure_logging(level="INFO", fmt="json"):
+    handler = logging.StreamHandler()
+    handler.setFormatter(JsonFormatter() if fmt == "json" else logging.Formatter("%(asctime)s %(levelname)s %(name)s %(message)s"))
+    logger.handlers[:] = [handler]
+    logger.setLevel(level)
+    logger.propagate = False
+
+
+# ---------------------------
+# Request-scoped counters
+# ---------------------------
+def add(field, amount):
+    """Add to the current request's counter; a no-op outside an instrumented request."""
+    if has_request_context():
+        stats = g.get("_request_stats")
+        if stats is not None:
+            stats[field] += amount
+
+
+@contextmanager
+def timed(field):
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        add(field, (time.perf_counter() - started) * 1000)
+
+
+def param_shape(params):
+    """Types (not values) of query parameters, compressed for long IN lists."""
+    if params is None:
+        return None
+    if isinstance(params, dict):
+        return {key: type(value).__name__ for key, value in params.items()}
+    types = [type(value).__name__ for value in params]
+    if len(types) > 10:
+        return f"{len(types)} params ({', '.join(sorted(set(types)))})"
+    return types
+
+
+class InstrumentedCursor:
+    """Times execute()/executemany() and counts fetched rows into the request stats."""
+
+    def __init__(self, cursor, slow_query_ms):
+        self._cursor = cursor
+        self._slow_query_ms = slow_query_ms
+
+    def _record(self, operation, params, started, many):
+        elapsed = (time.perf_counter() - started) * 1000
+        add("db_ms", elapsed)
+        add("queries", 1)
+        if self._slow_query_ms and elapsed >= self._slow_query_ms:
+            shape = f"{len(params)} rows" if many else param_shape(params)
+            logger.warning("slow query", extra={"fields": {
+                "sql": _WHITESPACE_RE.sub(" ", str(operation)).strip()[:2000],
+                "params": shape,
+                "ms": round(elapsed, 2),
+                "route": request.endpoint if has_request_context() else None,
+            }})
+
+    def execute(self, operation, params=None, *args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return self._cursor.execute(operation, params, *args, **kwargs)
+        finally:
+            self._record(operation, params, started, False)
+
+    def executemany(self, operation, seq_params, *args, **kwargs):
+        seq_params = list(seq_params)
+        started = time.perf_counter()
+        try:
+            return self._cursor.executemany(operation, seq_params, *args, **kwargs)
+        finally:
+            self._record(operation, seq_params, started, True)
+
+    def fetchone(self):
+        row = self._cursor.fetchone()
+        if row is not None:
+            add("rows", 1)
+        return row
+
+    def fetchmany(self, *args, **kwargs):
+        rows = self._cursor.fetchmany(*args, **kwargs)
+        add("rows", len(rows))
+        return rows
+
+    def fetchall(self):
+        rows = self._cursor.fetchall()
+        add("rows", len(rows))
+        return rows
+
+    def __iter__(self):
+        return iter(self.fetchone, None)
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+
+class InstrumentedConnection:
+    def __init__(self, db, slow_query_ms):
+        self._db = db
+        self._slow_query_ms = slow_query_ms
+
+    def cursor(self, *args, **kwargs):
+        return InstrumentedCursor(self._db.cursor(*args, **kwargs), self._slow_query_ms)
+
+    def __getattr__(self, name):
+        return getattr(self._db, name)
+
+
+# ---------------------------
+# Aggregation and exposition
+# ---------------------------
+class RouteMetrics:
+    """Per (route, method) request counts by status, latency histograms and totals."""
+
+    def __init__(self):
+        self._routes = {}
+        self._lock = threading.Lock()
+
+    def record(self, route, method, status, wall_seconds, stats, response_bytes):
+        key = (route, method)
+        with self._lock:
+            entry = self._routes.get(key)
+            if entry is None:
+                entry = self._routes[key] = {
+                    "status": {}, "wall": Histogram(), "db": Histogram(),
+                    "queries": 0, "rows": 0, "response_bytes": 0, "bcrypt_ms": 0.0, "upload_ms": 0.0,
+                }
+            entry["status"][status] = entry["status"].get(status, 0) + 1
+            entry["queries"] += stats["queries"]
+            entry["rows"] += stats["rows"]
+            entry["response_bytes"] += response_bytes
+            entry["bcrypt_ms"] += stats["bcrypt_ms"]
+            entry["upload_ms"] += stats["upload_ms"]
+        entry["wall"].observe(wall_seconds)
+        entry["db"].observe(stats["db_ms"] / 1000)
+
+    def render(self, gauges=None):
+        """Prometheus text exposition of everything recorded, plus `gauges` {name: value}."""
+        lines = []
+
+        def family(name, kind, help_text):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+
+        with self._lock:
+            routes = {key: dict(entry, status=dict(entry["status"])) for key, entry in self._routes.items()}
+
+        family("placement_requests_total", "counter", "Requests by route, method and status")
+        for (route, method), entry in sorted(routes.items()):
+            for status, count in sorted(entry["status"].items()):
+                lines.append(f'placement_requests_total{{route="{route}",method="{method}",status="{status}"}} {count}')
+        for metric, help_text in (("wall", "Request wall time"), ("db", "Time spent in database calls per request")):
+            name = f"placement_request_{metric}_seconds"
+            family(name, "histogram", help_text)
+            for (route, method), entry in sorted(routes.items()):
+                labels = f'route="{route}",method="{method}"'
+                snapshot = entry[metric].snapshot()
+                for bound, count in snapshot["buckets"].items():
+                    lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {count}')
+                lines.append(f"{name}_sum{{{labels}}} {snapshot['sum']}")
+                lines.append(f"{name}_count{{{labels}}} {snapshot['count']}")
+        for field, name, help_text in (
+            ("queries", "placement_db_queries_total", "Database statements executed"),
+            ("rows", "placement_db_rows_total", "Rows fetched from the database"),
+            ("response_bytes", "placement_response_bytes_total", "Response body bytes"),
+            ("bcrypt_ms", "placement_bcrypt_seconds_total", "Time spent waiting on password hashing"),
+            ("upload_ms", "placement_upload_seconds_total", "Time spent storing uploads"),
+        ):
+            family(name, "counter", help_text)
+            scale = 1000 if field.endswith("_ms") else 1
+            for (route, method), entry in sorted(routes.items()):
+                lines.append(f'{name}{{route="{route}",method="{method}"}} {round(entry[field] / scale, 6)}')
+        for name, value in sorted((gauges or {}).items()):
+            family(name, "gauge", name.replace("_", " "))
+            lines.append(f"{name} {value}")
+        return "\n".join(lines) + "\n"
+
+
+def install(app, route_metrics, log_requests=True):
+    """Register the per-request hooks on `app`."""
+
+    @app.before_request
+    def start_request_stats():
+        g._request_started = time.perf_counter()
+        g._request_stats = dict.fromkeys(REQUEST_FIELDS, 0)
+
+    @app.after_request
+    def finish_request_stats(response):
+        stats = g.pop("_request_stats", None)
+        if stats is None:
+            return response
+        wall = time.perf_counter() - g.pop("_request_started")
+        route = request.url_rule.rule if request.url_rule else "unmatched"
+        size = 0 if response.is_streamed else (response.content_length or 0)
+        route_metrics.record(route, request.method, response.status_code, wall, stats, size)
+        if log_requests:
+            logger.info("request", extra={"fields": {
+                "route": route,
+                "method": request.method,
+                "status": response.status_code,
+                "wall_ms": round(wall * 1000, 2),
+                "db_ms": round(stats["db_ms"], 2),
+                "queries": stats["queries"],
+                "rows": stats["rows"],
+                "bytes": size,
+                "bcrypt_ms": round(stats["bcrypt_ms"], 2),
+                "upload_ms": round(stats["upload_ms"], 2),
+            }})
+        return response
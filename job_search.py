@@ -0,0 +1,186 @@
+# job_search.py - ranked full-text search over job postings
+import datetime
+import heapq
+import threading
+import time
+
+from search_index import InvertedIndex
+from skills import skill_key
+
+# Postings written within this many seconds before the watermark may have committed after
+# it was read (JobPosting.updated_at has one-second precision)
+COMMIT_LAG_SECONDS = 5
+
+JOB_SQL = "SELECT job_id, title, description, package_stipend, deadline, status FROM JobPosting"
+JOB_SKILLS_SQL = "SELECT js.job_id, sk.skill_name FROM JobSkill js JOIN Skill sk ON sk.skill_id = js.skill_id"
+
+
+class JobSearch:
+    """BM25 search over posting titles, skills and descriptions, with filters.
+
+    Like MatchEngine it is built lazily from the database and rebuilt after
+    `reload_seconds`. Postings created or closed in this process are applied
+    immediately through refresh_job(); in between, ensure_loaded() re-reads
+    the postings written by other processes (by JobPosting.updated_at),
+    checking at most every `check_seconds`.
+    """
+
+    def __init__(self, title_weight=3.0, skill_weight=2.0, description_weight=1.0, reload_seconds=600,
+                 check_seconds=2):
+        self.field_weights = {"title": title_weight, "skills": skill_weight, "description": description_weight}
+        self.index = InvertedIndex(self.field_weights)
+        self.reload_seconds = reload_seconds
+        self.check_seconds = check_seconds
+        self._jobs = {}  # job_id -> (package_stipend, deadline, status, skill keys)
+        self._lock = threading.Lock()
+        self._loaded_at = None
+        self._checked_at = None
+        self._watermark = None  # newest JobPosting.updated_at applied
+        self._applied = {}  # job_id -> updated_at, for rows inside the commit-lag window
+
+    # ---------------------------
+    # Loading
+    # ---------------------------
+    def ensure_loaded(self, get_db):
+        with self._lock:
+            now = time.monotonic()
+            if self._loaded_at is not None and now - self._loaded_at < self.reload_seconds:
+                if now - self._checked_at < self.check_seconds:
+                    return
+                db = get_db()
+                cur = db.cursor()
+                try:
+                    self._catch_up(cur)
+                    self._checked_at = now
+                finally:
+                    cur.close()
+                    db.rollback()
+                    db.close()
+                return
+            db = get_db()
+            cur = db.cursor()
+            try:
+                self.load(cur)
+            finally:
+                cur.close()
+                db.rollback()
+                db.close()
+
+    @staticmethod
+    def _now_watermark(cur):
+        cur.execute("SELECT MAX(updated_at) FROM JobPosting")
+        return cur.fetchone()[0] or datetime.datetime(1970, 1, 2)
+
+    def _catch_up(self, cur):
+        """Re-read the postings written since the watermark (by any process); expects self._lock held."""
+        cur.execute("SELECT job_id, updated_at FROM JobPosting WHERE updated_at > %s - INTERVAL %s SECOND",
+                    (self._watermark, COMMIT_LAG_SECONDS))
+        changed = {job_id: updated_at for job_id, updated_at in cur.fetchall()}
+        job_ids = [job_id for job_id, updated_at in changed.items() if self._applied.get(job_id) != updated_at]
+        self._applied = changed
+        if not job_ids:
+            return 0
+        self._watermark = max(self._watermark, *changed.values())
+        placeholders = ",".join(["%s"] * len(job_ids))
+        cur.execute(f"{JOB_SQL} WHERE job_id IN ({placeholders})", job_ids)
+        jobs = cur.fetchall()
+        cur.execute(f"{JOB_SKILLS_SQL} WHERE js.job_id IN ({placeholders})", job_ids)
+        skills = {}
+        for job_id, skill_name in cur.fetchall():
+            skills.setdefault(job_id, []).append(skill_name)
+        for job_id, *row in jobs:
+            self._put(self.index, self._jobs, job_id, *row, skills.get(job_id, []))
+        return len(jobs)
+
+    def load(self, cur):
+        # Read before the rows, so a write made during the build is caught up on next time
+        watermark = self._now_watermark(cur)
+        cur.execute(JOB_SQL)
+        jobs = cur.fetchall()
+        cur.execute(JOB_SKILLS_SQL)
+        self.load_rows(jobs, cur.fetchall())
+        self._watermark, self._applied = watermark, {}
+
+    def load_rows(self, jobs, job_skills):
+        """Rebuild from (job_id, title, description, package, deadline, status) and (job_id, skill_name) rows."""
+        skills = {}
+        for job_id, skill_name in job_skills:
+            skills.setdefault(job_id, []).append(skill_name)
+        # Build aside and swap, so searches never see a half-built index
+        index, meta = InvertedIndex(self.field_weights), {}
+        for job_id, title, description, package, deadline, status in jobs:
+            self._put(index, meta, job_id, title, description, package, deadline, status, skills.get(job_id, []))
+        self.index, self._jobs = index, meta
+        self._loaded_at = self._checked_at = time.monotonic()
+
+    @staticmethod
+    def _put(index, meta, job_id, title, description, package, deadline, status, skill_names):
+        meta[job_id] = (
+            float(package) if package is not None else None,
+            deadline,
+            status,
+            frozenset(skill_key(name) for name in skill_names),
+        )
+        index.add(job_id, title=title, skills=" ".join(skill_names), description=description)
+
+    def refresh_job(self, cur, job_id):
+        """Re-read one posting after a write (no-op until the index is loaded).
+
+        Holds the lock so the write cannot land in an index a concurrent
+        reload is about to replace.
+        """
+        with self._lock:
+            if self._loaded_at is None:
+                return
+            cur.execute("SELECT title, description, package_stipend, deadline, status FROM JobPosting WHERE job_id = %s",
+                        (job_id,))
+            row = cur.fetchone()
+            if not row:
+                self.index.remove(job_id)
+                self._jobs.pop(job_id, None)
+                return
+            cur.execute(f"{JOB_SKILLS_SQL} WHERE js.job_id = %s", (job_id,))
+            self._put(self.index, self._jobs, job_id, *row, [r[1] for r in cur.fetchall()])
+
+    # ---------------------------
+    # Querying
+    # ---------------------------
+    def search(self, query, package_min=None, package_max=None, deadline_from=None, deadline_to=None, skill=None,
+               limit=20, after=None):
+        """One page of open postings matching `query`, best first.
+
+        Returns (page, next_after, total): page is [(job_id, score)], and
+        next_after, a (score, job_id) pair, continues from the page's last hit.
+        Without deadline_from only postings whose deadline has not passed match.
+        """
+        deadline_from = deadline_from or datetime.date.today()
+        wanted_skill = skill_key(skill) if skill else None
+        index, jobs = self.index, self._jobs
+
+        def accept(job_id):
+            meta = jobs.get(job_id)
+            if meta is None:
+                return False
+            package, deadline, status, skills = meta
+            return (status == "Open"
+                    and deadline >= deadline_from
+                    and (deadline_to is None or deadline <= deadline_to)
+                    and (package_min is None or (package is not None and package >= package_min))
+                    and (package_max is None or (package is not None and package <= package_max))
+                    and (wanted_skill is None or wanted_skill in skills))
+
+        scores = index.scores(query, accept)
+        total = len(scores)
+        ranked = ((-score, job_id) for job_id, score in scores.items())
+        if after:
+            bound = (-after[0], after[1])
+            ranked = (key for key in ranked if key > bound)
+        # Only the page (plus one to know whether there is more) is ever sorted
+        top = heapq.nsmallest(limit + 1, ranked)
+        page = [(job_id, -neg_score) for neg_score, job_id in top[:limit]]
+        next_after = list(page[-1][::-1]) if len(top) > limit else None
+        return page, next_after, total
+
+    def stats(self):
+        return dict(self.index.stats(),
+                    loaded_seconds_ago=round(time.monotonic() - self._loaded_at, 1) if self._loaded_at else None)
@@ -0,0 +1,135 @@
+# json_stream.py - orjson encoding and spooled, compressed list responses
+#
+# List routes read their page from an unbuffered (server-side) cursor
+# fetch_size rows at a time and encode each row with orjson as it arrives, so
+# no list of rows or dicts is ever built. The encoded bytes go through an
+# incremental gzip compressor, when the client accepts gzip, into a
+# SpooledTemporaryFile. The body is complete before the response starts
+# because headers such as X-Next-Cursor depend on the last row. It is held in
+# memory only up to spool_bytes and spills to disk past that. The pooled
+# connection is back in the pool before the client reads a byte.
+#
+# Values keep the JSON form jsonify gives them (Decimal as a string, dates as
+# HTTP dates), so clients see the same documents, only faster.
+import datetime
+import tempfile
+import zlib
+from decimal import Decimal
+
+import orjson
+from werkzeug.http import http_date
+
+from static_assets import accepted_encodings
+
+JSON = "application/json"
+NDJSON = "application/x-ndjson"
+_OPTIONS = orjson.OPT_PASSTHROUGH_DATETIME
+
+
+def _default(value):
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        return http_date(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(value):
+    """JSON bytes for `value`, matching jsonify's handling of Decimal and dates."""
+    return orjson.dumps(value, default=_default, option=_OPTIONS)
+
+
+def negotiate(accept, accept_encoding, fmt=None):
+    """(format, encoding) for a request: "json" or "ndjson" (via ?format= or Accept), "gzip" or None."""
+    if fmt not in ("json", "ndjson"):
+        fmt = "ndjson" if NDJSON in (accept or "") else "json"
+    return fmt, "gzip" if "gzip" in accepted_encodings(accept_encoding) else None
+
+
+def fetch_rows(cur, fetch_size=500):
+    """Dicts for the rows of an executed tuple cursor, fetched fetch_size at a time."""
+    columns = [d[0] for d in cur.description]
+    while True:
+        batch = cur.fetchmany(fetch_size)
+        if not batch:
+            return
+        for row in batch:
+            yield dict(zip(columns, row))
+
+
+class JsonBody:
+    """A JSON array (or NDJSON lines) written row by row into a spooled, optionally gzipped file."""
+
+    def __init__(self, fmt="json", encoding=None, spool_bytes=1024 * 1024, level=6):
+        self.fmt = fmt
+        self.encoding = encoding
+        self.rows = 0
+        self._file = tempfile.SpooledTemporaryFile(max_size=spool_bytes)
+        # wbits 31: gzip container
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31) if encoding == "gzip" else None
+        self._open = False
+
+    def raw(self, data):
+        if self._compressor:
+            data = self._compressor.compress(data)
+        if data:
+            self._file.write(data)
+
+    def row(self, value):
+        if self.fmt == "ndjson":
+            self.raw(dumps(value) + b"\n")
+        else:
+            self.raw((b"," if self._open else b"[") + dumps(value))
+            self._open = True
+        self.rows += 1
+
+    def page(self, rows, limit, transform=None):
+        """Write up to `limit` rows; returns (last row written, whether more rows followed).
+
+        Reads `rows` to the end (LIMIT limit + 1 in SQL) so the unbuffered
+        result is drained and the connection can run its next statement.
+        """
+        last, more = None, False
+        for row in rows:
+            if self.rows >= limit:
+                more = True
+                continue
+            if transform:
+                row = transform(row)
+            self.row(row)
+            last = row
+        return last, more
+
+    def close_array(self):
+        """End the JSON array (an empty one if no row was written); NDJSON needs no terminator."""
+        if self.fmt == "json":
+            self.raw(b"]" if self._open else b"[]")
+            self._open = False
+
+    def response(self, response_class, status=200, headers=None, close_array=True):
+        """Finish the body and wrap it in a response that streams the spooled file."""
+        if close_array:
+            self.close_array()
+        if self._compressor:
+            self._file.write(self._compressor.flush())
+        length = self._file.tell()
+        self._file.seek(0)
+        body = self._file
+
+        def chunks():
+            try:
+                while True:
+                    data = body.read(64 * 1024)
+                    if not data:
+                        return
+                    yield data
+            finally:
+                body.close()
+
+        response = response_class(chunks(), status=status, headers=headers,
+                                  mimetype=NDJSON if self.fmt == "ndjson" else JSON)
+        response.headers["Content-Length"] = str(length)
+        response.headers["Vary"] = "Accept, Accept-Encoding"
+        if self.encoding:
+            response.headers["Content-Encoding"] = self.encoding
+        return response
@@ -0,0 +1,280 @@
+# matching.py - skill-match ranking of applicants and jobs on NumPy bitsets
+#
+# Every student and job is a row of a packed bitset (one bit per skill column).
+# A match score is
+#
+#     skill_weight * weighted coverage of the job's skills
+#   + cgpa_weight  * CGPA margin over the job's min_cgpa (scaled to [-1, 1])
+#
+# where a skill's weight is its IDF over students, so rare skills count for more.
+import threading
+import time
+
+import numpy as np
+
+
+def _bit(packed, col):
+    """0/1 vector: whether each row of `packed` has skill column `col` set."""
+    return (packed[:, col >> 3] >> (7 - (col & 7))) & 1
+
+
+class _BitsetTable:
+    """Rows of packed skill bits plus one float attribute, addressed by external id."""
+
+    def __init__(self, n_bytes):
+        self.rows = {}
+        self.ids = np.zeros(0, dtype=np.int64)
+        self.bits = np.zeros((0, n_bytes), dtype=np.uint8)
+        self.value = np.zeros(0, dtype=np.float32)
+        self.size = 0
+
+    def reserve(self, n):
+        capacity = len(self.ids)
+        if n <= capacity:
+            return
+        capacity = max(n, capacity * 2, 64)
+        ids = np.zeros(capacity, dtype=np.int64)
+        bits = np.zeros((capacity, self.bits.shape[1]), dtype=np.uint8)
+        value = np.zeros(capacity, dtype=np.float32)
+        ids[:self.size], bits[:self.size], value[:self.size] = self.ids[:self.size], self.bits[:self.size], self.value[:self.size]
+        self.ids, self.bits, self.value = ids, bits, value
+
+    def widen(self, n_bytes):
+        if n_bytes > self.bits.shape[1]:
+            bits = np.zeros((self.bits.shape[0], n_bytes), dtype=np.uint8)
+            bits[:, :self.bits.shape[1]] = self.bits
+            self.bits = bits
+
+    def row_for(self, entity_id):
+        row = self.rows.get(entity_id)
+        if row is None:
+            self.reserve(self.size + 1)
+            row = self.size
+            self.rows[entity_id] = row
+            self.ids[row] = entity_id
+            self.size += 1
+        return row
+
+    def columns(self, row):
+        return np.flatnonzero(np.unpackbits(self.bits[row]))
+
+
+class MatchEngine:
+    """In-memory skill matrices for all students and jobs, updated incrementally.
+
+    Built lazily from the database on first use and rebuilt after
+    `reload_seconds`, which bounds staleness in workers that did not see a write.
+    """
+
+    def __init__(self, skill_weight=0.8, cgpa_weight=0.2, reload_seconds=600):
+        self.skill_weight = skill_weight
+        self.cgpa_weight = cgpa_weight
+        self.reload_seconds = reload_seconds
+        self._lock = threading.RLock()
+        self._loaded_at = None
+        self._reset()
+
+    def _reset(self, n_bytes=8):
+        self.skill_cols = {}
+        self.students = _BitsetTable(n_bytes)
+        self.jobs = _BitsetTable(n_bytes)
+        self.df = np.zeros(n_bytes * 8, dtype=np.int64)
+
+    # ---------------------------
+    # Loading
+    # ---------------------------
+    def ensure_loaded(self, get_db):
+        with self._lock:
+            if self._loaded_at is not None and time.monotonic() - self._loaded_at < self.reload_seconds:
+                return
+            db = get_db()
+            cur = db.cursor()
+            try:
+                self.load(cur)
+            finally:
+                cur.close()
+                db.close()
+
+    def load(self, cur):
+        cur.execute("SELECT student_id, cgpa FROM students")
+        students = cur.fetchall()
+        cur.execute("SELECT student_id, skill_id FROM StudentSkill")
+        student_skills = cur.fetchall()
+        cur.execute("SELECT job_id, min_cgpa FROM JobPosting")
+        jobs = cur.fetchall()
+        cur.execute("SELECT job_id, skill_id FROM JobSkill")
+        job_skills = cur.fetchall()
+        self.load_rows(students, student_skills, jobs, job_skills)
+
+    def load_rows(self, students, student_skills, jobs, job_skills):
+        """Build both matrices from (id, cgpa) and (id, skill_id) rows in one vectorised pass."""
+        student_skills = np.asarray(student_skills, dtype=np.int64).reshape(-1, 2)
+        job_skills = np.asarray(job_skills, dtype=np.int64).reshape(-1, 2)
+        skill_ids = np.unique(np.concatenate([student_skills[:, 1], job_skills[:, 1]]))
+        n_bytes = max(8, -(-len(skill_ids) // 64) * 8)
+        with self._lock:
+            self._reset(n_bytes)
+            self.skill_cols = {int(s): i for i, s in enumerate(skill_ids)}
+            for table, entities, links in ((self.students, students, student_skills), (self.jobs, jobs, job_skills)):
+                entities = np.asarray(entities, dtype=np.float64).reshape(-1, 2)
+                ids = entities[:, 0].astype(np.int64)
+                table.reserve(len(ids))
+                table.ids[:len(ids)] = ids
+                table.value[:len(ids)] = entities[:, 1]
+                table.size = len(ids)
+                table.rows = {int(i): r for r, i in enumerate(ids)}
+                known = np.isin(links[:, 0], ids)
+                sorter = np.argsort(ids)
+                rows = sorter[np.searchsorted(ids, links[known, 0], sorter=sorter)]
+                cols = np.searchsorted(skill_ids, links[known, 1])
+                np.bitwise_or.at(table.bits, (rows, cols >> 3), (0x80 >> (cols & 7)).astype(np.uint8))
+            self.df = np.unpackbits(self.students.bits[:self.students.size], axis=1).sum(axis=0).astype(np.int64)
+            self._loaded_at = time.monotonic()
+
+    # ---------------------------
+    # Incremental updates
+    # ---------------------------
+    def _column(self, skill_id):
+        col = self.skill_cols.get(skill_id)
+        if col is None:
+            col = len(self.skill_cols)
+            self.skill_cols[skill_id] = col
+            if col >= self.df.shape[0]:
+                n_bytes = self.df.shape[0] // 8 + 8
+                self.students.widen(n_bytes)
+                self.jobs.widen(n_bytes)
+                self.df = np.concatenate([self.df, np.zeros(64, dtype=np.int64)])
+        return col
+
+    def _set(self, table, entity_id, value, skill_ids):
+        row = table.row_for(entity_id)
+        cols = [self._column(s) for s in skill_ids]
+        if table is self.students:
+            self.df[table.columns(row)] -= 1
+            self.df[cols] += 1
+        table.bits[row] = 0
+        for col in cols:
+            table.bits[row, col >> 3] |= 0x80 >> (col & 7)
+        table.value[row] = value
+
+    def set_student(self, student_id, cgpa, skill_ids):
+        with self._lock:
+            self._set(self.students, student_id, cgpa, skill_ids)
+
+    def set_job(self, job_id, min_cgpa, skill_ids):
+        with self._lock:
+            self._set(self.jobs, job_id, min_cgpa, skill_ids)
+
+    def refresh_student(self, cur, student_id):
+        """Re-read one student after a profile write (no-op until the engine is loaded)."""
+        if self._loaded_at is None:
+            return
+        cur.execute("SELECT cgpa FROM students WHERE student_id = %s", (student_id,))
+        row = cur.fetchone()
+        if row:
+            cur.execute("SELECT skill_id FROM StudentSkill WHERE student_id = %s", (student_id,))
+            self.set_student(student_id, float(row[0]), [r[0] for r in cur.fetchall()])
+
+    def refresh_job(self, cur, job_id):
+        if self._loaded_at is None:
+            return
+        cur.execute("SELECT min_cgpa FROM JobPosting WHERE job_id = %s", (job_id,))
+        row = cur.fetchone()
+        if row:
+            cur.execute("SELECT skill_id FROM JobSkill WHERE job_id = %s", (job_id,))
+            self.set_job(job_id, float(row[0]), [r[0] for r in cur.fetchall()])
+
+    def load_missing(self, cur, student_ids=(), job_ids=()):
+        """Read in any of these students/jobs the engine doesn't have yet.
+
+        Rows written by another process since the last load are unknown here
+        until the next reload; ranking calls this first so a real applicant is
+        never left off the list.
+        """
+        with self._lock:
+            students = [s for s in student_ids if s not in self.students.rows]
+            jobs = [j for j in job_ids if j not in self.jobs.rows]
+        for student_id in students:
+            self.refresh_student(cur, student_id)
+        for job_id in jobs:
+            self.refresh_job(cur, job_id)
+        return len(students) + len(jobs)
+
+    # ---------------------------
+    # Scoring
+    # ---------------------------
+    def _weights(self):
+        n = max(self.students.size, 1)
+        return (np.log((n + 1) / (self.df + 1)) + 1).astype(np.float32)
+
+    def _margin(self, cgpa, min_cgpa):
+        return np.clip((cgpa - min_cgpa) / np.maximum(10 - min_cgpa, 0.5), -1, 1)
+
+    @staticmethod
+    def _top(ids, score, coverage, overlap, k):
+        if len(ids) > k:
+            keep = np.argpartition(-score, k - 1)[:k]
+            ids, score, coverage, overlap = ids[keep], score[keep], coverage[keep], overlap[keep]
+        order = np.lexsort((ids, -score))
+        return [
+            {"id": int(ids[i]), "score": round(float(score[i]), 4),
+             "skill_coverage": round(float(coverage[i]), 4), "matched_skills": int(overlap[i])}
+            for i in order
+        ]
+
+    def rank_students(self, job_id, student_ids, k=20):
+        """Top-k of `student_ids` (e.g. a job's applicants) for one job."""
+        with self._lock:
+            job_row = self.jobs.rows.get(job_id)
+            if job_row is None:
+                return []
+            rows = np.array([self.students.rows[s] for s in student_ids if s in self.students.rows], dtype=np.int64)
+            if not len(rows):
+                return []
+            cols = self.jobs.columns(job_row)
+            weights = self._weights()
+            bits = self.students.bits[rows]
+            matched = np.zeros(len(rows), dtype=np.float32)
+            overlap = np.zeros(len(rows), dtype=np.int32)
+            for col in cols:
+                hit = _bit(bits, col)
+                matched += weights[col] * hit
+                overlap += hit
+            total = weights[cols].sum() if len(cols) else 0.0
+            coverage = matched / total if total else np.ones(len(rows), dtype=np.float32)
+            margin = self._margin(self.students.value[rows], self.jobs.value[job_row])
+            score = self.skill_weight * coverage + self.cgpa_weight * margin
+            return self._top(self.students.ids[rows], score, coverage, overlap, k)
+
+    def rank_jobs(self, student_id, job_ids, k=10):
+        """Top-k of `job_ids` (e.g. the student's eligible open jobs) for one student."""
+        with self._lock:
+            student_row = self.students.rows.get(student_id)
+            rows = np.array([self.jobs.rows[j] for j in job_ids if j in self.jobs.rows], dtype=np.int64)
+            if student_row is None or not len(rows):
+                return []
+            cols = self.students.columns(student_row)
+            weights = self._weights()
+            bits = self.jobs.bits[rows]
+            matched = np.zeros(len(rows), dtype=np.float32)
+            overlap = np.zeros(len(rows), dtype=np.int32)
+            for col in cols:
+                hit = _bit(bits, col)
+                matched += weights[col] * hit
+                overlap += hit
+            n_cols = len(self.skill_cols)
+            totals = np.unpackbits(bits, axis=1)[:, :n_cols] @ weights[:n_cols]
+            coverage = np.where(totals > 0, matched / np.where(totals > 0, totals, 1), 1.0)
+            margin = self._margin(self.students.value[student_row], self.jobs.value[rows])
+            score = self.skill_weight * coverage + self.cgpa_weight * margin
+            return self._top(self.jobs.ids[rows], score, coverage, overlap, k)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "students": self.students.size,
+                "jobs": self.jobs.size,
+                "skills": len(self.skill_cols),
+                "bitset_bytes": int(self.students.bits.nbytes + self.jobs.bits.nbytes),
+                "loaded_seconds_ago": round(time.monotonic() - self._loaded_at, 1) if self._loaded_at else None,
+            }
@@ -0,0 +1,109 @@
+# migrations.py - versioned runner for database/migrations/NNN_name.sql
+#
+# Applied versions are recorded in SchemaMigration with a checksum of the file,
+# so each migration runs once per database and an edited, already-applied file
+# is refused rather than silently skipped. MySQL commits DDL implicitly, so a
+# migration that fails halfway is not rolled back; it stays unrecorded and is
+# retried after the cause is fixed (statements should be safe to re-run where
+# practical). Files may use "--" comment lines and ";"-terminated statements;
+# "USE" lines are ignored so the runner targets whatever database it is given.
+import hashlib
+import os
+import re
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "database", "migrations")
+
+_FILENAME_RE = re.compile(r"^(\d+)_([\w-]+)\.sql$")
+
+SCHEMA_MIGRATION_SQL = """
+    CREATE TABLE IF NOT EXISTS SchemaMigration (
+        version INT PRIMARY KEY,
+        name VARCHAR(200) NOT NULL,
+        checksum CHAR(64),
+        applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+"""
+
+
+# Checksums of earlier revisions of a file that an edit deliberately left equivalent for databases
+# that already applied them (001: the copy-collapsing step moved to database/collapse_broadcast_copies.sql)
+SUPERSEDED_CHECKSUMS = {
+    1: {"60e1bd8e77502653ca9418b1702cbd5aad180eb874a4e4fcea6826febb987afe"},
+}
+
+
+class MigrationError(Exception):
+    pass
+
+
+class Migration:
+    def __init__(self, version, name, sql):
+        self.version = version
+        self.name = name
+        self.sql = sql
+        self.checksum = hashlib.sha256(sql.encode("utf-8")).hexdigest()
+
+    def statements(self):
+        lines = [line for line in self.sql.splitlines() if not line.lstrip().startswith("--")]
+        for statement in "\n".join(lines).split(";"):
+            statement = statement.strip()
+            if statement and not statement.upper().startswith("USE "):
+                yield statement
+
+
+def load_migrations(directory=MIGRATIONS_DIR):
+    """Migration files in version order; duplicate version numbers are an error."""
+    migrations = {}
+    for filename in os.listdir(directory):
+        match = _FILENAME_RE.match(filename)
+        if not match:
+            continue
+        version = int(match.group(1))
+        if version in migrations:
+            raise MigrationError(f"Duplicate migration version {version}: {filename}")
+        with open(os.path.join(directory, filename), encoding="utf-8") as f:
+            migrations[version] = Migration(version, match.group(2), f.read())
+    return [migrations[v] for v in sorted(migrations)]
+
+
+def applied_versions(cur):
+    """{version: checksum} for everything recorded in SchemaMigration."""
+    cur.execute(SCHEMA_MIGRATION_SQL)
+    cur.execute("SELECT version, checksum FROM SchemaMigration")
+    return dict(cur.fetchall())
+
+
+def pending_migrations(cur, migrations):
+    applied = applied_versions(cur)
+    for m in migrations:
+        if m.version in applied and applied[m.version] not in (None, m.checksum) \
+                and applied[m.version] not in SUPERSEDED_CHECKSUMS.get(m.version, ()):
+            raise MigrationError(f"Migration {m.version:03d}_{m.name} was edited after it was applied")
+    return [m for m in migrations if m.version not in applied]
+
+
+def migrate(db, migrations, target=None, fake=False, log=print):
+    """Apply pending migrations up to `target` in order; returns the versions applied.
+
+    With fake=True they are only recorded (for databases built from schema.sql
+    before it listed its versions).
+    """
+    cur = db.cursor()
+    done = []
+    try:
+        for m in pending_migrations(cur, migrations):
+            if target is not None and m.version > target:
+                break
+            if not fake:
+                log(f"Applying {m.version:03d}_{m.name}")
+                for statement in m.statements():
+                    cur.execute(statement)
+                    if cur.with_rows:
+                        cur.fetchall()
+            cur.execute("INSERT INTO SchemaMigration (version, name, checksum) VALUES (%s, %s, %s)",
+                        (m.version, m.name, m.checksum))
+            db.commit()
+            done.append(m.version)
+    finally:
+        cur.close()
+    return done
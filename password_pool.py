@@ -0,0 +1,131 @@
+# password_pool.py - bounded worker pool for bcrypt hashing with admission control
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+
+import bcrypt
+
+from metrics import Histogram
+
+
+class PasswordPoolBusy(Exception):
+    """Raised when the pool's queue is full or a job outwaits its timeout; callers should answer 503."""
+
+    def __init__(self, retry_after):
+        super().__init__("password hashing pool is saturated")
+        self.retry_after = retry_after
+
+
+class PasswordHasher:
+    """Runs bcrypt off the request thread on a fixed number of workers.
+
+    At most `workers + max_queue` jobs are admitted at once; anything beyond
+    that is rejected immediately instead of piling up behind CPU-bound hashes.
+    bcrypt releases the GIL, so the workers hash in parallel. `observer`, if
+    given, is called as observer(kind, seconds) on the calling thread with the
+    time the caller spent waiting (queue plus hash).
+    """
+
+    def __init__(self, rounds=12, workers=4, max_queue=64, timeout=30.0, retry_after=1, observer=None, bulk_workers=2):
+        self.rounds = rounds
+        self.observer = observer
+        self.bulk_workers = bulk_workers
+        self._bulk = None
+        self.timeout = timeout
+        self.retry_after = retry_after
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="bcrypt")
+        self._slots = threading.BoundedSemaphore(workers + max_queue)
+        self.workers = workers
+        self.max_queue = max_queue
+        self._lock = threading.Lock()
+        self._pending = 0
+        self.rejected = 0
+        self.histograms = {"queue_wait": Histogram(), "hash": Histogram(), "check": Histogram()}
+
+    def _run(self, kind, fn, *args):
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self.rejected += 1
+            raise PasswordPoolBusy(self.retry_after)
+        submitted = time.perf_counter()
+
+        def task():
+            started = time.perf_counter()
+            self.histograms["queue_wait"].observe(started - submitted)
+            try:
+                return fn(*args)
+            finally:
+                self.histograms[kind].observe(time.perf_counter() - started)
+
+        def done(_):
+            with self._lock:
+                self._pending -= 1
+            self._slots.release()
+
+        with self._lock:
+            self._pending += 1
+        try:
+            future = self._executor.submit(task)
+        except Exception:
+            done(None)
+            raise
+        future.add_done_callback(done)
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeout:
+            # The hash still finishes on its worker and frees the slot then; the caller stops waiting
+            with self._lock:
+                self.rejected += 1
+            raise PasswordPoolBusy(self.retry_after) from None
+        finally:
+            if self.observer:
+                self.observer(kind, time.perf_counter() - submitted)
+
+    def hash(self, password):
+        return self._run("hash", lambda: bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt(self.rounds)))
+
+    def hash_many(self, passwords):
+        """Hash a batch (bulk imports) on separate workers, so logins keep the main pool."""
+        with self._lock:
+            if self._bulk is None:
+                self._bulk = ThreadPoolExecutor(max_workers=self.bulk_workers, thread_name_prefix="bcrypt-bulk")
+
+        def task(password):
+            started = time.perf_counter()
+            try:
+                return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt(self.rounds))
+            finally:
+                self.histograms["hash"].observe(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        try:
+            return list(self._bulk.map(task, passwords))
+        finally:
+            if self.observer:
+                self.observer("hash", time.perf_counter() - started)
+
+    def check(self, password, stored):
+        if isinstance(stored, str):
+            stored = stored.encode("utf-8")
+        return self._run("check", bcrypt.checkpw, password.encode("utf-8"), stored)
+
+    def needs_rehash(self, stored):
+        """True when a stored hash was made with a different cost than self.rounds."""
+        if isinstance(stored, bytes):
+            stored = stored.decode("utf-8")
+        try:
+            return int(stored.split("$")[2]) != self.rounds
+        except (IndexError, ValueError):
+            return True
+
+    def stats(self):
+        with self._lock:
+            pending, rejected = self._pending, self.rejected
+        return {
+            "rounds": self.rounds,
+            "workers": self.workers,
+            "max_queue": self.max_queue,
+            "pending": pending,
+            "rejected": rejected,
+            "latency_seconds": {name: h.snapshot() for name, h in self.histograms.items()},
+        }
@@ -0,0 +1,142 @@
+# reports.py - ApplicationSummary maintenance and report queries
+#
+# ApplicationSummary holds application counts per (job, student branch, month
+# applied, status). Every write that adds, removes or moves an application calls
+# shift_application_summary() inside the same transaction, so reports never
+# have to scan Application.
+
+# group_by -> (key expression, label expression)
+REPORT_GROUPS = {
+    "branch": ("r.branch", "r.branch"),
+    "job": ("r.job_id", "j.title"),
+    "officer": ("j.officer_id", "o.name"),
+    "month": ("r.month", "r.month"),
+    "year": ("YEAR(r.month)", "YEAR(r.month)"),
+}
+
+STATUS_KEYS = {"Applied": "applied", "Shortlisted": "shortlisted", "Selected": "selected", "Rejected": "rejected"}
+
+
+def shift_application_summary(cur, where, params, sign):
+    """Add (sign=1) or remove (sign=-1) the Application rows matching `where` from the summary.
+
+    `where` is SQL over `a` (Application) and `s` (students). Call with -1 before
+    changing or deleting rows and with +1 after inserting or changing them.
+    """
+    cur.execute(*application_summary_shift(where, params, sign))
+
+
+def application_summary_shift(where, params, sign):
+    """(sql, params) for shift_application_summary, for callers with their own cursor type."""
+    return (f"""
+        INSERT INTO ApplicationSummary (job_id, branch, month, status, app_count)
+        SELECT a.job_id, s.branch, DATE(a.applied_on - INTERVAL DAYOFMONTH(a.applied_on) - 1 DAY) AS month,
+               a.status, COUNT(*) * %s
+        FROM Application a
+        JOIN students s ON s.student_id = a.student_id
+        WHERE {where}
+        GROUP BY a.job_id, s.branch, month, a.status
+        ON DUPLICATE KEY UPDATE app_count = app_count + VALUES(app_count)
+    """, [sign] + list(params))
+
+
+def rebuild_application_summary(db):
+    """Recompute ApplicationSummary from scratch; returns the number of summary rows."""
+    cur = db.cursor()
+    try:
+        cur.execute("DELETE FROM ApplicationSummary")
+        shift_application_summary(cur, "1 = 1", [], 1)
+        cur.execute("SELECT COUNT(*) FROM ApplicationSummary")
+        rows = cur.fetchone()[0]
+        db.commit()
+        return rows
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        cur.close()
+
+
+def _weighted_median(pairs):
+    """Median of values given as sorted (value, count) pairs."""
+    total = sum(n for _, n in pairs)
+    if not total:
+        return None
+    seen = 0
+    for i, (value, n) in enumerate(pairs):
+        seen += n
+        if seen * 2 > total:
+            return value
+        if seen * 2 == total:
+            return (value + pairs[i + 1][0]) / 2
+    return pairs[-1][0]
+
+
+def _group_order(key):
+    """Natural order for group keys (ids numerically, months by date); None last, mixed types apart."""
+    return key is None, type(key).__name__, key
+
+
+def fetch_report(cur, group_by, filters):
+    """Report rows for one grouping.
+
+    `filters` may hold branch, job_id, officer_id, month_from and month_to
+    (dates; month_to inclusive). Each row has counts per status, total_applications,
+    selection_rate and the average/median package over selected applications.
+    """
+    key_expr, label_expr = REPORT_GROUPS[group_by]
+    where, params = ["r.app_count <> 0"], []
+    for column, key in (("r.branch", "branch"), ("r.job_id", "job_id"), ("j.officer_id", "officer_id")):
+        if filters.get(key) is not None:
+            where.append(f"{column} = %s")
+            params.append(filters[key])
+    if filters.get("month_from"):
+        where.append("r.month >= %s")
+        params.append(filters["month_from"])
+    if filters.get("month_to"):
+        where.append("r.month <= %s")
+        params.append(filters["month_to"])
+    source = f"""
+        FROM ApplicationSummary r
+        JOIN JobPosting j ON j.job_id = r.job_id
+        JOIN PlacementOfficer o ON o.officer_id = j.officer_id
+        WHERE {" AND ".join(where)}
+    """
+
+    cur.execute(f"""
+        SELECT {key_expr} AS group_key, {label_expr} AS label, r.status, SUM(r.app_count) AS n
+        {source}
+        GROUP BY group_key, label, r.status
+    """, params)
+    groups = {}
+    for key, label, status, n in cur.fetchall():
+        row = groups.setdefault(key, {
+            group_by: key, "label": str(label)[:7] if group_by == "month" else label,
+            "applied": 0, "shortlisted": 0, "selected": 0, "rejected": 0,
+        })
+        row[STATUS_KEYS[status]] += int(n)
+
+    cur.execute(f"""
+        SELECT {key_expr} AS group_key, j.package_stipend, SUM(r.app_count) AS n
+        {source} AND r.status = 'Selected' AND j.package_stipend IS NOT NULL
+        GROUP BY group_key, j.package_stipend
+        ORDER BY group_key, j.package_stipend
+    """, params)
+    packages = {}
+    for key, package, n in cur.fetchall():
+        if int(n) > 0:
+            packages.setdefault(key, []).append((float(package), int(n)))
+
+    report = []
+    for key in sorted(groups, key=_group_order):
+        row = groups[key]
+        row["total_applications"] = row["applied"] + row["shortlisted"] + row["selected"] + row["rejected"]
+        row["selection_rate"] = round(row["selected"] / row["total_applications"], 4) if row["total_applications"] else 0.0
+        pairs = packages.get(key, [])
+        offers = sum(n for _, n in pairs)
+        row["avg_package"] = round(sum(v * n for v, n in pairs) / offers, 2) if offers else None
+        row["median_package"] = _weighted_median(pairs)
+        if group_by == "month":
+            row["month"] = row["label"]
+        report.append(row)
+    return report
@@ -0,0 +1,133 @@
+# response_cache.py - read-through cache for hot GET responses with tag invalidation
+#
+# Entries are stored with the versions of their tags at the time the response
+# was computed. Write paths call invalidate(tag), which bumps the tag's version;
+# any entry recorded against an older version is treated as a miss. Bumping a
+# counter works the same way in-process and in a shared store.
+import pickle
+import threading
+import time
+from collections import OrderedDict
+
+
+class LocalBackend:
+    """In-process store: one LRU per route, bounded by that route's maxsize."""
+
+    def __init__(self):
+        self._routes = {}
+        self._tags = {}
+        self._lock = threading.Lock()
+
+    def get(self, route, key):
+        with self._lock:
+            entries = self._routes.get(route)
+            item = entries.get(key) if entries else None
+            if item is None:
+                return None
+            value, expires_at = item
+            if expires_at <= time.monotonic():
+                del entries[key]
+                return None
+            entries.move_to_end(key)
+            return value
+
+    def set(self, route, key, value, ttl, maxsize):
+        with self._lock:
+            entries = self._routes.setdefault(route, OrderedDict())
+            entries[key] = (value, time.monotonic() + ttl)
+            entries.move_to_end(key)
+            while len(entries) > maxsize:
+                entries.popitem(last=False)
+
+    def tag_versions(self, tags):
+        with self._lock:
+            return [self._tags.get(tag, 0) for tag in tags]
+
+    def bump(self, tags):
+        with self._lock:
+            for tag in tags:
+                self._tags[tag] = self._tags.get(tag, 0) + 1
+
+    def size(self, route):
+        with self._lock:
+            return len(self._routes.get(route, ()))
+
+
+class RedisBackend:
+    """Shared store so every worker sees the same entries and invalidations.
+
+    Requires the optional `redis` package. Per-route size bounds are left to
+    the server's maxmemory/LRU policy; TTLs are set per entry.
+    """
+
+    def __init__(self, url, prefix="placement:cache:"):
+        try:
+            import redis
+        except ImportError as e:
+            raise RuntimeError("RESPONSE_CACHE_BACKEND=redis needs the 'redis' package installed") from e
+        self._redis = redis.Redis.from_url(url)
+        self._prefix = prefix
+
+    def get(self, route, key):
+        raw = self._redis.get(f"{self._prefix}{route}:{key}")
+        return pickle.loads(raw) if raw is not None else None
+
+    def set(self, route, key, value, ttl, maxsize):
+        self._redis.set(f"{self._prefix}{route}:{key}", pickle.dumps(value), ex=max(1, int(ttl)))
+
+    def tag_versions(self, tags):
+        if not tags:
+            return []
+        return [int(v or 0) for v in self._redis.mget([f"{self._prefix}tag:{t}" for t in tags])]
+
+    def bump(self, tags):
+        pipe = self._redis.pipeline()
+        for tag in tags:
+            pipe.incr(f"{self._prefix}tag:{tag}")
+        pipe.execute()
+
+    def size(self, route):
+        return None
+
+
+class ResponseCache:
+    def __init__(self, backend, routes):
+        """`routes` maps route name -> {"ttl": seconds, "maxsize": entries}."""
+        self.backend = backend
+        self.routes = routes
+        self._counters = {name: {"hits": 0, "misses": 0, "stale": 0} for name in routes}
+        self._lock = threading.Lock()
+
+    def _count(self, route, outcome):
+        with self._lock:
+            self._counters[route][outcome] += 1
+
+    def lookup(self, route, key, tags):
+        """Return (cached value or None, tag versions to store a fresh value with)."""
+        versions = self.backend.tag_versions(tags)
+        entry = self.backend.get(route, key)
+        if entry is not None:
+            if entry["tags"] == dict(zip(tags, versions)):
+                self._count(route, "hits")
+                return entry["value"], versions
+            self._count(route, "stale")
+        self._count(route, "misses")
+        return None, versions
+
+    def store(self, route, key, value, tags, versions):
+        config = self.routes[route]
+        self.backend.set(route, key, {"value": value, "tags": dict(zip(tags, versions))}, config["ttl"], config["maxsize"])
+
+    def invalidate(self, *tags):
+        self.backend.bump(tags)
+
+    def stats(self):
+        with self._lock:
+            counters = {name: dict(c) for name, c in self._counters.items()}
+        for name, c in counters.items():
+            lookups = c["hits"] + c["misses"]
+            c["hit_rate"] = round(c["hits"] / lookups, 4) if lookups else 0.0
+            c["ttl"] = self.routes[name]["ttl"]
+            c["maxsize"] = self.routes[name]["maxsize"]
+            c["size"] = self.backend.size(name)
+        return counters
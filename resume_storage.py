@@ -0,0 +1,218 @@
+# resume_storage.py - content-addressed, deduplicated storage for uploaded resumes
+import hashlib
+import os
+import re
+import time
+import uuid
+import zipfile
+
+BLOB_PREFIX = "blobs/"
+_SHA256_RE = re.compile(r"^[0-9a-f]{64}$")
+
+PDF = "application/pdf"
+DOC = "application/msword"
+DOCX = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+RESUME_TYPES = (PDF, DOC, DOCX)
+_OLE2_MAGIC = b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1"
+
+
+def sniff_type(path):
+    """PDF, DOC or DOCX from a file's own bytes (never the uploader's header), or None."""
+    with open(path, "rb") as f:
+        head = f.read(8)
+    if head.startswith(b"%PDF-"):
+        return PDF
+    if head == _OLE2_MAGIC:
+        return DOC
+    if head.startswith(b"PK\x03\x04"):
+        # Any zip starts like this; a Word document has its main part at word/document.xml
+        try:
+            with zipfile.ZipFile(path) as z:
+                if "word/document.xml" in z.namelist():
+                    return DOCX
+        except zipfile.BadZipFile:
+            return None
+    return None
+
+
+class UploadTooLarge(Exception):
+    """Raised when an upload exceeds the configured size cap."""
+
+    def __init__(self, max_bytes):
+        super().__init__(f"upload exceeds {max_bytes} bytes")
+        self.max_bytes = max_bytes
+
+
+class UnsupportedType(Exception):
+    """Raised when an upload's content is not one of the store's allowed types."""
+
+    def __init__(self, allowed):
+        super().__init__("upload is not an allowed file type")
+        self.allowed = allowed
+
+
+class BlobStore:
+    """Stores each distinct file once under blobs/<aa>/<sha256>.
+
+    Uploads are streamed to a temp file in fixed-size chunks while the SHA-256
+    is computed, then renamed into place; identical content reuses the existing
+    blob. Database columns keep the reference "blobs/<sha256>" rather than a path.
+    The type of each upload is sniffed from its bytes before it is placed, and
+    anything outside `allowed_types` is refused.
+    """
+
+    def __init__(self, root, max_bytes=5 * 1024 * 1024, chunk_size=64 * 1024, allowed_types=RESUME_TYPES):
+        self.root = root
+        self.allowed_types = allowed_types
+        self.max_bytes = max_bytes
+        self.chunk_size = chunk_size
+        self._tmp = os.path.join(root, "tmp")
+        self._blobs = os.path.join(root, "blobs")
+        os.makedirs(self._tmp, exist_ok=True)
+        os.makedirs(self._blobs, exist_ok=True)
+
+    # ---------------------------
+    # References
+    # ---------------------------
+    @staticmethod
+    def ref_for(digest):
+        return BLOB_PREFIX + digest
+
+    @staticmethod
+    def digest_of(ref):
+        """The sha256 in a blob reference, or None for legacy absolute paths."""
+        if ref and ref.startswith(BLOB_PREFIX) and _SHA256_RE.match(ref[len(BLOB_PREFIX):]):
+            return ref[len(BLOB_PREFIX):]
+        return None
+
+    def blob_path(self, digest):
+        return os.path.join(self._blobs, digest[:2], digest)
+
+    def resolve(self, ref):
+        """Filesystem path for a stored reference (blob or legacy path), or None."""
+        digest = self.digest_of(ref)
+        if digest:
+            return self.blob_path(digest)
+        return ref or None
+
+    def exists(self, ref):
+        path = self.resolve(ref)
+        return bool(path and os.path.exists(path))
+
+    # ---------------------------
+    # Writing
+    # ---------------------------
+    def _check_type(self, tmp_path):
+        content_type = sniff_type(tmp_path)
+        if content_type not in self.allowed_types:
+            raise UnsupportedType(self.allowed_types)
+        return content_type
+
+    def save(self, stream):
+        """Stream a file-like object into the store; returns (ref, sha256, size, content type)."""
+        tmp_path = os.path.join(self._tmp, uuid.uuid4().hex)
+        sha = hashlib.sha256()
+        size = 0
+        try:
+            with open(tmp_path, "wb") as out:
+                while True:
+                    chunk = stream.read(self.chunk_size)
+                    if not chunk:
+                        break
+                    size += len(chunk)
+                    if size > self.max_bytes:
+                        raise UploadTooLarge(self.max_bytes)
+                    sha.update(chunk)
+                    out.write(chunk)
+            content_type = self._check_type(tmp_path)
+            digest = sha.hexdigest()
+            self._place(tmp_path, digest)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        return self.ref_for(digest), digest, size, content_type
+
+    async def save_async(self, read):
+        """save() for async servers: `read(n)` is a coroutine returning up to n bytes.
+
+        Chunks are written with aiofiles so the event loop never blocks on disk.
+        """
+        import asyncio
+        import aiofiles
+        import aiofiles.os
+
+        tmp_path = os.path.join(self._tmp, uuid.uuid4().hex)
+        sha = hashlib.sha256()
+        size = 0
+        try:
+            async with aiofiles.open(tmp_path, "wb") as out:
+                while True:
+                    chunk = await read(self.chunk_size)
+                    if not chunk:
+                        break
+                    size += len(chunk)
+                    if size > self.max_bytes:
+                        raise UploadTooLarge(self.max_bytes)
+                    sha.update(chunk)
+                    await out.write(chunk)
+            content_type = await asyncio.to_thread(self._check_type, tmp_path)
+            digest = sha.hexdigest()
+            await asyncio.to_thread(self._place, tmp_path, digest)
+        except BaseException:
+            if await aiofiles.os.path.exists(tmp_path):
+                await aiofiles.os.remove(tmp_path)
+            raise
+        return self.ref_for(digest), digest, size, content_type
+
+    def _place(self, tmp_path, digest):
+        """Move a fully written temp file to its blob path, or drop it if the blob exists."""
+        final_path = self.blob_path(digest)
+        if os.path.exists(final_path):
+            os.remove(tmp_path)
+            # Refresh mtime so a concurrent collect() treats the reused blob as new
+            os.utime(final_path)
+        else:
+            os.makedirs(os.path.dirname(final_path), exist_ok=True)
+            os.replace(tmp_path, final_path)
+
+    # ---------------------------
+    # Garbage collection
+    # ---------------------------
+    def iter_digests(self):
+        for shard in os.listdir(self._blobs):
+            shard_dir = os.path.join(self._blobs, shard)
+            if os.path.isdir(shard_dir):
+                for name in os.listdir(shard_dir):
+                    if _SHA256_RE.match(name):
+                        yield name
+
+    def collect(self, referenced, grace_seconds=3600):
+        """Delete blobs not in `referenced` and older than the grace period.
+
+        The grace period protects blobs written by uploads whose database
+        transaction has not committed yet. Returns (deleted_count, freed_bytes).
+        """
+        deleted, freed = 0, 0
+        cutoff = time.time() - grace_seconds
+        for digest in list(self.iter_digests()):
+            if digest in referenced:
+                continue
+            path = self.blob_path(digest)
+            try:
+                stat = os.stat(path)
+                if stat.st_mtime > cutoff:
+                    continue
+                os.remove(path)
+            except FileNotFoundError:
+                continue
+            deleted += 1
+            freed += stat.st_size
+        for name in os.listdir(self._tmp):
+            path = os.path.join(self._tmp, name)
+            try:
+                if os.stat(path).st_mtime <= cutoff:
+                    os.remove(path)
+            except FileNotFoundError:
+                pass
+        return deleted, freed
@@ -0,0 +1,301 @@
+# resume_text.py - background resume text extraction and keyword search over resumes
+#
+# Upload handlers enqueue a "resumes.extract" task (task_queue.py) in their
+# transaction and return; the task calls ResumeExtractor.process(), which skips
+# blobs whose text is already stored (identical uploads share a digest), runs
+# extract_text() in a process pool and stores the result in ResumeText. Nothing
+# here runs on the request path.
+#
+# The task runs in a worker process, so it cannot touch the web processes'
+# indexes. Instead every change bumps ResumeText.updated_at. Each ResumeSearch
+# checks that watermark on search, at most every check_seconds, and re-indexes
+# the students whose resumes changed since its last check.
+#
+# PDF text needs pypdf (pip install pypdf); without it PDF resumes are marked
+# failed with that message. Plain-text blobs from before uploads were limited to
+# PDF/DOC/DOCX (resume_storage.RESUME_TYPES) are still read.
+import datetime
+import heapq
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from resume_storage import BLOB_PREFIX
+from search_index import InvertedIndex
+
+# Text of every resume a student has uploaded (profile and applications), one row per
+# resume; {where} narrows both halves, see ResumeSearch._rows for the parameters
+STUDENT_RESUMES_SQL = """
+    SELECT r.student_id, s.branch, s.cgpa, t.text
+    FROM (
+        SELECT student_id, resume_path FROM students WHERE resume_path LIKE %s {where}
+        UNION
+        SELECT student_id, resume_path FROM Application WHERE resume_path LIKE %s {where}
+    ) r
+    JOIN students s ON s.student_id = r.student_id
+    JOIN ResumeText t ON t.sha256 = SUBSTRING(r.resume_path, %s) AND t.status = 'done'
+    ORDER BY r.student_id
+"""
+
+# Tells every ResumeSearch that a blob's text (or who uses it) changed; a no-op before extraction
+RESUME_TEXT_TOUCH_SQL = "UPDATE ResumeText SET updated_at = NOW(3) WHERE sha256 = %s"
+
+# Students that use any of the given resume references
+RESUME_USERS_SQL = """
+    SELECT student_id FROM students WHERE resume_path IN ({refs})
+    UNION
+    SELECT student_id FROM Application WHERE resume_path IN ({refs})
+"""
+
+# Rows written within this many seconds before the watermark may have committed after it was read
+COMMIT_LAG_SECONDS = 5
+
+
+def extract_text(path, content_type, max_chars):
+    """Runs in a worker process: the text of a PDF or plain-text resume, truncated to max_chars."""
+    with open(path, "rb") as f:
+        head = f.read(max_chars)
+    if head.startswith(b"%PDF"):
+        try:
+            from pypdf import PdfReader
+        except ImportError:
+            raise RuntimeError("PDF text extraction requires pypdf (pip install pypdf)")
+        parts, size = [], 0
+        for page in PdfReader(path).pages:
+            text = page.extract_text() or ""
+            parts.append(text)
+            size += len(text)
+            if size >= max_chars:
+                break
+        return " ".join(parts)[:max_chars]
+    if (content_type or "").startswith("text/"):
+        return head.decode("utf-8", errors="replace")
+    raise ValueError(f"Unsupported resume type: {content_type}")
+
+
+class ResumeExtractor:
+    """Extracts resume blobs' text in a process pool, one blob per process() call.
+
+    Parsing runs in one of `workers` processes so a malformed PDF never holds
+    the caller's GIL, and is given up on after `timeout`. Either way the row's
+    updated_at moves, which is how ResumeSearch picks the text up. A broken
+    pool is raised (the task is retried); a file that cannot be parsed is
+    recorded as failed.
+    """
+
+    def __init__(self, store, workers=2, max_chars=20000, timeout=60):
+        self.store = store
+        self.workers = workers
+        self.max_chars = max_chars
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._processes = None
+        self._stats = {"extracted": 0, "reused": 0, "failed": 0}
+
+    def _pool(self):
+        with self._lock:
+            if self._processes is None:
+                # spawn: forking a threaded server process can copy held locks
+                self._processes = ProcessPoolExecutor(max_workers=self.workers,
+                                                      mp_context=multiprocessing.get_context("spawn"))
+            return self._processes
+
+    def _count(self, **changes):
+        with self._lock:
+            for name, delta in changes.items():
+                self._stats[name] += delta
+
+    def process(self, db, digest, content_type, student_id=None):
+        """Extract and store one blob's text unless it is already stored; commits."""
+        cur = db.cursor()
+        try:
+            cur.execute("SELECT status FROM ResumeText WHERE sha256 = %s", (digest,))
+            if cur.fetchone():
+                self._count(reused=1)
+                if student_id is not None:
+                    # Stored text, new user: their index entry still has to pick it up
+                    cur.execute(RESUME_TEXT_TOUCH_SQL, (digest,))
+                db.commit()
+            else:
+                # Nothing is written yet; end the read before the slow extraction
+                db.rollback()
+                future = self._pool().submit(extract_text, self.store.blob_path(digest), content_type, self.max_chars)
+                try:
+                    text, status, error = future.result(timeout=self.timeout), "done", None
+                    self._count(extracted=1)
+                except BrokenProcessPool:
+                    with self._lock:
+                        self._processes = None
+                    raise
+                except Exception as e:
+                    text, status, error = None, "failed", f"{type(e).__name__}: {e}"[:255]
+                    self._count(failed=1)
+                cur.execute("""
+                    INSERT INTO ResumeText (sha256, status, text, error, updated_at) VALUES (%s, %s, %s, %s, NOW(3))
+                    ON DUPLICATE KEY UPDATE status = VALUES(status), text = VALUES(text), error = VALUES(error),
+                                            extracted_at = CURRENT_TIMESTAMP, updated_at = NOW(3)
+                """, (digest, status, text, error))
+                db.commit()
+        finally:
+            cur.close()
+
+    @staticmethod
+    def missing(cur):
+        """(sha256, content_type) of every stored blob that has no extracted text yet."""
+        cur.execute("""
+            SELECT b.sha256, b.content_type FROM ResumeBlob b
+            LEFT JOIN ResumeText t ON t.sha256 = b.sha256
+            WHERE t.sha256 IS NULL
+        """)
+        return cur.fetchall()
+
+    def stats(self):
+        with self._lock:
+            return dict(self._stats, workers=self.workers)
+
+
+class ResumeSearch:
+    """BM25 keyword search over each student's resume text, filtered by branch and CGPA.
+
+    One document per student holds the text of all their resumes. Built
+    lazily from ResumeText and rebuilt after `reload_seconds`. In between,
+    ensure_loaded() re-indexes the students whose resume text changed (by
+    ResumeText.updated_at), checking at most every `check_seconds`, so an
+    extraction in a task worker is searchable in every process within seconds.
+    """
+
+    def __init__(self, reload_seconds=3600, check_seconds=2, fetch_size=500):
+        self.reload_seconds = reload_seconds
+        self.check_seconds = check_seconds
+        self.fetch_size = fetch_size
+        self.index = InvertedIndex({"text": 1.0})
+        self._students = {}  # student_id -> (branch, cgpa)
+        self._lock = threading.Lock()
+        self._loaded_at = None
+        self._checked_at = None
+        self._watermark = None  # newest ResumeText.updated_at applied
+        self._applied = {}  # sha256 -> updated_at, for rows inside the commit-lag window
+
+    def _rows(self, cur, where="", params=()):
+        like = BLOB_PREFIX + "%"
+        cur.execute(STUDENT_RESUMES_SQL.format(where=where),
+                    [like, *params, like, *params, len(BLOB_PREFIX) + 1])
+        while True:
+            rows = cur.fetchmany(self.fetch_size)
+            if not rows:
+                return
+            yield from rows
+
+    @staticmethod
+    def _grouped(rows):
+        """Collapse consecutive rows of one student into (student_id, branch, cgpa, text)."""
+        current = None
+        for student_id, branch, cgpa, text in rows:
+            if current and current[0] == student_id:
+                current[3].append(text)
+                continue
+            if current:
+                yield current[0], current[1], current[2], "\n".join(current[3])
+            current = (student_id, branch, float(cgpa), [text])
+        if current:
+            yield current[0], current[1], current[2], "\n".join(current[3])
+
+    @staticmethod
+    def _now_watermark(cur):
+        cur.execute("SELECT MAX(updated_at) FROM ResumeText")
+        return cur.fetchone()[0] or datetime.datetime(1970, 1, 2)
+
+    def _catch_up(self, cur):
+        """Re-index the students using any resume whose text changed since the watermark."""
+        cur.execute("""
+            SELECT sha256, updated_at FROM ResumeText
+            WHERE updated_at > %s - INTERVAL %s SECOND
+        """, (self._watermark, COMMIT_LAG_SECONDS))
+        changed = {sha256: updated_at for sha256, updated_at in cur.fetchall()}
+        digests = [sha256 for sha256, updated_at in changed.items() if self._applied.get(sha256) != updated_at]
+        self._applied = changed
+        if not digests:
+            return 0
+        self._watermark = max(self._watermark, *changed.values())
+        refs = [BLOB_PREFIX + digest for digest in digests]
+        placeholders = ",".join(["%s"] * len(refs))
+        cur.execute(RESUME_USERS_SQL.format(refs=placeholders), refs + refs)
+        student_ids = [row[0] for row in cur.fetchall()]
+        for student_id in student_ids:
+            self.refresh_student(cur, student_id)
+        return len(student_ids)
+
+    def ensure_loaded(self, get_db):
+        with self._lock:
+            now = time.monotonic()
+            if self._loaded_at is not None and now - self._loaded_at < self.reload_seconds:
+                if now - self._checked_at < self.check_seconds:
+                    return
+                db = get_db()
+                cur = db.cursor()
+                try:
+                    self._catch_up(cur)
+                    self._checked_at = now
+                finally:
+                    cur.close()
+                    db.rollback()
+                    db.close()
+                return
+            db = get_db()
+            cur = db.cursor()
+            try:
+                # Read before the rows, so a change made during the build is caught up on next time
+                watermark = self._now_watermark(cur)
+                index, students = InvertedIndex({"text": 1.0}), {}
+                for student_id, branch, cgpa, text in self._grouped(self._rows(cur)):
+                    students[student_id] = (branch, cgpa)
+                    index.add(student_id, text=text)
+                # Build aside and swap, so searches never see a half-built index
+                self.index, self._students = index, students
+                self._loaded_at = self._checked_at = time.monotonic()
+                self._watermark, self._applied = watermark, {}
+            finally:
+                cur.close()
+                db.rollback()
+                db.close()
+
+    def refresh_student(self, cur, student_id):
+        """Re-read one student's resumes, branch and CGPA (no-op until the index is loaded)."""
+        if self._loaded_at is None:
+            return
+        found = list(self._grouped(self._rows(cur, "AND student_id = %s", [student_id])))
+        if not found:
+            self.index.remove(student_id)
+            self._students.pop(student_id, None)
+            return
+        _, branch, cgpa, text = found[0]
+        self._students[student_id] = (branch, cgpa)
+        self.index.add(student_id, text=text)
+
+    def search(self, query, branch=None, cgpa_min=None, cgpa_max=None, limit=20, after=None):
+        """Same contract as JobSearch.search: (page of (student_id, score), next_after, total)."""
+        index, students = self.index, self._students
+
+        def accept(student_id):
+            meta = students.get(student_id)
+            return (meta is not None
+                    and (branch is None or meta[0] == branch)
+                    and (cgpa_min is None or meta[1] >= cgpa_min)
+                    and (cgpa_max is None or meta[1] <= cgpa_max))
+
+        scores = index.scores(query, accept)
+        ranked = ((-score, student_id) for student_id, score in scores.items())
+        if after:
+            bound = (-after[0], after[1])
+            ranked = (key for key in ranked if key > bound)
+        top = heapq.nsmallest(limit + 1, ranked)
+        page = [(student_id, -neg_score) for neg_score, student_id in top[:limit]]
+        next_after = [page[-1][1], page[-1][0]] if len(top) > limit else None
+        return page, next_after, len(scores)
+
+    def stats(self):
+        return dict(self.index.stats(),
+                    loaded_seconds_ago=round(time.monotonic() - self._loaded_at, 1) if self._loaded_at else None,
+                    watermark=str(self._watermark) if self._watermark else None)
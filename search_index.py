@@ -0,0 +1,118 @@
+# search_index.py - in-process inverted index with BM25 ranking
+import math
+import re
+import threading
+
+_TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#]*(?:\.[a-z0-9]+)*")
+
+STOPWORDS = frozenset("""
+a an and are as at be by for from has have in is it its of on or our the this to we will with you your
+""".split())
+
+
+def tokenize(text):
+    """Lower-cased word tokens; keeps c++, c#, node.js and similar intact."""
+    return [t for t in _TOKEN_RE.findall((text or "").lower()) if t not in STOPWORDS]
+
+
+class InvertedIndex:
+    """Term -> {doc_id: weighted term frequency}, scored with BM25.
+
+    Each document is a set of named fields; a term's frequency in a field is
+    multiplied by the field's weight (title matches count more than body text)
+    before the usual BM25 saturation and length normalisation. Documents are
+    added, replaced and removed one at a time, so the index can follow writes.
+    """
+
+    def __init__(self, field_weights, k1=1.2, b=0.75):
+        self.field_weights = dict(field_weights)
+        self.k1 = k1
+        self.b = b
+        self._lock = threading.RLock()
+        self.clear()
+
+    def __len__(self):
+        return len(self._lengths)
+
+    def __contains__(self, doc_id):
+        return doc_id in self._lengths
+
+    def _remove(self, doc_id):
+        length = self._lengths.pop(doc_id, None)
+        if length is None:
+            return
+        self._total_length -= length
+        for term in list(self._terms.pop(doc_id)):
+            docs = self._postings[term]
+            docs.pop(doc_id, None)
+            if not docs:
+                del self._postings[term]
+
+    def clear(self):
+        with self._lock:
+            self._postings, self._lengths, self._terms = {}, {}, {}
+            self._total_length = 0.0
+
+    def add(self, doc_id, **fields):
+        """Index (or re-index) one document from its field texts."""
+        weighted = {}
+        length = 0.0
+        for field, text in fields.items():
+            weight = self.field_weights[field]
+            for term in tokenize(text):
+                weighted[term] = weighted.get(term, 0.0) + weight
+                length += weight
+        with self._lock:
+            self._remove(doc_id)
+            for term, tf in weighted.items():
+                self._postings.setdefault(term, {})[doc_id] = tf
+            self._terms[doc_id] = tuple(weighted)
+            self._lengths[doc_id] = length
+            self._total_length += length
+
+    def remove(self, doc_id):
+        with self._lock:
+            self._remove(doc_id)
+
+    def search(self, query, accept=None):
+        """[(doc_id, score)] for documents matching any query term, best first."""
+        return sorted(self.scores(query, accept).items(), key=lambda item: (-item[1], item[0]))
+
+    def scores(self, query, accept=None):
+        """{doc_id: BM25 score} for documents matching any query term.
+
+        `accept(doc_id)` filters candidates before they are scored.
+        """
+        terms = set(tokenize(query))
+        scores, rejected = {}, set()
+        with self._lock:
+            n = len(self._lengths)
+            if not n or not terms:
+                return {}
+            k1, lengths = self.k1, self._lengths
+            # Per-document length normalisation, K = k1 * (1 - b + b * len / avg_len)
+            base, per_length = k1 * (1 - self.b), k1 * self.b * n / (self._total_length or 1.0)
+            for term in terms:
+                docs = self._postings.get(term)
+                if not docs:
+                    continue
+                idf = math.log(1 + (n - len(docs) + 0.5) / (len(docs) + 0.5))
+                for doc_id, tf in docs.items():
+                    if doc_id in rejected:
+                        continue
+                    score = scores.get(doc_id)
+                    if score is None:
+                        if accept is not None and not accept(doc_id):
+                            rejected.add(doc_id)
+                            continue
+                        score = 0.0
+                    scores[doc_id] = score + idf * tf * (k1 + 1) / (tf + base + per_length * lengths[doc_id])
+        return scores
+
+    def stats(self):
+        with self._lock:
+            return {
+                "documents": len(self._lengths),
+                "terms": len(self._postings),
+                "postings": sum(len(docs) for docs in self._postings.values()),
+            }
@@ -0,0 +1,108 @@
+# skills.py - skill-name resolution with an in-process cache and set-based link syncing
+import threading
+
+# Link tables and the column naming their owner
+SKILL_LINK_TABLES = {
+    "StudentSkill": "student_id",
+    "JobSkill": "job_id",
+}
+
+
+def normalize_skill(name):
+    """Collapse internal whitespace and trim; returns '' for blank names."""
+    return " ".join(str(name).split())
+
+
+def skill_key(name):
+    """Cache key: Skill.skill_name uses a case-insensitive collation, so fold case too."""
+    return normalize_skill(name).casefold()
+
+
+class SkillResolver:
+    """Maps skill names to Skill.skill_id, creating missing skills in one statement.
+
+    Skill ids never change once committed, so resolved ids are cached for the
+    life of the process; call invalidate() if skills are ever deleted. A skill
+    created by resolve() only exists once the caller's transaction commits, so
+    its id goes into the caller's `pending` dict instead of the cache, and the
+    caller hands that dict to publish() after committing. On rollback the
+    caller simply drops it.
+    """
+
+    def __init__(self):
+        self._ids = {}
+        self._lock = threading.Lock()
+
+    def invalidate(self):
+        with self._lock:
+            self._ids.clear()
+
+    def publish(self, pending):
+        """Cache the ids resolve() created, once the transaction that created them has committed."""
+        with self._lock:
+            self._ids.update(pending)
+        pending.clear()
+
+    @staticmethod
+    def _select(cur, names, locking=False):
+        """Ids for `names`; locking=True reads the latest committed rows instead of the transaction's snapshot."""
+        cur.execute(f"SELECT skill_id, skill_name FROM Skill WHERE skill_name IN ({','.join(['%s'] * len(names))})"
+                    + (" FOR SHARE" if locking else ""), names)
+        return {skill_key(skill_name): skill_id for skill_id, skill_name in cur.fetchall()}
+
+    def resolve(self, cur, names, pending=None):
+        """Return {skill_key: skill_id} for the given names, inserting unknown skills.
+
+        Without `pending` nothing this call finds is cached, since the
+        transaction may already hold uncommitted skills of its own.
+        """
+        wanted = {}
+        for name in names:
+            normalized = normalize_skill(name)
+            if normalized:
+                wanted.setdefault(normalized.casefold(), normalized)
+        with self._lock:
+            ids = {key: self._ids[key] for key in wanted if key in self._ids}
+        missing = [wanted[key] for key in wanted if key not in ids]
+        if not missing:
+            return ids
+        found = self._select(cur, missing)
+        ids.update(found)
+        if pending is not None:
+            # Rows this transaction created earlier are visible to it but not committed yet
+            committed = {key: skill_id for key, skill_id in found.items() if key not in pending}
+            with self._lock:
+                self._ids.update(committed)
+        new = [name for name in missing if name.casefold() not in found]
+        if new:
+            cur.execute(f"INSERT IGNORE INTO Skill (skill_name) VALUES {','.join(['(%s)'] * len(new))}", new)
+            # A skill another transaction committed after this one's snapshot was ignored by the
+            # INSERT but is invisible to a plain SELECT; a locking read sees it (and our own rows).
+            # Its id then waits in `pending` with ours, which only delays caching it.
+            created = self._select(cur, new, locking=True)
+            if pending is not None:
+                pending.update(created)
+            ids.update(created)
+        return ids
+
+    def sync_links(self, cur, table, owner_id, names, pending=None):
+        """Make `table` link owner_id to exactly `names`, touching only the difference.
+
+        `pending` is passed on to resolve(). Returns (added_skill_ids, removed_skill_ids).
+        """
+        owner_col = SKILL_LINK_TABLES[table]
+        target = set(self.resolve(cur, names, pending).values())
+        cur.execute(f"SELECT skill_id FROM {table} WHERE {owner_col} = %s", (owner_id,))
+        current = {row[0] for row in cur.fetchall()}
+        added, removed = sorted(target - current), sorted(current - target)
+        if removed:
+            cur.execute(
+                f"DELETE FROM {table} WHERE {owner_col} = %s AND skill_id IN ({','.join(['%s'] * len(removed))})",
+                [owner_id] + removed
+            )
+        if added:
+            cur.executemany(
+                f"INSERT INTO {table} ({owner_col}, skill_id) VALUES (%s, %s)",
+                [(owner_id, skill_id) for skill_id in added]
+            )
+        return added, removed
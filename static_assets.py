@@ -0,0 +1,187 @@
+# static_assets.py - fingerprinted, precompressed frontend assets
+#
+# build() copies frontend/ into a build directory. Every file except the HTML
+# pages gets a content hash in its name (css/style.3f9c1a2b7d4e.css); the HTML
+# pages keep their URLs and have their <link href> / <script src> references
+# rewritten to the hashed names. Text files get .gz (and, with the brotli
+# package installed, .br) siblings. manifest.json records everything
+# StaticAssets needs to serve the build without touching the source tree.
+#
+# Hashed files never change, so they are served with a one-year immutable
+# Cache-Control and browsers stop asking for them; HTML pages are no-cache with
+# a content ETag, so a reload costs one 304. A reverse proxy can serve the same
+# directory without Python, e.g. for nginx:
+#
+#   location / {
+#       root /srv/placement/frontend_dist;
+#       gzip_static on; brotli_static on;  # brotli_static needs the ngx_brotli module
+#       location ~ "\.[0-9a-f]{12}\.(css|js)$" { add_header Cache-Control "public, max-age=31536000, immutable"; }
+#   }
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+import posixpath
+import re
+
+from instrumentation import logger
+
+MANIFEST = "manifest.json"
+HASH_LENGTH = 12
+COMPRESSIBLE = {".html", ".css", ".js", ".svg", ".json", ".txt", ".map", ".ico"}
+# Files smaller than this gain little from compression; serve those as-is
+MIN_COMPRESS_BYTES = 256
+IMMUTABLE = "public, max-age=31536000, immutable"
+REVALIDATE = "no-cache"
+
+# href/src attribute values in HTML pages
+_REF_RE = re.compile(r"""(\b(?:href|src)\s*=\s*)(["'])([^"'#?]+)((?:[?#][^"']*)?)\2""", re.IGNORECASE)
+
+
+def fingerprinted(path, digest):
+    """css/style.css -> css/style.<hash>.css"""
+    root, ext = posixpath.splitext(path)
+    return f"{root}.{digest[:HASH_LENGTH]}{ext}"
+
+
+def _write(path, data):
+    """Write atomically, so a worker serving the previous build never reads a half-written file."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+def _rewrite_refs(html, page, renamed):
+    """Point a page's references to hashed files; `page` is its path relative to the build root."""
+    base = posixpath.dirname(page)
+
+    def replace(match):
+        prefix, quote, ref, suffix = match.groups()
+        if "://" in ref or ref.startswith("//") or ref.startswith("data:"):
+            return match.group(0)
+        target = posixpath.normpath(ref.lstrip("/") if ref.startswith("/") else posixpath.join(base, ref))
+        if target not in renamed:
+            return match.group(0)
+        new_ref = ref[:len(ref) - len(posixpath.basename(ref))] + posixpath.basename(renamed[target])
+        return f"{prefix}{quote}{new_ref}{suffix}{quote}"
+
+    return _REF_RE.sub(replace, html)
+
+
+def _compressors(use_brotli, brotli_quality):
+    compressors = {"gzip": (".gz", lambda data: gzip.compress(data, compresslevel=9, mtime=0))}
+    if use_brotli:
+        try:
+            import brotli
+        except ImportError:
+            logger.warning("brotli is not installed (pip install brotli); building gzip variants only")
+        else:
+            compressors["br"] = (".br", lambda data: brotli.compress(data, quality=brotli_quality))
+    return compressors
+
+
+def build(source, target, use_brotli=True, brotli_quality=11):
+    """Build `source` into `target` and write its manifest; returns the manifest.
+
+    Files from earlier builds are left in place so pages still open in a
+    browser keep finding the hashed assets they reference.
+    """
+    files = []
+    for directory, _, names in os.walk(source):
+        for name in names:
+            files.append(os.path.relpath(os.path.join(directory, name), source).replace(os.sep, "/"))
+    compressors = _compressors(use_brotli, brotli_quality)
+
+    contents, renamed = {}, {}
+    for path in sorted(files):
+        with open(os.path.join(source, path), "rb") as f:
+            contents[path] = f.read()
+        if not path.endswith(".html"):
+            renamed[path] = fingerprinted(path, hashlib.sha256(contents[path]).hexdigest())
+
+    manifest = {"assets": {}, "files": {}}
+    for path, data in contents.items():
+        if path.endswith(".html"):
+            data = _rewrite_refs(data.decode("utf-8"), path, renamed).encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()
+        # Unhashed names stay reachable (revalidated) for anything that links to them directly
+        outputs = [(path, False)] + ([(renamed[path], True)] if path in renamed else [])
+        encodings = {}
+        if posixpath.splitext(path)[1] in COMPRESSIBLE and len(data) >= MIN_COMPRESS_BYTES:
+            for encoding, (suffix, compress) in compressors.items():
+                packed = compress(data)
+                if len(packed) < len(data):
+                    encodings[encoding] = (suffix, packed)
+        for name, immutable in outputs:
+            _write(os.path.join(target, name), data)
+            for suffix, packed in encodings.values():
+                _write(os.path.join(target, name + suffix), packed)
+            manifest["files"][name] = {
+                "etag": digest[:2 * HASH_LENGTH],
+                "immutable": immutable,
+                "encodings": {encoding: suffix for encoding, (suffix, _) in encodings.items()},
+            }
+        if path in renamed:
+            manifest["assets"][path] = renamed[path]
+    _write(os.path.join(target, MANIFEST), json.dumps(manifest, indent=2, sort_keys=True).encode("utf-8"))
+    return manifest
+
+
+def accepted_encodings(header):
+    """Content codings an Accept-Encoding header allows (q > 0)."""
+    accepted = set()
+    for part in (header or "").split(","):
+        coding, _, params = part.strip().partition(";")
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if coding and q > 0:
+            accepted.add(coding.lower())
+    return accepted
+
+
+class StaticAssets:
+    """Serves a build directory from its manifest; only manifest entries are reachable."""
+
+    PREFERENCE = ("br", "gzip")
+
+    def __init__(self, root):
+        self.root = root
+        self.files = {}
+        self.assets = {}
+
+    def load(self):
+        with open(os.path.join(self.root, MANIFEST), encoding="utf-8") as f:
+            manifest = json.load(f)
+        self.files, self.assets = manifest["files"], manifest["assets"]
+        return self
+
+    def resolve(self, path, accept_encoding=None):
+        """(file path, mimetype, content encoding or None, etag, Cache-Control) for a URL path, or None."""
+        entry = self.files.get(path)
+        if entry is None:
+            return None
+        mimetype = mimetypes.guess_type(path)[0] or "application/octet-stream"
+        accepted = accepted_encodings(accept_encoding)
+        for encoding in self.PREFERENCE:
+            suffix = entry["encodings"].get(encoding)
+            if suffix and encoding in accepted:
+                return (os.path.join(self.root, path + suffix), mimetype, encoding,
+                        f"{entry['etag']}-{encoding}", IMMUTABLE if entry["immutable"] else REVALIDATE)
+        return (os.path.join(self.root, path), mimetype, None, entry["etag"],
+                IMMUTABLE if entry["immutable"] else REVALIDATE)
+
+    def stats(self):
+        return {
+            "files": len(self.files),
+            "fingerprinted": len(self.assets),
+            "precompressed": sum(1 for entry in self.files.values() if entry["encodings"]),
+        }
@@ -0,0 +1,75 @@
+# status_updates.py - chunked, transition-checked application status changes
+#
+# apply_status_change() runs inside the caller's transaction: per chunk it locks
+# and classifies the requested rows with one SELECT, moves the allowed ones with
+# one UPDATE (keeping ApplicationSummary in step) and queues one Notification per
+# student in a single multi-row INSERT. The caller commits once, so a batch
+# either lands completely or not at all.
+from reports import shift_application_summary
+
+# current status -> statuses an officer may move it to; a shortlisted
+# application can be reopened (moved back to Applied)
+ALLOWED_TRANSITIONS = {
+    "Applied": {"Shortlisted", "Selected", "Rejected"},
+    "Shortlisted": {"Applied", "Selected", "Rejected"},
+    "Rejected": {"Shortlisted"},
+    "Selected": set(),
+}
+
+OUTCOMES = ("updated", "unchanged", "invalid_transition", "not_found")
+
+
+def status_message(title, status):
+    return f"Your application for {title} is now {status}."
+
+
+def apply_status_change(cur, application_ids, status, officer_id, chunk_size=1000, notices=None):
+    """Move the officer's applications to `status`; returns {outcome: [application_id, ...]}.
+
+    Ids that do not exist or belong to another officer's postings are reported
+    as not_found. If `notices` is a list, (application_id, student_id, message)
+    is appended for every update so callers can publish after committing.
+    Needs a tuple cursor.
+    """
+    results = {outcome: [] for outcome in OUTCOMES}
+    sources = sorted(s for s, targets in ALLOWED_TRANSITIONS.items() if status in targets)
+    ids = list(dict.fromkeys(application_ids))
+    for start in range(0, len(ids), chunk_size):
+        chunk = ids[start:start + chunk_size]
+        placeholders = ",".join(["%s"] * len(chunk))
+        cur.execute(f"""
+            SELECT a.application_id, a.status, a.student_id, j.title
+            FROM Application a
+            JOIN JobPosting j ON j.job_id = a.job_id
+            WHERE a.application_id IN ({placeholders}) AND j.officer_id = %s
+            FOR UPDATE
+        """, chunk + [officer_id])
+        found = {row[0]: row[1:] for row in cur.fetchall()}
+
+        movable = []
+        for application_id in chunk:
+            row = found.get(application_id)
+            if row is None:
+                results["not_found"].append(application_id)
+            elif row[0] == status:
+                results["unchanged"].append(application_id)
+            elif row[0] in sources:
+                movable.append(application_id)
+            else:
+                results["invalid_transition"].append(application_id)
+        if not movable:
+            continue
+
+        placeholders = ",".join(["%s"] * len(movable))
+        shift_application_summary(cur, f"a.application_id IN ({placeholders})", movable, -1)
+        cur.execute(f"UPDATE Application SET status = %s WHERE application_id IN ({placeholders})", [status] + movable)
+        shift_application_summary(cur, f"a.application_id IN ({placeholders})", movable, 1)
+        messages = [(i, found[i][1], status_message(found[i][2], status)) for i in movable]
+        cur.execute(
+            f"INSERT INTO Notification (student_id, message) VALUES {','.join(['(%s, %s)'] * len(movable))}",
+            [value for _, student_id, message in messages for value in (student_id, message)]
+        )
+        if notices is not None:
+            notices.extend(messages)
+        results["updated"].extend(movable)
+    return results
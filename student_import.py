@@ -0,0 +1,274 @@
+# student_import.py - bulk student onboarding from CSV and streaming CSV export
+#
+# Rows are read lazily and handled in batches: each batch is validated, checked
+# against existing students, hashed on the password pool's bulk workers (before
+# any transaction is open), then inserted with one multi-row INSERT plus one
+# StudentSkill INSERT and committed. Bad rows are reported by CSV line number
+# and never block the rest of the file.
+#
+# Small files are imported inside the request. Larger ones are stored in
+# StudentImport and run by the "students.import" task (task_queue.py); each
+# batch commits together with a checkpoint of the report, so a retried task
+# resumes after the last committed batch and no generated password is lost.
+import csv
+import io
+import re
+import secrets
+
+import mysql.connector
+
+from skills import normalize_skill
+
+# Canonical column -> accepted header spellings (matched case-insensitively)
+IMPORT_COLUMNS = {
+    "university_roll": ("university_roll", "roll", "roll_no", "roll_number"),
+    "name": ("name", "student_name"),
+    "email": ("email", "email_id"),
+    "branch": ("branch", "department"),
+    "cgpa": ("cgpa",),
+    "skills": ("skills",),
+    "password": ("password", "initial_password"),
+}
+REQUIRED_COLUMNS = ("university_roll", "name", "email", "branch", "cgpa")
+
+_EMAIL_RE = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
+_SKILL_SPLIT_RE = re.compile(r"[;|,]")
+
+INSERT_STUDENT_SQL = "INSERT INTO students (name, email, password_hash, branch, cgpa, university_roll) VALUES "
+
+
+class ImportFormatError(Exception):
+    """The file as a whole cannot be imported (bad encoding or missing columns)."""
+
+
+def read_rows(stream):
+    """Yield (line_number, {canonical column: value}) from a binary CSV stream."""
+    text = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+    reader = csv.DictReader(text)
+    try:
+        headers = reader.fieldnames or []
+    except UnicodeDecodeError:
+        raise ImportFormatError("File must be UTF-8 encoded CSV")
+    aliases = {alias: column for column, names in IMPORT_COLUMNS.items() for alias in names}
+    mapping = {}
+    for header in headers:
+        column = aliases.get((header or "").strip().lower().replace(" ", "_"))
+        if column and column not in mapping.values():
+            mapping[header] = column
+    missing = [c for c in REQUIRED_COLUMNS if c not in mapping.values()]
+    if missing:
+        raise ImportFormatError(f"Missing required column(s): {', '.join(missing)}")
+    try:
+        for row in reader:
+            yield reader.line_num, {column: (row.get(header) or "").strip() for header, column in mapping.items()}
+    except (UnicodeDecodeError, csv.Error) as e:
+        raise ImportFormatError(f"Unreadable CSV near line {reader.line_num}: {e}")
+
+
+def validate_row(row):
+    """Return (student dict, None) or (None, error message)."""
+    try:
+        roll = int(row["university_roll"])
+        if roll <= 0:
+            raise ValueError
+    except ValueError:
+        return None, "university_roll must be a positive integer"
+    name, email, branch = row["name"], row["email"], row["branch"]
+    if not name or len(name) > 100:
+        return None, "name is required (at most 100 characters)"
+    if not _EMAIL_RE.match(email) or len(email) > 100:
+        return None, "email is not a valid address"
+    if not branch or len(branch) > 50:
+        return None, "branch is required (at most 50 characters)"
+    try:
+        cgpa = float(row["cgpa"])
+    except ValueError:
+        return None, "cgpa must be a number"
+    if not 0 <= cgpa <= 10:
+        return None, "cgpa must be between 0 and 10"
+    password = row.get("password") or ""
+    if password and len(password) < 8:
+        return None, "password must be at least 8 characters"
+    skills = [s for s in (normalize_skill(s) for s in _SKILL_SPLIT_RE.split(row.get("skills") or "")) if s]
+    return {
+        "university_roll": roll, "name": name, "email": email, "branch": branch, "cgpa": round(cgpa, 2),
+        "skills": skills, "password": password, "generated": not password,
+    }, None
+
+
+def _existing(cur, batch):
+    """Emails (casefolded) and rolls in the batch that are already registered."""
+    emails = [s["email"] for _, s in batch]
+    rolls = [s["university_roll"] for _, s in batch]
+    cur.execute(
+        f"SELECT email, university_roll FROM students WHERE email IN ({','.join(['%s'] * len(emails))}) "
+        f"OR university_roll IN ({','.join(['%s'] * len(rolls))})",
+        emails + rolls
+    )
+    found = cur.fetchall()
+    return {email.casefold() for email, _ in found}, {roll for _, roll in found}
+
+
+def _insert(cur, batch):
+    """Insert the batch in one statement, falling back to row by row to attribute a conflict."""
+    values = [(s["name"], s["email"], s["password_hash"], s["branch"], s["cgpa"], s["university_roll"]) for _, s in batch]
+    try:
+        cur.execute(INSERT_STUDENT_SQL + ",".join(["(%s, %s, %s, %s, %s, %s)"] * len(values)),
+                    [v for row in values for v in row])
+        return batch, []
+    except mysql.connector.IntegrityError:
+        pass
+    inserted, failed = [], []
+    for item, row in zip(batch, values):
+        try:
+            cur.execute(INSERT_STUDENT_SQL + "(%s, %s, %s, %s, %s, %s)", row)
+            inserted.append(item)
+        except mysql.connector.IntegrityError:
+            failed.append((item[0], "email or university_roll already exists"))
+    return inserted, failed
+
+
+def _link_skills(cur, skill_resolver, inserted, new_skills):
+    emails = [s["email"] for _, s in inserted]
+    cur.execute(f"SELECT student_id, email FROM students WHERE email IN ({','.join(['%s'] * len(emails))})", emails)
+    ids = {email.casefold(): student_id for student_id, email in cur.fetchall()}
+    skill_ids = skill_resolver.resolve(cur, [name for _, s in inserted for name in s["skills"]], new_skills)
+    links = {(ids[s["email"].casefold()], skill_ids[name.casefold()]) for _, s in inserted for name in s["skills"]}
+    if links:
+        cur.execute(f"INSERT IGNORE INTO StudentSkill (student_id, skill_id) VALUES {','.join(['(%s, %s)'] * len(links))}",
+                    [v for link in links for v in link])
+
+
+def import_students(db, rows, hasher, skill_resolver, batch_size=500, max_rows=20000,
+                    start_after=0, report=None, checkpoint=None):
+    """Import (line, row) pairs from read_rows(); returns counts, per-row errors and generated passwords.
+
+    Students without a password column value get a random initial password,
+    returned once in "credentials" for the officer to hand out. To resume an
+    earlier run, pass its last checkpointed line as start_after and its report;
+    checkpoint(cur, report, line), if given, runs in each batch's transaction
+    just before the commit.
+    """
+    report = report or {"imported": 0, "failed": 0, "errors": [], "credentials": []}
+    seen_emails, seen_rolls = set(), set()
+    batch = []
+    # Last line read so far; every row up to it is either in `batch` or already in the report
+    last_line = start_after
+
+    def fail(line, message):
+        report["failed"] += 1
+        report["errors"].append({"line": line, "error": message})
+
+    def flush():
+        pending = list(batch)
+        batch.clear()
+        cur = db.cursor()
+        try:
+            emails, rolls = _existing(cur, pending)
+            # Nothing is locked or written yet; end the read before the slow hashing
+            db.rollback()
+            fresh = []
+            for line, s in pending:
+                if s["email"].casefold() in emails:
+                    fail(line, "email already registered")
+                elif s["university_roll"] in rolls:
+                    fail(line, "university_roll already registered")
+                else:
+                    if s["generated"]:
+                        s["password"] = secrets.token_urlsafe(9)
+                    fresh.append((line, s))
+            if not fresh:
+                return
+            for (_, s), digest in zip(fresh, hasher.hash_many([s["password"] for _, s in fresh])):
+                s["password_hash"] = digest
+            inserted, failed = _insert(cur, fresh)
+            for line, message in failed:
+                fail(line, message)
+            new_skills = {}
+            if inserted:
+                _link_skills(cur, skill_resolver, inserted, new_skills)
+            report["imported"] += len(inserted)
+            report["credentials"].extend({"line": line, "email": s["email"], "initial_password": s["password"]}
+                                         for line, s in inserted if s["generated"])
+            if checkpoint:
+                checkpoint(cur, report, last_line)
+            db.commit()
+            skill_resolver.publish(new_skills)
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            cur.close()
+
+    for count, (line, row) in enumerate(rows, 1):
+        last_line = line
+        if count > max_rows:
+            fail(line, f"row limit of {max_rows} reached; the rest of the file was not imported")
+            break
+        student, error = validate_row(row)
+        if line <= start_after:
+            # Imported (or reported) by the earlier run; only remembered for the duplicate check
+            if student:
+                seen_emails.add(student["email"].casefold())
+                seen_rolls.add(student["university_roll"])
+            continue
+        if error:
+            fail(line, error)
+            continue
+        email_key = student["email"].casefold()
+        if email_key in seen_emails or student["university_roll"] in seen_rolls:
+            fail(line, "duplicate email or university_roll earlier in the file")
+            continue
+        seen_emails.add(email_key)
+        seen_rolls.add(student["university_roll"])
+        batch.append((line, student))
+        if len(batch) >= batch_size:
+            flush()
+    if batch:
+        flush()
+    return report
+
+
+def expire_credentials(cur, older_than_seconds):
+    """Clear the generated passwords of imports that finished (or were queued, if they never
+    finished) more than older_than_seconds ago; returns the number of imports cleared."""
+    cur.execute("""
+        UPDATE StudentImport SET report = JSON_SET(report, '$.credentials', JSON_ARRAY())
+        WHERE JSON_LENGTH(report, '$.credentials') > 0
+          AND COALESCE(finished_at, created_at) < NOW() - INTERVAL %s SECOND
+    """, (older_than_seconds,))
+    return cur.rowcount
+
+
+# ---------------------------
+# Export
+# ---------------------------
+def stream_csv(get_db, header, sql, params, fetch_size=1000):
+    """Yield CSV text for `sql`, fetching fetch_size rows at a time from an unbuffered cursor.
+
+    Runs outside the request context, so it takes and returns its own connection.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(header)
+    db = get_db()
+    cur = db.cursor()
+    try:
+        cur.execute(sql, params)
+        while True:
+            rows = cur.fetchmany(fetch_size)
+            if not rows:
+                break
+            writer.writerows(rows)
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+        if buffer.tell():
+            yield buffer.getvalue()
+    finally:
+        # A client that disconnects mid-export leaves rows unread on the connection
+        if db.unread_result:
+            db.consume_results()
+        cur.close()
+        db.rollback()
+        db.close()
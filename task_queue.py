@@ -0,0 +1,307 @@
+# task_queue.py - durable background tasks kept in the TaskQueue table
+#
+# Request handlers enqueue inside their own transaction, so a task exists
+# exactly when the write that needs it has committed, and then return. Workers
+# (`flask --app app tasks work`) claim due tasks with SELECT ... FOR UPDATE SKIP
+# LOCKED, run the registered handler and mark the task done in the handler's
+# transaction. A failure is retried with exponential backoff; after
+# max_attempts the task is parked as 'dead' (the dead-letter list) until it is
+# retried by hand. A task whose worker died is reclaimed when its lease runs out.
+#
+# Handlers can therefore run more than once and must be idempotent. A task
+# enqueued with an idempotency key is only added once while a task with that
+# key is still in the table (done tasks are kept until `tasks purge`).
+#
+# In "sync" mode (tests and local development) no workers are needed: the app
+# drains the queue in-process at the end of each request.
+import importlib
+import json
+import multiprocessing
+import os
+import random
+import signal
+import socket
+import threading
+import time
+
+from instrumentation import logger
+
+# Params: (kind, payload JSON, idempotency key or None, delay in microseconds)
+ENQUEUE_SQL = """
+    INSERT INTO TaskQueue (kind, payload, idempotency_key, run_after)
+    VALUES (%s, %s, %s, NOW(3) + INTERVAL %s MICROSECOND)
+    ON DUPLICATE KEY UPDATE task_id = LAST_INSERT_ID(task_id)
+"""
+
+class TaskQueueError(Exception):
+    """Raised for a task kind with no registered handler."""
+
+
+def enqueue_params(kind, payload, key=None, delay=0):
+    """(sql, params) for enqueue(), for callers with their own cursor type."""
+    return ENQUEUE_SQL, (kind, json.dumps(payload, sort_keys=True), key, int(delay * 1_000_000))
+
+
+class TaskQueue:
+    """Registry of task handlers plus the worker loop over TaskQueue.
+
+    Handlers are registered with @queue.task("kind") and called as
+    handler(db, **payload) on a connection of their own; work they leave
+    uncommitted is committed together with the task's completion.
+    """
+
+    def __init__(self, get_db, mode="worker", max_attempts=5, backoff_base=2.0, backoff_max=600.0,
+                 lease_seconds=300, poll_seconds=1.0):
+        self.get_db = get_db
+        self.mode = mode
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.lease_seconds = lease_seconds
+        self.poll_seconds = poll_seconds
+        self.handlers = {}
+        self._lock = threading.Lock()
+        self._stats = {"succeeded": 0, "retried": 0, "dead": 0}
+
+    def task(self, kind):
+        def register(fn):
+            self.handlers[kind] = fn
+            return fn
+        return register
+
+    def _count(self, name):
+        with self._lock:
+            self._stats[name] += 1
+
+    # ---------------------------
+    # Producing
+    # ---------------------------
+    def enqueue(self, cur, kind, payload, key=None, delay=0):
+        """Add a task in the caller's transaction; returns its task_id (the existing one for a known key)."""
+        if kind not in self.handlers:
+            raise TaskQueueError(f"No handler registered for task kind {kind!r}")
+        cur.execute(*enqueue_params(kind, payload, key, delay))
+        return cur.lastrowid
+
+    # ---------------------------
+    # Consuming
+    # ---------------------------
+    def backoff(self, attempts):
+        """Seconds before attempt `attempts + 1`: doubling from backoff_base, capped, with jitter."""
+        delay = min(self.backoff_max, self.backoff_base * 2 ** (attempts - 1))
+        return delay * random.uniform(0.5, 1.0)
+
+    def reclaim_expired(self, cur):
+        """Requeue tasks whose worker stopped renewing its lease (or bury them if out of attempts)."""
+        cur.execute("""
+            UPDATE TaskQueue
+            SET status = IF(attempts >= %s, 'dead', 'queued'), locked_by = NULL, locked_until = NULL,
+                last_error = 'lease expired', finished_at = IF(attempts >= %s, NOW(3), NULL)
+            WHERE status = 'running' AND locked_until < NOW(3)
+        """, (self.max_attempts, self.max_attempts))
+        return cur.rowcount
+
+    def claim(self, db, worker_id):
+        """Lease the next due task to `worker_id`; returns (task_id, kind, payload, attempts) or None."""
+        cur = db.cursor()
+        try:
+            cur.execute("""
+                SELECT task_id, kind, payload, attempts FROM TaskQueue
+                WHERE status = 'queued' AND run_after <= NOW(3)
+                ORDER BY run_after, task_id
+                LIMIT 1
+                FOR UPDATE SKIP LOCKED
+            """)
+            row = cur.fetchone()
+            if row is None:
+                db.rollback()
+                return None
+            task_id, kind, payload, attempts = row
+            cur.execute("""
+                UPDATE TaskQueue
+                SET status = 'running', attempts = attempts + 1, locked_by = %s,
+                    locked_until = NOW(3) + INTERVAL %s SECOND
+                WHERE task_id = %s
+            """, (worker_id, self.lease_seconds, task_id))
+            db.commit()
+            return task_id, kind, json.loads(payload), attempts + 1
+        finally:
+            cur.close()
+
+    def run(self, db, worker_id, task):
+        """Run one claimed task and record the outcome; returns True if it succeeded."""
+        task_id, kind, payload, attempts = task
+        started = time.perf_counter()
+        try:
+            handler = self.handlers.get(kind)
+            if handler is None:
+                raise TaskQueueError(f"No handler registered for task kind {kind!r}")
+            handler(db, **payload)
+            cur = db.cursor()
+            # Fenced on locked_by: a worker whose lease was taken over must not overwrite the new owner
+            cur.execute("""
+                UPDATE TaskQueue SET status = 'done', finished_at = NOW(3), locked_by = NULL, locked_until = NULL
+                WHERE task_id = %s AND locked_by = %s
+            """, (task_id, worker_id))
+            db.commit()
+            cur.close()
+            self._count("succeeded")
+            logger.info("Task done", extra={"fields": {
+                "task_id": task_id, "kind": kind, "attempt": attempts,
+                "ms": round((time.perf_counter() - started) * 1000, 2)}})
+            return True
+        except Exception as e:
+            db.rollback()
+            error = f"{type(e).__name__}: {e}"[:1000]
+            dead = attempts >= self.max_attempts
+            cur = db.cursor()
+            cur.execute("""
+                UPDATE TaskQueue
+                SET status = %s, run_after = NOW(3) + INTERVAL %s MICROSECOND, last_error = %s,
+                    finished_at = IF(%s, NOW(3), NULL), locked_by = NULL, locked_until = NULL
+                WHERE task_id = %s AND locked_by = %s
+            """, ("dead" if dead else "queued", int(self.backoff(attempts) * 1_000_000), error, dead,
+                  task_id, worker_id))
+            db.commit()
+            cur.close()
+            self._count("dead" if dead else "retried")
+            logger.exception("Task failed", extra={"fields": {
+                "task_id": task_id, "kind": kind, "attempt": attempts, "dead": dead}})
+            return False
+
+    def drain(self, max_tasks=None):
+        """Run due tasks in this thread until none are left; returns how many ran (sync mode and tests)."""
+        worker_id = f"{socket.gethostname()}:{os.getpid()}:drain-{threading.get_ident()}"
+        db = self.get_db()
+        ran = 0
+        try:
+            while max_tasks is None or ran < max_tasks:
+                task = self.claim(db, worker_id)
+                if task is None:
+                    break
+                self.run(db, worker_id, task)
+                ran += 1
+        finally:
+            db.close()
+        return ran
+
+    def work(self, burst=False, stop=None):
+        """Worker loop: claim and run tasks, sleeping poll_seconds when idle.
+
+        With burst=True it returns once no task is due. SIGTERM (or setting
+        `stop`) ends the loop after the current task.
+        """
+        stop = stop or threading.Event()
+        if threading.current_thread() is threading.main_thread():
+            signal.signal(signal.SIGTERM, lambda *_: stop.set())
+        worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        logger.info("Task worker started", extra={"fields": {"worker": worker_id, "kinds": sorted(self.handlers)}})
+        while not stop.is_set():
+            db = self.get_db()
+            try:
+                cur = db.cursor()
+                if self.reclaim_expired(cur):
+                    db.commit()
+                cur.close()
+                task = self.claim(db, worker_id)
+                if task is not None:
+                    self.run(db, worker_id, task)
+                    continue
+            except Exception:
+                logger.exception("Task worker error")
+            finally:
+                db.close()
+            if burst:
+                break
+            stop.wait(self.poll_seconds)
+        logger.info("Task worker stopped", extra={"fields": {"worker": worker_id}})
+
+    # ---------------------------
+    # Inspection and dead letters
+    # ---------------------------
+    def depth(self, cur):
+        """{status: count} for unfinished and dead tasks, plus the age in seconds of the oldest queued task."""
+        cur.execute("""
+            SELECT status, COUNT(*), TIMESTAMPDIFF(MICROSECOND, MIN(created_at), NOW(3)) / 1000000
+            FROM TaskQueue
+            WHERE status IN ('queued', 'running', 'dead')
+            GROUP BY status
+        """)
+        rows = {status: (count, age) for status, count, age in cur.fetchall()}
+        result = {status: rows.get(status, (0, None))[0] for status in ("queued", "running", "dead")}
+        oldest = rows.get("queued", (0, None))[1]
+        result["oldest_queued_seconds"] = float(oldest) if oldest is not None else 0.0
+        return result
+
+    def dead_letters(self, cur, limit=50):
+        cur.execute("""
+            SELECT task_id, kind, payload, idempotency_key, attempts, last_error, created_at, finished_at
+            FROM TaskQueue WHERE status = 'dead'
+            ORDER BY finished_at DESC, task_id DESC
+            LIMIT %s
+        """, (limit,))
+        return cur.fetchall()
+
+    def retry_dead(self, cur, task_ids=None):
+        """Put dead tasks (all, or the given ids) back in the queue with a fresh set of attempts."""
+        where, params = "status = 'dead'", []
+        if task_ids:
+            where += f" AND task_id IN ({','.join(['%s'] * len(task_ids))})"
+            params.extend(task_ids)
+        cur.execute(f"""
+            UPDATE TaskQueue
+            SET status = 'queued', attempts = 0, run_after = NOW(3), finished_at = NULL
+            WHERE {where}
+        """, params)
+        return cur.rowcount
+
+    def purge(self, cur, older_than_seconds):
+        """Delete done tasks finished more than older_than_seconds ago (which frees their idempotency keys)."""
+        cur.execute("""
+            DELETE FROM TaskQueue
+            WHERE status = 'done' AND finished_at < NOW(3) - INTERVAL %s SECOND
+        """, (older_than_seconds,))
+        return cur.rowcount
+
+    def stats(self):
+        with self._lock:
+            return dict(self._stats, mode=self.mode, kinds=sorted(self.handlers))
+
+
+def _worker_process(target, burst):
+    module, attribute = target.split(":")
+    try:
+        getattr(importlib.import_module(module), attribute).work(burst=burst)
+    except KeyboardInterrupt:
+        pass
+
+
+def run_workers(target, processes=1, burst=False):
+    """Run `processes` worker loops for the queue at "module:attribute", each in its own process.
+
+    Children are spawned (not forked) and import the module themselves, so no
+    pooled connection or thread of this process is shared with them.
+    """
+    if processes <= 1:
+        _worker_process(target, burst)
+        return
+    context = multiprocessing.get_context("spawn")
+    children = [context.Process(target=_worker_process, args=(target, burst), name=f"task-worker-{i}")
+                for i in range(processes)]
+    for child in children:
+        child.start()
+
+    def stop_children(*_):
+        # Children finish their current task on SIGTERM
+        for child in children:
+            if child.is_alive():
+                child.terminate()
+
+    signal.signal(signal.SIGTERM, stop_children)
+    try:
+        for child in children:
+            child.join()
+    except KeyboardInterrupt:
+        # Ctrl-C reaches the whole process group; just wait for the children to stop
+        for child in children:
+            child.join()
@@ -0,0 +1,74 @@
+import asyncio
+import threading
+
+import pytest
+
+pytest.importorskip("flask")  # events -> instrumentation
+
+from events import LocalHub  # noqa: E402
+
+
+def test_publish_then_read_from_start():
+    hub = LocalHub()
+    first = hub.publish("student:1", "notification", {"n": 1})
+    hub.publish("student:2", "notification", {"n": 2})
+    hub.publish("student:1", "notification", {"n": 3})
+    events, positions, resync = hub.read({"student:1": first}, timeout=0)
+    assert [e[3] for e in events] == [{"n": 3}]
+    assert not resync
+    assert hub.read(positions, timeout=0)[0] == []
+
+
+def test_new_subscriber_starts_at_the_tail():
+    hub = LocalHub()
+    hub.publish("c", "e", 1)
+    events, positions, resync = hub.read({"c": None}, timeout=0)
+    assert events == [] and not resync
+    hub.publish("c", "e", 2)
+    assert [e[3] for e in hub.read(positions, timeout=0)[0]] == [2]
+
+
+def test_events_across_channels_come_in_publish_order():
+    hub = LocalHub()
+    start = hub.read({"a": None, "b": None}, timeout=0)[1]
+    hub.publish("b", "e", 1)
+    hub.publish("a", "e", 2)
+    hub.publish("b", "e", 3)
+    assert [e[3] for e in hub.read(start, timeout=0)[0]] == [1, 2, 3]
+
+
+def test_resync_when_replay_buffer_overflowed():
+    hub = LocalHub(replay=2)
+    position = hub.publish("c", "e", 0)
+    for i in range(1, 5):
+        hub.publish("c", "e", i)
+    events, _, resync = hub.read({"c": position}, timeout=0)
+    assert resync
+
+
+def test_resync_for_position_from_another_process():
+    hub = LocalHub()
+    hub.publish("c", "e", 1)
+    events, _, resync = hub.read({"c": "deadbeef-1"}, timeout=0)
+    assert events == [] and resync
+
+
+def test_read_wakes_on_publish():
+    hub = LocalHub()
+    positions = hub.read({"c": None}, timeout=0)[1]
+    threading.Timer(0.05, hub.publish, ("c", "e", "late")).start()
+    events, _, _ = hub.read(positions, timeout=5)
+    assert [e[3] for e in events] == ["late"]
+
+
+def test_read_async_wakes_on_publish_from_another_thread():
+    hub = LocalHub()
+    positions = hub.read({"c": None}, timeout=0)[1]
+
+    async def wait():
+        threading.Timer(0.05, hub.publish, ("c", "e", "late")).start()
+        return await hub.read_async(positions, timeout=5)
+
+    events, _, _ = asyncio.run(wait())
+    assert [e[3] for e in events] == ["late"]
+    assert hub.stats()["published"] == 1
@@ -0,0 +1,72 @@
+import datetime
+
+from job_search import JobSearch
+
+FUTURE = datetime.date.today() + datetime.timedelta(days=30)
+PAST = datetime.date.today() - datetime.timedelta(days=1)
+T0 = datetime.datetime(2024, 1, 1, 12, 0, 0)
+
+
+class ScriptedCursor:
+    """Returns the given result sets in order, one per execute()."""
+
+    def __init__(self, *results):
+        self.results = list(results)
+        self.executed = []
+
+    def execute(self, sql, params=()):
+        self.executed.append((sql, params))
+        self._result = self.results.pop(0)
+
+    def fetchone(self):
+        return self._result[0] if self._result else None
+
+    def fetchall(self):
+        return self._result
+
+
+def make_search():
+    search = JobSearch()
+    search.load(ScriptedCursor(
+        [(T0,)],
+        [(1, "Backend Engineer", "Python services", 12.0, FUTURE, "Open"),
+         (2, "Data Engineer", "Spark pipelines", 8.0, FUTURE, "Closed"),
+         (3, "Platform Engineer", "Kubernetes", 20.0, PAST, "Open")],
+        [(1, "Python"), (3, "Go")],
+    ))
+    return search
+
+
+def test_only_open_unexpired_postings_match():
+    page, next_after, total = make_search().search("engineer")
+    assert [job_id for job_id, _ in page] == [1]
+    assert total == 1 and next_after is None
+
+
+def test_filters_by_skill_and_package():
+    search = make_search()
+    assert search.search("engineer", skill="python")[2] == 1
+    assert search.search("engineer", package_min=15)[2] == 0
+
+
+def test_catch_up_applies_writes_from_other_processes():
+    search = make_search()
+    later = T0 + datetime.timedelta(seconds=30)
+    cur = ScriptedCursor(
+        [(2, later), (4, later)],
+        [(2, "Data Engineer", "Spark pipelines", 8.0, FUTURE, "Open"),
+         (4, "ML Engineer", "Python models", 15.0, FUTURE, "Open")],
+        [(4, "Python")],
+    )
+    assert search._catch_up(cur) == 2
+    assert sorted(job_id for job_id, _ in search.search("engineer")[0]) == [1, 2, 4]
+    # Rows already applied inside the commit-lag window are not read again
+    cur = ScriptedCursor([(2, later), (4, later)])
+    assert search._catch_up(cur) == 0
+    assert len(cur.executed) == 1
+
+
+def test_refresh_job_removes_deleted_posting():
+    search = make_search()
+    search.refresh_job(ScriptedCursor([]), 1)
+    assert search.search("engineer")[0] == []
@@ -0,0 +1,67 @@
+import datetime
+import gzip
+import json
+from decimal import Decimal
+
+import pytest
+
+pytest.importorskip("werkzeug")
+
+from json_stream import JsonBody, dumps  # noqa: E402
+
+
+class Response:
+    def __init__(self, body, status=200, headers=None, mimetype=None):
+        self.data = b"".join(body)
+        self.status = status
+        self.headers = dict(headers or {})
+        self.mimetype = mimetype
+
+
+def body_of(json_body, **kwargs):
+    return json_body.response(Response, **kwargs)
+
+
+def test_dumps_matches_jsonify_types():
+    value = json.loads(dumps({"cgpa": Decimal("8.50"), "on": datetime.date(2024, 1, 2)}))
+    assert value == {"cgpa": "8.50", "on": "Tue, 02 Jan 2024 00:00:00 GMT"}
+
+
+def test_json_array():
+    body = JsonBody()
+    body.row({"a": 1})
+    body.row({"a": 2})
+    response = body_of(body)
+    assert json.loads(response.data) == [{"a": 1}, {"a": 2}]
+    assert response.mimetype == "application/json"
+
+
+def test_empty_array():
+    assert body_of(JsonBody()).data == b"[]"
+
+
+def test_ndjson_lines():
+    body = JsonBody(fmt="ndjson")
+    body.row(1)
+    body.row(2)
+    response = body_of(body)
+    assert response.data == b"1\n2\n"
+    assert response.mimetype == "application/x-ndjson"
+
+
+def test_gzip_round_trip_past_spool_size():
+    body = JsonBody(encoding="gzip", spool_bytes=64)
+    for i in range(500):
+        body.row({"i": i, "text": "x" * 20})
+    data = gzip.decompress(body_of(body).data)
+    assert [r["i"] for r in json.loads(data)] == list(range(500))
+
+
+def test_page_drains_rows_and_reports_more():
+    body = JsonBody()
+    rows = iter([{"id": i} for i in range(4)])
+    last, more = body.page(rows, limit=3, transform=lambda r: dict(r, seen=True))
+    assert last == {"id": 2, "seen": True}
+    assert more
+    assert next(rows, None) is None
+    assert json.loads(body_of(body).data) == [{"id": i, "seen": True} for i in range(3)]
@@ -0,0 +1,83 @@
+from matching import MatchEngine
+
+
+class FakeCursor:
+    """Tuple cursor over {"students": {id: (cgpa, [skill ids])}, "jobs": {...}}."""
+
+    def __init__(self, students=None, jobs=None):
+        self.data = {"students": students or {}, "JobPosting": jobs or {}}
+        self.skills = {"StudentSkill": self.data["students"], "JobSkill": self.data["JobPosting"]}
+        self.queries = 0
+        self._result = []
+
+    def execute(self, sql, params):
+        self.queries += 1
+        table = sql.split(" FROM ")[1].split()[0]
+        (entity_id,) = params
+        if table in self.data:
+            row = self.data[table].get(entity_id)
+            self._result = [(row[0],)] if row else []
+        else:
+            self._result = [(s,) for s in self.skills[table].get(entity_id, (None, []))[1]]
+
+    def fetchone(self):
+        return self._result[0] if self._result else None
+
+    def fetchall(self):
+        return self._result
+
+
+def make_engine():
+    engine = MatchEngine(skill_weight=0.8, cgpa_weight=0.2)
+    engine.load_rows(
+        students=[(1, 8.0), (2, 7.0), (3, 9.5)],
+        student_skills=[(1, 10), (1, 11), (2, 10), (3, 12)],
+        jobs=[(100, 7.0), (200, 6.0)],
+        job_skills=[(100, 10), (100, 11), (200, 12)],
+    )
+    return engine
+
+
+def test_rank_students_prefers_skill_coverage():
+    ranked = make_engine().rank_students(100, [1, 2, 3])
+    assert [r["id"] for r in ranked] == [1, 2, 3]
+    assert ranked[0]["skill_coverage"] == 1.0
+    assert ranked[0]["matched_skills"] == 2
+    assert ranked[2]["matched_skills"] == 0
+
+
+def test_rank_students_respects_k():
+    assert [r["id"] for r in make_engine().rank_students(100, [1, 2, 3], k=1)] == [1]
+
+
+def test_rank_jobs_for_one_student():
+    ranked = make_engine().rank_jobs(3, [100, 200])
+    assert [r["id"] for r in ranked] == [200, 100]
+
+
+def test_unknown_job_or_student_ranks_nothing():
+    engine = make_engine()
+    assert engine.rank_students(999, [1, 2]) == []
+    assert engine.rank_jobs(999, [100]) == []
+
+
+def test_set_student_updates_skills():
+    engine = make_engine()
+    engine.set_student(2, 7.0, [10, 11])
+    assert engine.rank_students(100, [2])[0]["matched_skills"] == 2
+
+
+def test_new_skill_columns_widen_the_table():
+    engine = make_engine()
+    engine.set_job(300, 5.0, list(range(1000, 1100)))
+    engine.set_student(4, 6.0, list(range(1000, 1100)))
+    assert engine.rank_students(300, [1, 4])[0]["id"] == 4
+
+
+def test_load_missing_reads_only_unknown_ids():
+    engine = make_engine()
+    cur = FakeCursor(students={4: (8.5, [10, 11])}, jobs={300: (6.0, [10])})
+    assert engine.load_missing(cur, student_ids=[1, 4], job_ids=[100, 300]) == 2
+    assert cur.queries == 4
+    assert [r["id"] for r in engine.rank_students(100, [1, 2, 4])][:2] == [4, 1]
+    assert engine.rank_jobs(4, [300])[0]["id"] == 300
@@ -0,0 +1,55 @@
+from search_index import InvertedIndex, tokenize
+
+
+def make_index():
+    index = InvertedIndex({"title": 3.0, "body": 1.0})
+    index.add(1, title="Backend Engineer", body="Python and MySQL services")
+    index.add(2, title="Frontend Developer", body="React, node.js and a little python")
+    index.add(3, title="Embedded Engineer", body="C++ and C# firmware")
+    return index
+
+
+def test_tokenize_keeps_language_names_and_drops_stopwords():
+    assert tokenize("The C++ and C# devs use Node.js") == ["c++", "c#", "devs", "use", "node.js"]
+    assert tokenize(None) == []
+
+
+def test_title_matches_outrank_body_matches():
+    index = InvertedIndex({"title": 3.0, "body": 1.0})
+    index.add(1, title="python developer", body="backend services")
+    index.add(2, title="backend developer", body="python services")
+    assert [doc_id for doc_id, _ in index.search("python")] == [1, 2]
+
+
+def test_search_orders_by_score_then_id():
+    index = make_index()
+    results = index.search("engineer")
+    assert [doc_id for doc_id, _ in results] == [1, 3]
+    assert results[0][1] == results[1][1]
+
+
+def test_accept_filters_candidates():
+    index = make_index()
+    assert [doc_id for doc_id, _ in index.search("engineer", accept=lambda d: d != 1)] == [3]
+
+
+def test_add_replaces_and_remove_forgets():
+    index = make_index()
+    index.add(1, title="Data Analyst", body="SQL reports")
+    assert 1 not in dict(index.search("python"))
+    assert 1 in dict(index.search("analyst"))
+    index.remove(1)
+    index.remove(1)
+    assert 1 not in index
+    assert len(index) == 2
+    assert index.search("analyst") == []
+
+
+def test_stats_and_clear():
+    index = make_index()
+    stats = index.stats()
+    assert stats["documents"] == 3
+    assert stats["postings"] >= stats["terms"] > 0
+    index.clear()
+    assert len(index) == 0
+    assert index.search("python") == []
@@ -0,0 +1,57 @@
+import io
+
+import pytest
+
+pytest.importorskip("mysql.connector")
+
+from student_import import ImportFormatError, read_rows, validate_row  # noqa: E402
+
+
+def row(**overrides):
+    values = {"university_roll": "1001", "name": "Asha Rao", "email": "asha@example.edu",
+              "branch": "CSE", "cgpa": "8.456", "skills": "Python; SQL", "password": ""}
+    values.update(overrides)
+    return values
+
+
+def test_valid_row():
+    student, error = validate_row(row())
+    assert error is None
+    assert student["university_roll"] == 1001
+    assert student["cgpa"] == 8.46
+    assert student["skills"] == ["Python", "SQL"]
+    assert student["generated"] is True
+
+
+def test_given_password_is_kept():
+    student, _ = validate_row(row(password="longenough"))
+    assert student["password"] == "longenough" and not student["generated"]
+
+
+@pytest.mark.parametrize("overrides, message", [
+    ({"university_roll": "abc"}, "university_roll"),
+    ({"university_roll": "0"}, "university_roll"),
+    ({"name": ""}, "name"),
+    ({"name": "x" * 101}, "name"),
+    ({"email": "not-an-email"}, "email"),
+    ({"branch": ""}, "branch"),
+    ({"cgpa": "high"}, "cgpa"),
+    ({"cgpa": "10.5"}, "cgpa"),
+    ({"password": "short"}, "password"),
+])
+def test_invalid_rows(overrides, message):
+    student, error = validate_row(row(**overrides))
+    assert student is None
+    assert error.startswith(message)
+
+
+def test_read_rows_maps_header_aliases():
+    data = "Roll,Name,Email,Branch,CGPA\n1,A,a@x.io,CSE,9\n".encode("utf-8-sig")
+    rows = list(read_rows(io.BytesIO(data)))
+    assert rows[0][0] == 2
+    assert rows[0][1]["email"] == "a@x.io"
+
+
+def test_read_rows_requires_columns():
+    with pytest.raises(ImportFormatError):
+        list(read_rows(io.BytesIO(b"name,email\nA,a@x.io\n")))
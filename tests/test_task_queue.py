@@ -0,0 +1,18 @@
+import pytest
+
+pytest.importorskip("flask")  # task_queue -> instrumentation
+
+from task_queue import TaskQueue  # noqa: E402
+
+
+def test_backoff_doubles_with_jitter():
+    queue = TaskQueue(get_db=None, backoff_base=2.0, backoff_max=600.0)
+    for attempts, full in ((1, 2.0), (2, 4.0), (3, 8.0), (6, 64.0)):
+        for _ in range(20):
+            assert full * 0.5 <= queue.backoff(attempts) <= full
+
+
+def test_backoff_is_capped():
+    queue = TaskQueue(get_db=None, backoff_base=2.0, backoff_max=30.0)
+    for _ in range(20):
+        assert 15.0 <= queue.backoff(50) <= 30.0
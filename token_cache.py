@@ -0,0 +1,89 @@
+# token_cache.py - bounded LRU/TTL cache of verified JWT claims
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+import jwt
+
+
+class TokenRevoked(jwt.InvalidTokenError):
+    """Raised for a token that was explicitly revoked (e.g. on logout)."""
+
+
+class TokenCache:
+    """Caches token -> claims so hot tokens skip signature verification.
+
+    An entry never outlives the token's own `exp`, and revoked tokens are
+    refused until they would have expired anyway. State is per process; with
+    several workers a revoked token is refused by every worker that saw the
+    revoke call, so pair it with short token lifetimes.
+    """
+
+    def __init__(self, decode, maxsize=10000, ttl=300):
+        self._decode = decode
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()  # key -> (claims, expires_at)
+        self._revoked = {}  # key -> token exp
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def _key(token):
+        return hashlib.sha256(token.encode("utf-8")).digest()
+
+    def verify(self, token):
+        """Return the token's claims, raising jwt exceptions exactly like jwt.decode."""
+        key = self._key(token)
+        now = time.time()
+        with self._lock:
+            if key in self._revoked:
+                raise TokenRevoked("Token revoked")
+            entry = self._entries.get(key)
+            if entry is not None:
+                claims, expires_at = entry
+                if expires_at > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return claims
+                del self._entries[key]
+            self.misses += 1
+
+        claims = self._decode(token)
+        expires_at = now + self.ttl
+        if "exp" in claims:
+            expires_at = min(expires_at, float(claims["exp"]))
+        with self._lock:
+            self._entries[key] = (claims, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return claims
+
+    def revoke(self, token, exp=None):
+        key = self._key(token)
+        now = time.time()
+        with self._lock:
+            self._entries.pop(key, None)
+            self._revoked[key] = float(exp) if exp is not None else now + self.ttl
+            # Drop markers for tokens that have expired on their own
+            for k in [k for k, until in self._revoked.items() if until <= now]:
+                del self._revoked[k]
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "revoked": len(self._revoked),
+            }